@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class Auth0Config(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'auth0'
+
+    def ready(self):
+        import auth0.signals
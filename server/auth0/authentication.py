@@ -0,0 +1,84 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from server.metrics import record_cache
+
+USER_CACHE_KEY = "jwt:user:{}"
+
+
+def user_cache_key(user_id):
+    return USER_CACHE_KEY.format(user_id)
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that skips the per-request user query on reads.
+
+    Safe (GET/HEAD/OPTIONS) requests get the user from a short-lived cache
+    (JWT_USER_CACHE_TTL, invalidated whenever the user is saved) or, on a
+    miss, an unsaved User built from the signed claims added by
+    CustomTokenObtainPairSerializer (user_id, email, is_staff). Write
+    requests always load the user from the DB and refresh the cache.
+
+    Trade-off: claims are re-read from the DB on every refresh, so a user
+    demoted or deactivated elsewhere keeps read access with the old claims
+    until their access token expires. The save-time invalidation only reaches
+    other workers when the cache is shared (REDIS_URL); with locmem it clears
+    the saving process's entry only.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        validated_token = self.get_validated_token(raw_token)
+
+        if request.method in SAFE_METHODS and not api_settings.CHECK_REVOKE_TOKEN:
+            return self.get_cached_user(validated_token), validated_token
+        return self.get_user(validated_token), validated_token
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        cache.set(user_cache_key(user.pk), user, settings.JWT_USER_CACHE_TTL)
+        return user
+
+    def get_cached_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        user = cache.get(user_cache_key(user_id))
+        record_cache('jwt_user', user is not None)
+        if user is None:
+            if 'is_staff' not in validated_token:
+                # Issued before claims were embedded
+                return self.get_user(validated_token)
+            user = self.user_from_claims(validated_token)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
+
+    def user_from_claims(self, validated_token):
+        id_field = self.user_model._meta.get_field(api_settings.USER_ID_FIELD)
+        user = self.user_model(
+            **{id_field.attname: id_field.to_python(validated_token[api_settings.USER_ID_CLAIM])},
+            email=validated_token.get('email', ''),
+            is_staff=validated_token['is_staff'],
+            is_active=True,
+        )
+        # Behave like a fetched row so it can be used in query filters
+        user._state.adding = False
+        user._state.db = 'default'
+        return user
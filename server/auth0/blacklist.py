@@ -0,0 +1,128 @@
+"""
+Cache-fronted JWT blacklist lookups.
+
+Every refresh checks whether the presented token was blacklisted. Instead of
+a DB query per check we keep:
+
+- a cache entry per blacklisted jti (set by the post_save signal on
+  BlacklistedToken, so every blacklisting path is covered), and
+- a per-process Bloom filter snapshot of the blacklist, rebuilt every
+  JWT_BLACKLIST_BLOOM_TTL seconds.
+
+A jti missing from both is definitely not blacklisted: anything blacklisted
+before the snapshot is in the filter, anything after it is in the cache. That
+reasoning only holds when the cache is shared by all workers, so with a
+per-process cache (locmem, the default without REDIS_URL) we only trust
+positive cache hits and fall back to the DB otherwise.
+
+The snapshot is rebuilt outside the lock: other threads keep using the old
+filter (or, before the first one exists, build their own) instead of queueing
+behind the query.
+"""
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from server.caches import is_shared
+from server.metrics import record_cache
+
+CACHE_KEY = "jwt:blacklisted:{}"
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (no false negatives)."""
+
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(capacity, 1)
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        # Kirsch-Mitzenmacher double hashing over one 128-bit digest
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, key):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+_lock = threading.Lock()
+_snapshot = {'filter': None, 'built_at': 0.0, 'building': False}
+
+
+def _cache():
+    return caches[settings.JWT_BLACKLIST_CACHE]
+
+
+def _cache_is_shared():
+    return is_shared(settings.JWT_BLACKLIST_CACHE, settings.JWT_BLACKLIST_SHARED_CACHE)
+
+
+def _build_filter():
+    jtis = BlacklistedToken.objects.filter(
+        token__expires_at__gt=timezone.now()
+    ).values_list('token__jti', flat=True)
+    bloom = BloomFilter(jtis.count() * 2, settings.JWT_BLACKLIST_BLOOM_ERROR_RATE)
+    for jti in jtis.iterator():
+        bloom.add(jti)
+    return bloom
+
+
+def _bloom_filter():
+    """Return the current snapshot, rebuilding it when it is too old."""
+    with _lock:
+        bloom = _snapshot['filter']
+        fresh = bloom is not None and time.monotonic() - _snapshot['built_at'] <= settings.JWT_BLACKLIST_BLOOM_TTL
+        if fresh or (bloom is not None and _snapshot['building']):
+            return bloom
+        _snapshot['building'] = True
+
+    try:
+        started = time.monotonic()
+        bloom = _build_filter()
+        with _lock:
+            _snapshot['filter'], _snapshot['built_at'] = bloom, started
+    finally:
+        with _lock:
+            _snapshot['building'] = False
+    return bloom
+
+
+def reset_bloom_filter():
+    with _lock:
+        _snapshot['filter'] = None
+
+
+def record_blacklisted(jti, expires_at):
+    """Remember a blacklisted jti until the token would expire anyway."""
+    timeout = max(1, int((expires_at - timezone.now()).total_seconds()))
+    _cache().set(CACHE_KEY.format(jti), True, timeout)
+    with _lock:
+        if _snapshot['filter'] is not None:
+            _snapshot['filter'].add(jti)
+
+
+def is_blacklisted(jti, expires_at):
+    cached = bool(_cache().get(CACHE_KEY.format(jti)))
+    record_cache('jwt_blacklist', cached)
+    if cached:
+        return True
+    if _cache_is_shared() and jti not in _bloom_filter():
+        return False
+    if BlacklistedToken.objects.filter(token__jti=jti).exists():
+        record_blacklisted(jti, expires_at)
+        return True
+    return False
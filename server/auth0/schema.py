@@ -0,0 +1,17 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+
+class ClaimsJWTScheme(SimpleJWTScheme):
+    """Document ClaimsJWTAuthentication as a bearer JWT scheme."""
+    target_class = 'auth0.authentication.ClaimsJWTAuthentication'
+    name = 'claimsJwtAuth'
+
+
+def register_extensions(endpoints, **kwargs):
+    """
+    SPECTACULAR_SETTINGS['PREPROCESSING_HOOKS'] entry.
+
+    Importing this module registers the extensions above; doing it from the
+    hook keeps drf_spectacular's extension machinery out of worker startup.
+    """
+    return endpoints
@@ -1,34 +1,56 @@
-from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from django.contrib.auth import authenticate
+from django.contrib.auth import get_user_model
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+
+from .tokens import CachedRefreshToken
+
+
+def set_user_claims(token, user):
+    # Claims trusted by ClaimsJWTAuthentication on read requests
+    token['email'] = user.email
+    token['is_staff'] = user.is_staff
+
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
-    username_field = 'email'  # Tell SimpleJWT to use email
+    # SimpleJWT authenticates (one password hash) with email as the username;
+    # rehashing on changed hasher settings happens inside check_password.
+    username_field = 'email'
+    token_class = CachedRefreshToken
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        set_user_claims(token, user)
+        return token
+
+class CachedTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh that re-derives the user claims from the DB instead of copying
+    them forward, so a demoted or changed user keeps stale claims for at most
+    one access token lifetime. Same flow as SimpleJWT's otherwise.
+    """
+    token_class = CachedRefreshToken
 
     def validate(self, attrs):
-        # Replace 'email' with 'username' internally
-        email = attrs.get("email")
-        password = attrs.get("password")
-
-        if email and password:
-            user = authenticate(request=self.context.get('request'),
-                                username=email, password=password)
-            if not user:
-                raise serializers.ValidationError(
-                    "No active account found with the given credentials",
-                    code='authorization'
-                )
-            if not user.is_active:
-                raise serializers.ValidationError(
-                    "Account is disabled.",
-                    code='authorization'
-                )
-        else:
-            raise serializers.ValidationError(
-                "Must include 'email' and 'password'.",
-                code='authorization'
-            )
-
-        # This calls the parent to generate tokens
-        data = super().validate(attrs)
-        return data
\ No newline at end of file
+        refresh = self.token_class(attrs['refresh'])
+
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        user = get_user_model().objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+        set_user_claims(refresh, user)
+        refresh.payload.pop('team_id', None)  # no longer issued
+
+        data = {'access': str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data['refresh'] = str(refresh)
+
+        return data
@@ -1,13 +1,34 @@
-from django.test import TestCase
+import io
+import re
+import threading
+from datetime import timedelta
+
+from django.core import mail
+from django.core.cache import cache
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from unittest import mock
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIClient
-from users.models import User
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken
+from emails.models import OutboundEmail
+from users.models import User, UserProfile
+from . import blacklist
+from .blacklist import BloomFilter, reset_bloom_filter
+from .throttling import IPSlidingWindowThrottle
 
 class AuthAPITestCase(TestCase):
     def setUp(self):
         self.client = APIClient()
         self.user = User.objects.create_user(email="test@test.com", password="pass123")
+        cache.clear()
+        reset_bloom_filter()
 
     def test_login_success(self):
         response = self.client.post(reverse('token_obtain_pair'), {
@@ -43,4 +64,199 @@ class AuthAPITestCase(TestCase):
         })
         self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + login.data['access'])
         response = self.client.post(reverse('token_blacklist'), {"refresh": login.data['refresh']})
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(PASSWORD_RESET_TOKEN_MODE='profile')
+    def test_password_reset_creates_profile_lazily(self):
+        self.assertFalse(UserProfile.objects.filter(user=self.user).exists())
+
+        response = self.client.post(reverse('auth_forgot_password'), {"email": "test@test.com"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Mail is queued for the worker, not sent inline
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboundEmail.objects.filter(to=["test@test.com"]).count(), 1)
+        token = UserProfile.objects.get(user=self.user).reset_token
+
+        response = self.client.post(reverse('auth_reset_password', kwargs={'token': token}), {
+            "password": "newpass123",
+            "confirm_password": "newpass123"
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("newpass123"))
+        # Token is consumed together with the profile row
+        self.assertFalse(UserProfile.objects.filter(user=self.user).exists())
+
+    def test_stateless_password_reset_is_single_use(self):
+        self.client.post(reverse('auth_forgot_password'), {"email": "test@test.com"})
+        self.assertFalse(UserProfile.objects.exists())
+        html = OutboundEmail.objects.get().html_body
+        token = re.search(r"/reset-password/([^/]+)/", html).group(1)
+
+        url = reverse('auth_reset_password', kwargs={'token': token})
+        data = {"password": "newpass123", "confirm_password": "newpass123"}
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password("newpass123"))
+
+        # The new password hash invalidates the token
+        response = self.client.post(url, data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def _assert_rotated_token_rejected(self):
+        login = self.client.post(reverse('token_obtain_pair'), {
+            "email": "test@test.com",
+            "password": "pass123"
+        })
+        old_refresh = login.data['refresh']
+        response = self.client.post(reverse('token_refresh'), {"refresh": old_refresh})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        new_refresh = response.data['refresh']
+
+        response = self.client.post(reverse('token_refresh'), {"refresh": old_refresh})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post(reverse('token_refresh'), {"refresh": new_refresh})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_rotated_refresh_token_rejected(self):
+        self._assert_rotated_token_rejected()
+
+    @override_settings(JWT_BLACKLIST_SHARED_CACHE=True)
+    def test_rotated_refresh_token_rejected_with_bloom_filter(self):
+        self._assert_rotated_token_rejected()
+        # Even after the cache entry is gone the snapshot still knows about it
+        cache.clear()
+        reset_bloom_filter()
+        self._assert_rotated_token_rejected()
+
+    def test_bloom_filter(self):
+        bloom = BloomFilter(100)
+        for i in range(100):
+            bloom.add(f"jti-{i}")
+        self.assertTrue(all(f"jti-{i}" in bloom for i in range(100)))
+        false_positives = sum(f"other-{i}" in bloom for i in range(1000))
+        self.assertLess(false_positives, 50)
+
+    def test_stale_bloom_filter_served_while_another_thread_rebuilds(self):
+        old = blacklist._bloom_filter()
+        blacklist._snapshot.update(built_at=0.0, building=True)
+        with self.assertNumQueries(0):
+            self.assertIs(blacklist._bloom_filter(), old)
+        blacklist._snapshot['building'] = False
+        self.assertIsNot(blacklist._bloom_filter(), old)
+
+    def test_purge_expired_tokens(self):
+        OutstandingToken.objects.create(
+            user=self.user, jti="old", token="x",
+            expires_at=timezone.now() - timedelta(days=1)
+        )
+        OutstandingToken.objects.create(
+            user=self.user, jti="live", token="y",
+            expires_at=timezone.now() + timedelta(days=1)
+        )
+        call_command('purge_jwt_tokens', batch_size=1, stdout=io.StringIO())
+        self.assertEqual(list(OutstandingToken.objects.values_list('jti', flat=True)), ["live"])
+
+    def test_read_requests_skip_user_query(self):
+        login = self.client.post(reverse('token_obtain_pair'), {
+            "email": "test@test.com",
+            "password": "pass123"
+        })
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer ' + login.data['access'])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('campaign-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(any('"users_user"' in q['sql'] for q in queries.captured_queries))
+
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer invalid')
+        response = self.client.get(reverse('campaign-list'))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_token_carries_user_claims(self):
+        login = self.client.post(reverse('token_obtain_pair'), {
+            "email": "test@test.com",
+            "password": "pass123"
+        })
+        access = AccessToken(login.data['access'])
+        self.assertEqual(access['email'], "test@test.com")
+        self.assertFalse(access['is_staff'])
+        self.assertNotIn('team_id', access)
+
+        # Claims follow the DB on refresh instead of being copied forward
+        self.user.is_staff = True
+        self.user.save()
+        refreshed = self.client.post(reverse('token_refresh'), {'refresh': login.data['refresh']})
+        self.assertTrue(AccessToken(refreshed.data['access'])['is_staff'])
+
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.post(reverse('token_refresh'), {'refresh': refreshed.data['refresh']})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_login_throttled_per_account(self):
+        rates = {'login_ip': '100/min', 'login_account': '2/min'}
+        with self.settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': rates}):
+            for _ in range(2):
+                response = self.client.post(reverse('token_obtain_pair'), {
+                    "email": "test@test.com", "password": "wrong"
+                })
+                self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+            with mock.patch('django.contrib.auth.backends.ModelBackend.authenticate') as check:
+                response = self.client.post(reverse('token_obtain_pair'), {
+                    "email": "TEST@test.com", "password": "pass123"
+                }, REMOTE_ADDR="10.0.0.2")
+                check.assert_not_called()
+            self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertIn('Retry-After', response)
+
+            # Other accounts are unaffected
+            response = self.client.post(reverse('token_obtain_pair'), {
+                "email": "other@test.com", "password": "x"
+            })
+            self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_ip_throttle_ignores_spoofed_forwarded_for_and_rejections(self):
+        rates = {'forgot_password_ip': '2/min'}
+        with self.settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': rates}):
+            # The proxy appends the real client address; earlier entries are client-supplied
+            codes = [
+                self.client.post(reverse('auth_forgot_password'), {"email": f"n{i}@test.com"},
+                                 HTTP_X_FORWARDED_FOR=f"10.9.9.{i}, 203.0.113.7").status_code
+                for i in range(4)
+            ]
+        self.assertEqual(codes, [200, 200, 429, 429])
+        # Rejected attempts were not added to the window
+        window = int(timezone.now().timestamp() // 60)
+        key = "throttle:forgot_password:ip:203.0.113.7:{}"
+        self.assertEqual(cache.get(key.format(window), 0) + cache.get(key.format(window - 1), 0), 2)
+
+    def test_concurrent_burst_cannot_overshoot_limit(self):
+        rates = {'login_ip': '3/min'}
+        view = mock.Mock(throttle_scope='login')
+        request = mock.Mock(META={'REMOTE_ADDR': '198.51.100.9'})
+        results = []
+        with self.settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': rates}):
+            barrier = threading.Barrier(10)
+
+            def attempt():
+                barrier.wait()
+                results.append(IPSlidingWindowThrottle().allow_request(request, view))
+
+            threads = [threading.Thread(target=attempt) for _ in range(10)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(results.count(True), 3)
+
+    def test_throttle_falls_back_to_local_counters(self):
+        rates = {'forgot_password_ip': '1/min'}
+        with self.settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': rates}), \
+                mock.patch('django.core.cache.cache.incr', side_effect=ConnectionError):
+            response = self.client.post(reverse('auth_forgot_password'), {"email": "nobody@test.com"})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            response = self.client.post(reverse('auth_forgot_password'), {"email": "nobody@test.com"})
+            self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
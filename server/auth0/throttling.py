@@ -0,0 +1,142 @@
+"""
+Sliding-window throttles for the auth endpoints.
+
+Each request bumps an atomic counter for the current fixed window and
+compares the value the increment returned, so concurrent requests can't all
+slip under the limit together. The sliding estimate weights the previous window by how much of it still overlaps
+the sliding window:
+
+    estimate = previous * (1 - elapsed / duration) + current
+
+Rates live in REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'] under
+"<view.throttle_scope>_<kind>", e.g. "login_ip" or "login_account". Views
+without a matching rate are not throttled. A rejected request takes its
+increment back, so a client hammering a closed window doesn't keep extending it.
+If the cache is unreachable the counters fall back to process memory rather
+than letting everything through.
+
+The IP comes from DRF's get_ident(), which honours REST_FRAMEWORK['NUM_PROXIES'].
+"""
+import hashlib
+import logging
+import threading
+import time
+
+from django.core.cache import cache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+logger = logging.getLogger(__name__)
+
+DURATIONS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+class _LocalCounters:
+    """In-process stand-in for the cache counters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def incr(self, key, timeout):
+        now = time.monotonic()
+        with self._lock:
+            if len(self._values) > 10000:
+                self._values = {k: v for k, v in self._values.items() if v[1] > now}
+            value, expires = self._values.get(key, (0, 0))
+            if expires <= now:
+                value = 0
+            self._values[key] = (value + 1, now + timeout)
+            return value + 1
+
+    def decr(self, key):
+        with self._lock:
+            value, expires = self._values.get(key, (0, 0))
+            if value > 0:
+                self._values[key] = (value - 1, expires)
+
+    def get(self, key):
+        value, expires = self._values.get(key, (0, 0))
+        return value if expires > time.monotonic() else 0
+
+
+_local_counters = _LocalCounters()
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    kind = None
+    cache = cache
+
+    def parse_rate(self, rate):
+        num, period = rate.split('/')
+        return int(num), DURATIONS[period[0]]
+
+    def get_ident_key(self, request):
+        """Return the identity being limited, or None to skip (default: client IP)."""
+        return self.get_ident(request)
+
+    def _incr(self, key, timeout):
+        try:
+            self.cache.add(key, 0, timeout)
+            return self.cache.incr(key)
+        except Exception as e:
+            logger.warning(f"Throttle cache unavailable, using in-process counters: {e}")
+            return _local_counters.incr(key, timeout)
+
+    def _decr(self, key):
+        try:
+            self.cache.decr(key)
+        except Exception:
+            # Cache down, or the key expired meanwhile
+            _local_counters.decr(key)
+
+    def _get(self, key):
+        # Local counters only hold anything while the cache is failing
+        try:
+            return max(self.cache.get(key, 0), _local_counters.get(key))
+        except Exception:
+            return _local_counters.get(key)
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(f"{scope}_{self.kind}") if scope else None
+        ident = self.get_ident_key(request) if rate else None
+        if ident is None:
+            return True
+
+        num_requests, duration = self.parse_rate(rate)
+        now = time.time()
+        window = int(now // duration)
+        elapsed = now - window * duration
+        key = f"throttle:{scope}:{self.kind}:{ident}"
+
+        current = self._incr(f"{key}:{window}", duration * 2)  # including this request
+        previous = self._get(f"{key}:{window - 1}")
+        if previous * (1 - elapsed / duration) + current <= num_requests:
+            return True
+        self._decr(f"{key}:{window}")
+
+        # Time until the estimate drops back under the limit
+        if current < num_requests:
+            self.wait_seconds = duration * (1 - (num_requests - current) / previous) - elapsed
+        else:
+            self.wait_seconds = (duration - elapsed) + duration * (1 - num_requests / current)
+        return False
+
+    def wait(self):
+        return max(1, self.wait_seconds)
+
+
+class IPSlidingWindowThrottle(SlidingWindowThrottle):
+    kind = 'ip'
+
+
+class AccountSlidingWindowThrottle(SlidingWindowThrottle):
+    """Limits attempts against one email address, whatever the source IP."""
+    kind = 'account'
+
+    def get_ident_key(self, request):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        return hashlib.sha256(email.strip().lower().encode()).hexdigest()[:32]
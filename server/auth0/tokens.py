@@ -0,0 +1,42 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from .blacklist import is_blacklisted
+
+
+class CachedRefreshToken(RefreshToken):
+    """
+    Refresh token whose blacklist check goes through auth0.blacklist, and
+    whose blacklist/outstand writes use the user id claim directly instead
+    of fetching the user row first.
+    """
+
+    def check_blacklist(self):
+        jti = self.payload[api_settings.JTI_CLAIM]
+        if is_blacklisted(jti, datetime_from_epoch(self.payload["exp"])):
+            raise TokenError(_("Token is blacklisted"))
+
+    def _outstanding_defaults(self):
+        return {
+            "user_id": self.payload.get(api_settings.USER_ID_CLAIM),
+            "created_at": self.current_time,
+            "token": str(self),
+            "expires_at": datetime_from_epoch(self.payload["exp"]),
+        }
+
+    def blacklist(self):
+        token, _ = OutstandingToken.objects.get_or_create(
+            jti=self.payload[api_settings.JTI_CLAIM],
+            defaults=self._outstanding_defaults(),
+        )
+        return BlacklistedToken.objects.get_or_create(token=token)
+
+    def outstand(self):
+        return OutstandingToken.objects.get_or_create(
+            jti=self.payload[api_settings.JTI_CLAIM],
+            defaults=self._outstanding_defaults(),
+        )
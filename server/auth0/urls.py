@@ -6,7 +6,9 @@ from rest_framework_simplejwt.views import (
     TokenVerifyView,
 )
 from drf_spectacular.utils import extend_schema_view, extend_schema
-from .serializers import CustomTokenObtainPairSerializer
+from .serializers import CustomTokenObtainPairSerializer, CachedTokenRefreshSerializer
+from server.metrics import token_refreshes
+from .throttling import AccountSlidingWindowThrottle, IPSlidingWindowThrottle
 from .views import RegisterView, LogoutView, ForgotPasswordView, ResetPasswordView
 
 
@@ -18,12 +20,24 @@ from .views import RegisterView, LogoutView, ForgotPasswordView, ResetPasswordVi
 )
 class LoginView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
+    # Rejected before any password hashing happens
+    throttle_classes = [IPSlidingWindowThrottle, AccountSlidingWindowThrottle]
+    throttle_scope = 'login'
 
 @extend_schema_view(
     post=extend_schema(tags=['Auth'], summary="Refresh JWT access token")
 )
 class RefreshView(TokenRefreshView):
-    pass
+    serializer_class = CachedTokenRefreshSerializer
+
+    def post(self, request, *args, **kwargs):
+        try:
+            response = super().post(request, *args, **kwargs)
+        except Exception:
+            token_refreshes.labels('failure').inc()
+            raise
+        token_refreshes.labels('success' if response.status_code == 200 else 'failure').inc()
+        return response
 
 @extend_schema_view(
     post=extend_schema(tags=['Auth'], summary="Verify JWT token")
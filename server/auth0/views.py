@@ -3,7 +3,7 @@ import uuid
 from datetime import timedelta
 
 from django.utils import timezone
-from django.core.mail import send_mail
+from django.contrib.auth.tokens import default_token_generator
 from django.template.loader import render_to_string
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes, force_str
@@ -13,27 +13,78 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework_simplejwt.tokens import RefreshToken
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 
-from users.models import User
+from emails.queue import enqueue_email
+from users.models import User, UserProfile
 from users.serializers import UserSerializer
+from .serializers import CustomTokenObtainPairSerializer
+from .throttling import AccountSlidingWindowThrottle, IPSlidingWindowThrottle
+from .tokens import CachedRefreshToken
 
 
 # ----------------------------------------------------------------------
 # Helper: JWT response
 # ----------------------------------------------------------------------
 def _jwt_response(user):
-    refresh = RefreshToken.for_user(user)
+    refresh = CustomTokenObtainPairSerializer.get_token(user)
     return {
         "refresh": str(refresh),
         "access": str(refresh.access_token),
         "user": UserSerializer(user).data,
     }
 
+# ----------------------------------------------------------------------
+# Helpers: password reset tokens
+# ----------------------------------------------------------------------
+# Tokens look like "<urlsafe_base64(pk)>-<secret>". In 'stateless' mode the
+# secret comes from PasswordResetTokenGenerator: it is signed, timestamped and
+# bound to the user's password hash, so checking it is pure CPU and it stops
+# working as soon as the password changes. In 'profile' mode the secret is a
+# random uuid stored on UserProfile.
+def _make_reset_token(user):
+    uidb64 = urlsafe_base64_encode(force_bytes(user.pk))
+    if settings.PASSWORD_RESET_TOKEN_MODE == 'stateless':
+        return f"{uidb64}-{default_token_generator.make_token(user)}"
+
+    token = f"{uidb64}-{uuid.uuid4()}"
+    UserProfile.objects.update_or_create(
+        user=user,
+        defaults={
+            "reset_token": token,
+            "reset_token_expiry": timezone.now() + timedelta(seconds=settings.PASSWORD_RESET_TIMEOUT),
+        },
+    )
+    return token
+
+def _check_reset_token(token):
+    """Return (user, profile, error). profile is None in stateless mode."""
+    try:
+        uidb64, secret = token.split("-", 1)
+        uid = force_str(urlsafe_base64_decode(uidb64))
+        if settings.PASSWORD_RESET_TOKEN_MODE == 'stateless':
+            user = User.objects.get(pk=uid)
+        else:
+            profile = UserProfile.objects.select_related('user').get(user_id=uid)
+    except (TypeError, ValueError, OverflowError, User.DoesNotExist, UserProfile.DoesNotExist):
+        return None, None, "Invalid token."
+
+    if settings.PASSWORD_RESET_TOKEN_MODE == 'stateless':
+        if not default_token_generator.check_token(user, secret):
+            return None, None, "Invalid or expired token."
+        return user, None, None
+
+    if not profile.reset_token or profile.reset_token != token:
+        return None, None, "Invalid token."
+    if profile.reset_token_expiry < timezone.now():
+        return None, None, "Token has expired."
+    return profile.user, profile, None
+
 @extend_schema(tags=['Auth'])
 class RegisterView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [IPSlidingWindowThrottle, AccountSlidingWindowThrottle]
+    throttle_scope = 'register'
 
     @extend_schema(
         summary="Register a new user",
@@ -59,6 +110,8 @@ class RegisterView(APIView):
 @extend_schema(tags=['Auth'])
 class ForgotPasswordView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [IPSlidingWindowThrottle, AccountSlidingWindowThrottle]
+    throttle_scope = 'forgot_password'
 
     @extend_schema(
         summary="Request password reset link",
@@ -82,10 +135,7 @@ class ForgotPasswordView(APIView):
             )
 
         # Generate token
-        token = urlsafe_base64_encode(force_bytes(user.pk)) + "-" + str(uuid.uuid4())
-        user.profile.reset_token = token
-        user.profile.reset_token_expiry = timezone.now() + timedelta(hours=1)
-        user.profile.save()
+        token = _make_reset_token(user)
 
         # Send email
         reset_url = f"{settings.FRONTEND_URL}/reset-password/{token}/"
@@ -94,13 +144,11 @@ class ForgotPasswordView(APIView):
             "reset_url": reset_url,
         })
 
-        send_mail(
+        # Delivered by the send_queued_emails worker
+        enqueue_email(
             subject="Password Reset Request",
-            message="",
-            html_message=html_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[user.email],
-            fail_silently=False,
+            to=[user.email],
+            html_body=html_message,
         )
 
         return Response(
@@ -133,28 +181,17 @@ class ResetPasswordView(APIView):
         if password != confirm_password:
             return Response({"error": "Passwords do not match."}, status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            uidb64, _ = token.split("-", 1)
-            uid = force_str(urlsafe_base64_decode(uidb64))
-            user = User.objects.get(pk=uid)
-        except (TypeError, ValueError, OverflowError, User.DoesNotExist):
-            return Response({"error": "Invalid token."}, status=status.HTTP_400_BAD_REQUEST)
-
-        profile = user.profile
-        if not profile.reset_token or profile.reset_token != token:
-            return Response({"error": "Invalid token."}, status=status.HTTP_400_BAD_REQUEST)
-
-        if profile.reset_token_expiry < timezone.now():
-            return Response({"error": "Token has expired."}, status=status.HTTP_400_BAD_REQUEST)
+        user, profile, error = _check_reset_token(token)
+        if error:
+            return Response({"error": error}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Reset password
+        # Reset password (this alone invalidates a stateless token)
         user.set_password(password)
         user.save()
 
-        # Clear token
-        profile.reset_token = None
-        profile.reset_token_expiry = None
-        profile.save()
+        # Consume stored token
+        if profile is not None:
+            profile.delete()
 
         return Response({"message": "Password reset successfully."}, status=status.HTTP_200_OK)
     
@@ -169,7 +206,7 @@ class LogoutView(APIView):
     )
     def post(self, request):
         try:
-            token = RefreshToken(request.data["refresh"])
+            token = CachedRefreshToken(request.data["refresh"])
             token.blacklist()
             return Response({"message": "Successfully logged out."}, status=status.HTTP_200_OK)
         except Exception as e:
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaigns', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='campaign',
+            name='flyer_variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:49
+
+import uploads.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaigns', '0002_campaign_flyer_variants'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='campaign',
+            name='flyer',
+            field=models.ImageField(blank=True, null=True, storage=uploads.storage.content_addressed_storage, upload_to='flyers/'),
+        ),
+    ]
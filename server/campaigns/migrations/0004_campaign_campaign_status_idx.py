@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('campaigns', '0003_alter_campaign_flyer'),
+        ('categories', '0001_initial'),
+        ('teams', '0004_teamclosure'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='campaign',
+            index=models.Index(fields=['is_active', 'date_from', 'date_to'], name='campaign_status_idx'),
+        ),
+    ]
@@ -2,6 +2,30 @@ import uuid
 from django.db import models
 from django.utils import timezone
 from teams.models import Team
+from uploads.storage import content_addressed_storage
+
+class CampaignQuerySet(models.QuerySet):
+    def with_status(self, today=None):
+        """
+        Annotate `status` and `is_open` in SQL, with the same rules as
+        Campaign.status_for, so they can be filtered and ordered on.
+        """
+        today = today or timezone.now().date()
+        return self.annotate(
+            status=models.Case(
+                models.When(is_active=False, then=models.Value("Draft")),
+                models.When(date_from__gt=today, then=models.Value("Scheduled")),
+                models.When(date_to__lt=today, then=models.Value("Closed")),
+                default=models.Value("Open"),
+                output_field=models.CharField(),
+            ),
+            is_open=models.Case(
+                models.When(is_active=True, date_from__lte=today, date_to__gte=today, then=models.Value(True)),
+                default=models.Value(False),
+                output_field=models.BooleanField(),
+            ),
+        )
+
 
 # Create your models here.
 class Campaign(models.Model):
@@ -9,7 +33,8 @@ class Campaign(models.Model):
     organizer = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='campaigns')
     categories = models.ManyToManyField('categories.Category', related_name='campaigns')
     name = models.CharField(max_length=255)
-    flyer = models.ImageField(upload_to='flyers/', blank=True, null=True)
+    flyer = models.ImageField(upload_to='flyers/', storage=content_addressed_storage, blank=True, null=True)
+    flyer_variants = models.JSONField(default=dict, blank=True, editable=False)  # see uploads/images.py
     summary = models.CharField(max_length=500)
     description = models.TextField()
 
@@ -20,25 +45,49 @@ class Campaign(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = CampaignQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # with_status() / ?status= filters
+            models.Index(fields=['is_active', 'date_from', 'date_to'], name='campaign_status_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
+    # Both properties use the with_status() annotation when the row has one
+
     @property
     def is_open(self):
         """True if campaign is active AND within date range"""
+        if '_is_open' in self.__dict__:
+            return self._is_open
         today = timezone.now().date()
         return self.is_active and self.date_from <= today <= self.date_to
 
+    @is_open.setter
+    def is_open(self, value):
+        self._is_open = value
+
     @property
     def status(self):
-        if not self.is_active:
+        if '_status' in self.__dict__:
+            return self._status
+        return self.status_for(self.is_active, self.date_from, self.date_to, timezone.now().date())
+
+    @status.setter
+    def status(self, value):
+        self._status = value
+
+    @staticmethod
+    def status_for(is_active, date_from, date_to, today):
+        """Status from raw values, for code that works on values() rows"""
+        if not is_active:
             return "Draft"
-        today = timezone.now().date()
-        if today < self.date_from:
+        if today < date_from:
             return "Scheduled"
-        if today > self.date_to:
+        if today > date_to:
             return "Closed"
         return "Open"
\ No newline at end of file
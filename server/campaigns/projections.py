@@ -0,0 +1,62 @@
+from server.projections import Projection, file_url, format_date, format_datetime, format_uuid
+from teams.projections import TeamProjection
+from uploads.images import variant_urls
+from .models import Campaign
+
+
+class CampaignListProjection(Projection):
+    """Same output as CampaignListSerializer."""
+
+    def by_id(self, campaigns):
+        storage = Campaign._meta.get_field('flyer').storage
+        rows = Campaign.objects.filter(pk__in=campaigns).with_status().values(
+            'id', 'ref', 'name', 'flyer', 'flyer_variants', 'summary',
+            'date_from', 'date_to', 'is_active', 'status', 'is_open', 'created_at',
+        )
+        result = {}
+        for campaign in rows:
+            result[campaign['id']] = {
+                'ref': format_uuid(campaign['ref']),
+                'name': campaign['name'],
+                'flyer': file_url(storage, campaign['flyer'], self.request),
+                'flyer_variants': variant_urls(storage, campaign['flyer_variants'], self.request),
+                'summary': campaign['summary'],
+                'date_from': format_date(campaign['date_from']),
+                'date_to': format_date(campaign['date_to']),
+                'is_active': campaign['is_active'],
+                'status': campaign['status'],
+                'is_open': campaign['is_open'],
+                'created_at': format_datetime(campaign['created_at']),
+            }
+        return result
+
+
+class CampaignProjection(Projection):
+    """Same output as CampaignSerializer, for the campaign list."""
+
+    relations = ('organizer', 'organizer.members')
+
+    def rows(self, queryset, spec):
+        storage = Campaign._meta.get_field('flyer').storage
+        campaigns = queryset.select_related(None).values(
+            'ref', 'name', 'summary', 'description', 'flyer', 'flyer_variants',
+            'organizer_id', 'created_at', 'updated_at',
+        )
+        organizers = {}
+        if spec.includes('organizer'):
+            organizers = TeamProjection(self.request).by_id(queryset.values('organizer_id'), spec.child('organizer'))
+
+        return [
+            {
+                'ref': format_uuid(campaign['ref']),
+                'name': campaign['name'],
+                'summary': campaign['summary'],
+                'description': campaign['description'],
+                'flyer': file_url(storage, campaign['flyer'], self.request),
+                'flyer_variants': variant_urls(storage, campaign['flyer_variants'], self.request),
+                'organizer': organizers.get(campaign['organizer_id']),
+                'created_at': format_datetime(campaign['created_at']),
+                'updated_at': format_datetime(campaign['updated_at']),
+            }
+            for campaign in campaigns
+        ]
@@ -1,17 +1,28 @@
 from rest_framework import serializers
 from .models import Campaign
 from teams.serializers import TeamSerializer
+from uploads.images import variant_urls
+from uploads.serializers import AttachUploadsMixin, UploadRefField
 
-class CampaignSerializer(serializers.ModelSerializer):
+class FlyerVariantsMixin(serializers.Serializer):
+    flyer_variants = serializers.SerializerMethodField()
+
+    def get_flyer_variants(self, obj):
+        return variant_urls(obj.flyer.storage, obj.flyer_variants, self.context.get('request'))
+
+class CampaignSerializer(AttachUploadsMixin, FlyerVariantsMixin, serializers.ModelSerializer):
     organizer = TeamSerializer(read_only=True)
     organizer_ref = serializers.UUIDField(write_only=True)  # to create
     flyer = serializers.ImageField(required=False, allow_null=True)
+    flyer_upload_ref = UploadRefField(help_text="Ref of a completed chunked upload to use as the flyer")
+
+    upload_fields = {'flyer_upload_ref': 'flyer'}
 
     class Meta:
         model = Campaign
         fields = [
             'ref', 'name', 'summary', 'description',
-            'flyer', 'organizer', 'organizer_ref',
+            'flyer', 'flyer_variants', 'flyer_upload_ref', 'organizer', 'organizer_ref',
             'created_at', 'updated_at'
         ]
         read_only_fields = ['ref', 'created_at', 'updated_at']
@@ -24,16 +35,16 @@ class CampaignSerializer(serializers.ModelSerializer):
         validated_data['organizer'] = team
         return super().create(validated_data)
     
-class CampaignListSerializer(serializers.ModelSerializer):
+class CampaignListSerializer(FlyerVariantsMixin, serializers.ModelSerializer):
     status = serializers.CharField(read_only=True)
     is_open = serializers.BooleanField(read_only=True)
 
     class Meta:
         model = Campaign
-        fields = ['ref', 'name', 'flyer', 'summary', 'date_from', 'date_to',
+        fields = ['ref', 'name', 'flyer', 'flyer_variants', 'summary', 'date_from', 'date_to',
                   'is_active', 'status', 'is_open', 'created_at']
 
-class CampaignDetailSerializer(serializers.ModelSerializer):
+class CampaignDetailSerializer(FlyerVariantsMixin, serializers.ModelSerializer):
     organizer = serializers.StringRelatedField()
     status = serializers.CharField(read_only=True)
     is_open = serializers.BooleanField(read_only=True)
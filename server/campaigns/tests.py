@@ -1,3 +1,83 @@
-from django.test import TestCase
+import datetime
 
-# Create your tests here.
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from teams.models import Team, TeamMember
+from users.models import User
+from web.views import CampaignView
+from .models import Campaign
+
+TODAY = timezone.now().date()
+DAY = datetime.timedelta(days=1)
+
+
+class CampaignStatusTestCase(TestCase):
+    def setUp(self):
+        self.team = Team.objects.create(name="Organizers")
+        other = Team.objects.create(name="Others")
+        for name, is_active, date_from, date_to, organizer in [
+            ("Draft", False, TODAY - DAY, TODAY + DAY, self.team),
+            ("Scheduled", True, TODAY + DAY, TODAY + 2 * DAY, self.team),
+            ("Open", True, TODAY, TODAY, other),
+            ("Closed", True, TODAY - 2 * DAY, TODAY - DAY, other),
+        ]:
+            Campaign.objects.create(
+                name=name, is_active=is_active, date_from=date_from, date_to=date_to,
+                organizer=organizer, summary="s", description="d",
+            )
+
+    def test_sql_status_matches_python(self):
+        for campaign in Campaign.objects.with_status(TODAY):
+            self.assertEqual(campaign.status, campaign.name)
+            self.assertEqual(
+                campaign.status,
+                Campaign.status_for(campaign.is_active, campaign.date_from, campaign.date_to, TODAY),
+            )
+            self.assertEqual(campaign.is_open, campaign.name == "Open")
+
+        self.assertEqual(
+            list(Campaign.objects.with_status(TODAY).filter(status="Closed").values_list('name', flat=True)),
+            ["Closed"],
+        )
+
+    def context(self, user):
+        request = RequestFactory().get('/campaigns/')
+        request.user = user
+        view = CampaignView()
+        view.setup(request)
+        return view.get_context_data()
+
+    def test_campaign_page_query_count_is_constant(self):
+        user = User.objects.create_user(email="o@test.com", password="pass")
+        TeamMember.objects.create(team=self.team, user=user)
+
+        # campaigns, categories prefetch, viewer's teams
+        with self.assertNumQueries(3):
+            context = self.context(user)
+        self.assertEqual(context['total_campaigns'], 4)
+        self.assertEqual(
+            sorted(c.name for c in context['campaigns'] if c.is_organizer), ["Draft", "Scheduled"]
+        )
+
+        with self.assertNumQueries(2):
+            context = self.context(AnonymousUser())
+        self.assertFalse(any(c.is_organizer for c in context['campaigns']))
+
+    def test_status_filter_and_ordering(self):
+        client = APIClient()
+        client.force_authenticate(user=User.objects.create_user(email="c@test.com", password="pass"))
+
+        response = client.get(reverse('campaign-list'), {'status': 'open'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([c['name'] for c in response.data], ["Open"])
+
+        response = client.get(reverse('campaign-list'), {'status': 'scheduled,closed'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = client.get(reverse('campaign-list'), {'ordering': 'status', 'fields': 'name'})
+        self.assertEqual([c['name'] for c in response.data], ["Closed", "Draft", "Open", "Scheduled"])
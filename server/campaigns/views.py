@@ -2,29 +2,51 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from django.db.models import Count
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 
+from auth0.authentication import ClaimsJWTAuthentication
+from server.etags import ConditionalGetMixin
+from server.projections import ProjectionListMixin
+from server.sparse import SPARSE_PARAMETERS, SparseFieldsMixin
 from projects.models import ProjectCampaign
 from campaigns.models import Campaign
+from campaigns.projections import CampaignProjection
 from campaigns.serializers import CampaignSerializer
 
+STATUSES = {'draft': "Draft", 'scheduled': "Scheduled", 'open': "Open", 'closed': "Closed"}
+STATUS_PARAMETER = OpenApiParameter(
+    'status', OpenApiTypes.STR, enum=list(STATUSES), description="Only campaigns with this status"
+)
+
+
 @extend_schema(tags=['Campaigns'])
-class CampaignViewSet(viewsets.ModelViewSet):
-    # 1. Optimization moved to class attribute matching ProjectViewSet style
-    queryset = Campaign.objects.select_related('organizer')
+class CampaignViewSet(ConditionalGetMixin, SparseFieldsMixin, ProjectionListMixin, viewsets.ModelViewSet):
+    queryset = Campaign.objects.all()
     serializer_class = CampaignSerializer
     permission_classes = [IsAuthenticated]
     lookup_field = 'ref'
+    authentication_classes = [ClaimsJWTAuthentication]  # no user query on reads
+    list_projection = CampaignProjection  # values()-based list, same JSON as CampaignSerializer
+    ordering_fields = ['name', 'status', 'date_from', 'date_to', 'created_at']
+    select_related_fields = {'organizer': 'organizer'}
+    prefetch_related_fields = {'organizer.members': 'organizer__memberships'}
+    etag_models = ['campaigns.Campaign', 'teams.Team', 'teams.TeamMember']
 
     def get_queryset(self):
-        qs = super().get_queryset()
+        qs = super().get_queryset().with_status()
         # Optional: Add filtering logic here similar to ProjectViewSet
         # Example: Filter by active campaigns
         is_active = self.request.query_params.get('is_active')
         if is_active:
             qs = qs.filter(is_active=is_active.lower() == 'true')
+        status_param = self.request.query_params.get('status')
+        if status_param:
+            if status_param.lower() not in STATUSES:
+                raise ValidationError({'status': f"Must be one of: {', '.join(STATUSES)}."})
+            qs = qs.filter(status=STATUSES[status_param.lower()])
         return qs
 
     def perform_create(self, serializer):
@@ -32,10 +54,14 @@ class CampaignViewSet(viewsets.ModelViewSet):
         # You can add a check here (e.g. is_staff) if needed, similar to the "is_leader" check
         serializer.save(organizer=self.request.user)
 
-    @extend_schema(summary="List all campaigns")
+    @extend_schema(summary="List all campaigns", parameters=[STATUS_PARAMETER, *SPARSE_PARAMETERS])
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @extend_schema(parameters=SPARSE_PARAMETERS)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     @extend_schema(summary="Create a new campaign")
     def create(self, request, *args, **kwargs):
         return super().create(request, *args, **kwargs)
@@ -0,0 +1,23 @@
+from server.projections import Projection, format_datetime, related_count
+from .models import Category
+from projects.models import ProjectCampaign
+
+
+class CategoryProjection(Projection):
+    """Same output as CategorySerializer."""
+
+    def by_id(self, categories):
+        rows = Category.objects.filter(pk__in=categories).annotate(
+            project_count=related_count(ProjectCampaign, 'category'),
+        ).values('id', 'name', 'description', 'created_at', 'updated_at', 'project_count')
+        return {
+            category['id']: {
+                'id': category['id'],
+                'name': category['name'],
+                'description': category['description'],
+                'created_at': format_datetime(category['created_at']),
+                'updated_at': format_datetime(category['updated_at']),
+                'project_count': category['project_count'],
+            }
+            for category in rows
+        }
@@ -14,7 +14,7 @@ class CategorySerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at', 'project_count']
 
     def get_project_count(self, obj):
-        return obj.project_set.count()  # assuming Project has category = ForeignKey(Category)
+        return obj.projectcampaign_set.count()
 
     def validate_name(self, value):
         if self.instance:
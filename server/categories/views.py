@@ -5,16 +5,20 @@ from rest_framework.permissions import IsAdminUser, AllowAny
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 
+from auth0.authentication import ClaimsJWTAuthentication
+from server.etags import ConditionalGetMixin
 from .models import Category
 from .serializers import CategorySerializer
 
 @extend_schema(tags=['Categories'])
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     lookup_field = 'id'
     search_fields = ['name', 'description']
     ordering_fields = ['name', 'created_at', 'updated_at']
+    authentication_classes = [ClaimsJWTAuthentication]  # no user query on reads
+    etag_models = ['categories.Category', 'projects.ProjectCampaign']
 
     def get_permissions(self):
         if self.action in ['list', 'retrieve']:
@@ -52,7 +56,7 @@ class CategoryViewSet(viewsets.ModelViewSet):
     )
     def destroy(self, request, *args, **kwargs):
         category = self.get_object()
-        if category.project_set.exists():
+        if category.projectcampaign_set.exists():
             return Response(
                 {"error": "Cannot delete category with associated projects."},
                 status=status.HTTP_400_BAD_REQUEST
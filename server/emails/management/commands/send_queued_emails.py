@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from emails.queue import send_pending
+
+
+class Command(BaseCommand):
+    help = "Send queued outbound emails (run with --loop as a background worker)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--loop', action='store_true', help="Keep polling the queue")
+        parser.add_argument('--interval', type=float, default=5.0, help="Seconds between polls when idle")
+
+    def handle(self, *args, **options):
+        while True:
+            result = send_pending(batch_size=options['batch_size'])
+            if result['sent'] or result['failed']:
+                self.stdout.write(f"Sent {result['sent']}, failed {result['failed']}")
+
+            if not options['loop']:
+                break
+            # Drain back-to-back while there is work, sleep when idle
+            if not (result['sent'] or result['failed']):
+                time.sleep(options['interval'])
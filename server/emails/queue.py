@@ -0,0 +1,132 @@
+"""
+DB-backed outbound email queue.
+
+Views call enqueue_email() and return immediately; the send_queued_emails
+worker command drains the queue in batches over a single connection,
+retrying failures with exponential backoff and dead-lettering messages
+after EMAIL_QUEUE_MAX_ATTEMPTS.
+
+A batch is claimed in a short transaction (status "sending" plus a
+claimed_at lease) and sent after it commits, so no DB transaction or row
+lock is held while talking to the mail server. Each outcome is then its own
+single-row write. A claim older than EMAIL_QUEUE_CLAIM_TIMEOUT belongs to a
+worker that died mid-batch and is picked up again, so delivery is
+at-least-once.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import OutboundEmail
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_email(subject, to, body='', html_body='', from_email=None):
+    """Queue an email for the background worker."""
+    return OutboundEmail.objects.create(
+        subject=subject,
+        body=body,
+        html_body=html_body,
+        from_email=from_email or settings.DEFAULT_FROM_EMAIL,
+        to=list(to),
+    )
+
+
+def _build_message(email, connection):
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email,
+        to=email.to,
+        connection=connection,
+    )
+    if email.html_body:
+        message.attach_alternative(email.html_body, "text/html")
+    return message
+
+
+def _mark_failed(email, error, now):
+    email.attempts += 1
+    email.last_error = str(error)
+    if email.attempts >= settings.EMAIL_QUEUE_MAX_ATTEMPTS:
+        email.status = 'dead'
+        logger.error(f"Email {email.pk} dead-lettered after {email.attempts} attempts: {error}")
+    else:
+        email.status = 'pending'
+        delay = settings.EMAIL_QUEUE_RETRY_DELAY * 2 ** (email.attempts - 1)
+        email.next_attempt_at = now + timedelta(seconds=delay)
+        logger.warning(f"Email {email.pk} failed (attempt {email.attempts}), retrying in {delay}s: {error}")
+    _release(email, status=email.status, attempts=email.attempts, last_error=email.last_error,
+             next_attempt_at=email.next_attempt_at)
+
+
+def _release(email, **fields):
+    # Only while our claim stands; after a timeout another worker owns the row
+    OutboundEmail.objects.filter(pk=email.pk, status='sending', claimed_at=email.claimed_at).update(
+        claimed_at=None, updated_at=timezone.now(), **fields
+    )
+
+
+def _claim(batch_size, now):
+    expired = now - timedelta(seconds=settings.EMAIL_QUEUE_CLAIM_TIMEOUT)
+    with transaction.atomic():
+        emails = list(
+            OutboundEmail.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status='pending', next_attempt_at__lte=now)
+                | Q(status='sending', claimed_at__lt=expired)
+            )
+            .order_by('next_attempt_at')[:batch_size]
+        )
+        OutboundEmail.objects.filter(pk__in=[email.pk for email in emails]).update(
+            status='sending', claimed_at=now, updated_at=now
+        )
+    for email in emails:
+        email.status, email.claimed_at = 'sending', now
+    return emails
+
+
+def send_pending(batch_size=None):
+    """
+    Send one batch of due emails. Returns {"sent": int, "failed": int}.
+
+    Rows are claimed first (skipping ones another worker is locking), so
+    concurrent workers never send the same message twice.
+    """
+    batch_size = batch_size or settings.EMAIL_QUEUE_BATCH_SIZE
+    now = timezone.now()
+    result = {'sent': 0, 'failed': 0}
+
+    emails = _claim(batch_size, now)
+    if not emails:
+        return result
+
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as e:
+        for email in emails:
+            _mark_failed(email, e, now)
+        result['failed'] = len(emails)
+        return result
+
+    try:
+        for email in emails:
+            try:
+                _build_message(email, connection).send()
+            except Exception as e:
+                _mark_failed(email, e, now)
+                result['failed'] += 1
+            else:
+                _release(email, status='sent', sent_at=timezone.now(), attempts=F('attempts') + 1)
+                result['sent'] += 1
+    finally:
+        connection.close()
+
+    return result
@@ -0,0 +1,71 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .models import OutboundEmail
+from .queue import enqueue_email, send_pending
+
+
+class EmailQueueTestCase(TestCase):
+    def test_enqueue_does_not_send(self):
+        enqueue_email("Hello", ["a@test.com"], html_body="<p>Hi</p>")
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboundEmail.objects.get().status, 'pending')
+
+    def test_send_pending_batch(self):
+        enqueue_email("One", ["a@test.com"], html_body="<p>1</p>")
+        enqueue_email("Two", ["b@test.com"], body="2")
+
+        result = send_pending()
+        self.assertEqual(result, {'sent': 2, 'failed': 0})
+        self.assertEqual([m.subject for m in mail.outbox], ["One", "Two"])
+        self.assertEqual(mail.outbox[0].alternatives[0][1], "text/html")
+        self.assertFalse(OutboundEmail.objects.exclude(status='sent').exists())
+
+        # Nothing left to do
+        self.assertEqual(send_pending(), {'sent': 0, 'failed': 0})
+
+    @override_settings(EMAIL_QUEUE_MAX_ATTEMPTS=2, EMAIL_QUEUE_RETRY_DELAY=0)
+    def test_retry_then_dead_letter(self):
+        email = enqueue_email("Flaky", ["a@test.com"])
+
+        with mock.patch('django.core.mail.EmailMultiAlternatives.send', side_effect=OSError("SMTP down")):
+            self.assertEqual(send_pending(), {'sent': 0, 'failed': 1})
+            email.refresh_from_db()
+            self.assertEqual((email.status, email.attempts), ('pending', 1))
+
+            send_pending()
+            email.refresh_from_db()
+            self.assertEqual((email.status, email.attempts), ('dead', 2))
+            self.assertEqual(email.last_error, "SMTP down")
+
+        # Dead letters are never picked up again
+        self.assertEqual(send_pending(), {'sent': 0, 'failed': 0})
+
+    def test_rows_are_claimed_while_sending(self):
+        email = enqueue_email("Claimed", ["a@test.com"])
+        seen = []
+
+        def send(message):
+            seen.append(OutboundEmail.objects.values_list('status', 'claimed_at').get(pk=email.pk))
+            return 1
+
+        with mock.patch('django.core.mail.EmailMultiAlternatives.send', autospec=True, side_effect=send):
+            self.assertEqual(send_pending(), {'sent': 1, 'failed': 0})
+        self.assertEqual(seen[0][0], 'sending')
+        self.assertIsNotNone(seen[0][1])
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.claimed_at, email.attempts), ('sent', None, 1))
+
+    @override_settings(EMAIL_QUEUE_CLAIM_TIMEOUT=60)
+    def test_expired_claim_is_retried(self):
+        email = enqueue_email("Orphaned", ["a@test.com"])
+        OutboundEmail.objects.filter(pk=email.pk).update(status='sending', claimed_at=timezone.now())
+        self.assertEqual(send_pending(), {'sent': 0, 'failed': 0})
+
+        OutboundEmail.objects.filter(pk=email.pk).update(claimed_at=timezone.now() - timedelta(minutes=2))
+        self.assertEqual(send_pending(), {'sent': 1, 'failed': 0})
+        self.assertEqual(len(mail.outbox), 1)
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:49
+
+import uploads.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0002_project_image_variants'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='project',
+            name='image',
+            field=models.ImageField(blank=True, null=True, storage=uploads.storage.content_addressed_storage, upload_to='uploads/project-images/'),
+        ),
+    ]
@@ -4,6 +4,7 @@ from users.models import User
 from teams.models import Team
 from campaigns.models import Campaign
 from categories.models import Category
+from uploads.storage import content_addressed_storage
 
 # Create your models here.
 class Project(models.Model):
@@ -12,7 +13,10 @@ class Project(models.Model):
     name = models.CharField(max_length=255)
     summary = models.TextField(max_length=300)
     description = models.TextField()
-    image = models.ImageField(upload_to='uploads/project-images/', blank=True, null=True)
+    image = models.ImageField(
+        upload_to='uploads/project-images/', storage=content_addressed_storage, blank=True, null=True
+    )
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)  # see uploads/images.py
 
     campaigns = models.ManyToManyField(
         Campaign,
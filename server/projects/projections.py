@@ -0,0 +1,65 @@
+from collections import defaultdict
+
+from campaigns.projections import CampaignListProjection
+from categories.projections import CategoryProjection
+from server.projections import Projection, file_url, format_datetime, format_uuid
+from teams.projections import TeamProjection
+from uploads.images import variant_urls
+from .models import Project, ProjectCampaign
+
+
+class ProjectProjection(Projection):
+    """Same output as ProjectSerializer, for the project list."""
+
+    relations = ('team', 'team.members', 'campaigns', 'campaigns.campaign', 'campaigns.category')
+
+    def campaigns_by_project(self, projects, spec):
+        entries = list(
+            ProjectCampaign.objects.filter(project__in=projects).order_by('pk')
+            .values('project_id', 'campaign_id', 'category_id', 'joined_at')
+        )
+        campaigns, categories = {}, {}
+        if spec.includes('campaign'):
+            campaigns = CampaignListProjection(self.request).by_id([e['campaign_id'] for e in entries])
+        if spec.includes('category'):
+            categories = CategoryProjection(self.request).by_id(
+                [e['category_id'] for e in entries if e['category_id'] is not None]
+            )
+
+        result = defaultdict(list)
+        for entry in entries:
+            result[entry['project_id']].append({
+                'campaign': campaigns.get(entry['campaign_id']),
+                'category': categories.get(entry['category_id']),
+                'joined_at': format_datetime(entry['joined_at']),
+            })
+        return result
+
+    def rows(self, queryset, spec):
+        storage = Project._meta.get_field('image').storage
+        queryset = queryset.select_related(None).prefetch_related(None)
+        projects = queryset.values(
+            'id', 'ref', 'name', 'summary', 'description', 'image', 'image_variants',
+            'team_id', 'created_at', 'updated_at',
+        )
+        teams, campaigns = {}, {}
+        if spec.includes('team'):
+            teams = TeamProjection(self.request).by_id(queryset.values('team_id'), spec.child('team'))
+        if spec.includes('campaigns'):
+            campaigns = self.campaigns_by_project(queryset.values('pk'), spec.child('campaigns'))
+
+        return [
+            {
+                'ref': format_uuid(project['ref']),
+                'name': project['name'],
+                'summary': project['summary'],
+                'description': project['description'],
+                'image': file_url(storage, project['image'], self.request),
+                'image_variants': variant_urls(storage, project['image_variants'], self.request),
+                'team': teams.get(project['team_id']),
+                'campaigns': campaigns.get(project['id'], []),
+                'created_at': format_datetime(project['created_at']),
+                'updated_at': format_datetime(project['updated_at']),
+            }
+            for project in projects
+        ]
@@ -3,6 +3,9 @@ from .models import Project, ProjectCampaign
 from teams.serializers import TeamSerializer
 from campaigns.serializers import CampaignListSerializer
 from categories.serializers import CategorySerializer
+from server.etags import bump_version
+from uploads.images import variant_urls
+from uploads.serializers import AttachUploadsMixin, UploadRefField
 
 class ProjectCampaignInlineSerializer(serializers.ModelSerializer):
     campaign = CampaignListSerializer(read_only=True)
@@ -38,7 +41,7 @@ class ProjectCampaignInlineSerializer(serializers.ModelSerializer):
         data['campaign'] = campaign
         return data
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(AttachUploadsMixin, serializers.ModelSerializer):
     team = TeamSerializer(read_only=True)
     campaigns = ProjectCampaignInlineSerializer(
         source='projectcampaign_set',
@@ -51,16 +54,23 @@ class ProjectSerializer(serializers.ModelSerializer):
         required=False,
         help_text="List of campaigns to join with category"
     )
+    image_variants = serializers.SerializerMethodField()
+    image_upload_ref = UploadRefField(help_text="Ref of a completed chunked upload to use as the image")
+
+    upload_fields = {'image_upload_ref': 'image'}
 
     class Meta:
         model = Project
         fields = [
-            'ref', 'name', 'summary', 'description', 'image',
+            'ref', 'name', 'summary', 'description', 'image', 'image_variants', 'image_upload_ref',
             'team', 'campaigns', 'join_campaigns',
             'created_at', 'updated_at'
         ]
         read_only_fields = ['ref', 'team', 'created_at', 'updated_at']
 
+    def get_image_variants(self, obj):
+        return variant_urls(obj.image.storage, obj.image_variants, self.context.get('request'))
+
     def create(self, validated_data):
         join_data = validated_data.pop('join_campaigns', [])
         team = self.context['request'].user.team_member.team
@@ -76,12 +86,13 @@ class ProjectSerializer(serializers.ModelSerializer):
                 category_id=item.get('category_id')
             ))
         ProjectCampaign.objects.bulk_create(entries, ignore_conflicts=True)
+        bump_version(ProjectCampaign)
 
         return project
 
-    def update(self, validated_data):
+    def update(self, instance, validated_data):
         join_data = validated_data.pop('join_campaigns', None)
-        project = super().update(validated_data)
+        project = super().update(instance, validated_data)
 
         if join_data is not None:
             # Optional: allow adding more campaigns on update
@@ -93,5 +104,6 @@ class ProjectSerializer(serializers.ModelSerializer):
                     category_id=item.get('category_id')
                 ))
             ProjectCampaign.objects.bulk_create(entries, ignore_conflicts=True)
+            bump_version(ProjectCampaign)
 
         return project
\ No newline at end of file
@@ -6,18 +6,32 @@ from rest_framework.exceptions import PermissionDenied
 from django.db.models import Count, Prefetch
 from drf_spectacular.utils import extend_schema
 
+from auth0.authentication import ClaimsJWTAuthentication
+from server.etags import ConditionalGetMixin
+from server.projections import ProjectionListMixin
+from server.sparse import SPARSE_PARAMETERS, SparseFieldsMixin
 from .models import Project, ProjectCampaign
+from .projections import ProjectProjection
 from .serializers import ProjectSerializer
 
 
 @extend_schema(tags=['Projects'])
-class ProjectViewSet(viewsets.ModelViewSet):
-    queryset = Project.objects.select_related('team').prefetch_related(
-        Prefetch('projectcampaign_set', queryset=ProjectCampaign.objects.select_related('campaign', 'category'))
-    )
+class ProjectViewSet(ConditionalGetMixin, SparseFieldsMixin, ProjectionListMixin, viewsets.ModelViewSet):
+    queryset = Project.objects.all()
     serializer_class = ProjectSerializer
     lookup_field = 'ref'
     permission_classes = [IsAuthenticated]
+    authentication_classes = [ClaimsJWTAuthentication]  # no user query on reads
+    list_projection = ProjectProjection  # values()-based list, same JSON as ProjectSerializer
+    select_related_fields = {'team': 'team'}
+    prefetch_related_fields = {
+        'team.members': 'team__memberships',
+        'campaigns': Prefetch('projectcampaign_set', queryset=ProjectCampaign.objects.select_related('campaign', 'category')),
+    }
+    etag_models = [
+        'projects.Project', 'projects.ProjectCampaign', 'teams.Team', 'teams.TeamMember',
+        'campaigns.Campaign', 'categories.Category',
+    ]
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -31,10 +45,14 @@ class ProjectViewSet(viewsets.ModelViewSet):
             raise PermissionDenied("Only team leaders can create projects.")
         serializer.save()
 
-    @extend_schema(summary="List projects (optionally filter by campaign)")
+    @extend_schema(summary="List projects (optionally filter by campaign)", parameters=SPARSE_PARAMETERS)
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @extend_schema(parameters=SPARSE_PARAMETERS)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     @extend_schema(summary="Create project and join campaigns with categories")
     def create(self, request, *args, **kwargs):
         return super().create(request, *args, **kwargs)
@@ -0,0 +1,150 @@
+"""
+In-memory prefix index of team and project names for typeahead.
+
+Each process keeps a sorted list of normalized names; a lookup is a bisect to
+the first key >= the prefix and a scan while keys still start with it, so no
+query runs per keystroke. The index is built lazily on first use.
+
+Saves and deletes (search/signals.py) update the local index in place and
+bump a generation counter in the cache. A process that finds the cached
+generation ahead of its own (another worker changed a name) rebuilds on its
+next lookup.
+
+That counter only reaches other workers through a shared cache. With a
+per-process one (locmem, see server/caches.py) changes are still applied
+locally, and each process also rebuilds once its index is older than
+AUTOCOMPLETE_REBUILD_TTL seconds, which bounds how stale other workers get.
+"""
+import bisect
+import threading
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+
+from server.caches import is_shared
+
+GENERATION_KEY = "autocomplete:generation"
+
+SOURCES = {
+    'team': 'teams.Team',
+    'project': 'projects.Project',
+}
+
+
+def normalize(name):
+    """Case-insensitive key: casefolded, whitespace collapsed."""
+    return ' '.join((name or '').casefold().split())
+
+
+def _generation():
+    return cache.get(GENERATION_KEY, 0)
+
+
+def _bump_generation():
+    try:
+        return cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, 0, None)
+        return cache.incr(GENERATION_KEY)
+
+
+class PrefixIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys = []  # (normalized name, kind, pk), sorted
+        self._entries = {}  # (kind, pk) -> (key, ref, name)
+        self._generation = None  # None = not built
+        self._built_at = 0.0
+
+    def _build(self):
+        entries = {}
+        for kind, label in SOURCES.items():
+            for pk, ref, name in apps.get_model(label).objects.values_list('pk', 'ref', 'name').iterator():
+                entries[kind, pk] = (normalize(name), ref, name)
+        self._entries = entries
+        self._keys = sorted((key, kind, pk) for (kind, pk), (key, _, _) in entries.items())
+        self._built_at = time.monotonic()
+
+    def _ensure_current(self):
+        if is_shared():
+            generation = _generation()
+            if self._generation != generation:
+                self._build()
+                self._generation = generation
+        elif self._generation is None or time.monotonic() - self._built_at > settings.AUTOCOMPLETE_REBUILD_TTL:
+            self._build()
+            self._generation = 0
+
+    def _remove(self, kind, pk):
+        entry = self._entries.pop((kind, pk), None)
+        if entry is not None:
+            i = bisect.bisect_left(self._keys, (entry[0], kind, pk))
+            if i < len(self._keys) and self._keys[i] == (entry[0], kind, pk):
+                del self._keys[i]
+
+    def _changed(self, apply):
+        if not is_shared():
+            with self._lock:
+                if self._generation is not None:
+                    apply()
+            return
+
+        generation = _bump_generation()
+        with self._lock:
+            if self._generation is None:
+                return
+            if self._generation == generation - 1:
+                apply()
+                self._generation = generation
+            else:
+                self._generation = -1  # missed another process's change; rebuild on next use
+
+    def update(self, kind, pk, ref, name):
+        def apply():
+            self._remove(kind, pk)
+            key = normalize(name)
+            self._entries[kind, pk] = (key, ref, name)
+            bisect.insort(self._keys, (key, kind, pk))
+        self._changed(apply)
+
+    def remove(self, kind, pk):
+        self._changed(lambda: self._remove(kind, pk))
+
+    def suggest(self, prefix, kinds=None, limit=10):
+        """[{kind, ref, name}] whose normalized name starts with `prefix`, alphabetically."""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        with self._lock:
+            self._ensure_current()
+            results = []
+            for i in range(bisect.bisect_left(self._keys, (prefix,)), len(self._keys)):
+                key, kind, pk = self._keys[i]
+                if not key.startswith(prefix) or len(results) >= limit:
+                    break
+                if kinds is None or kind in kinds:
+                    _, ref, name = self._entries[kind, pk]
+                    results.append({'kind': kind, 'ref': ref, 'name': name})
+            return results
+
+    def exists(self, kind, name, exclude_pk=None):
+        """Whether another `kind` object already has this name, ignoring case."""
+        key = normalize(name)
+        with self._lock:
+            self._ensure_current()
+            i = bisect.bisect_left(self._keys, (key, kind))
+            while i < len(self._keys) and self._keys[i][:2] == (key, kind):
+                if self._keys[i][2] != exclude_pk:
+                    return True
+                i += 1
+            return False
+
+    def reset(self):
+        with self._lock:
+            self._generation = None
+            self._keys, self._entries = [], {}
+
+
+prefix_index = PrefixIndex()
@@ -0,0 +1,97 @@
+"""
+Ranked full-text queries against the SearchDocument index.
+
+Each backend returns [(document id, rank)] best first; the index itself is
+created by migration 0002 for the database in use:
+
+- postgresql: `vector` generated column (title A, summary B, body C weights)
+  with a GIN index, queried with websearch_to_tsquery() and ts_rank_cd().
+- sqlite: external-content FTS5 table `search_searchdocument_fts`, ranked
+  with bm25() using the same column weights. Used for local development
+  and the test suite.
+- anything else: unranked icontains matching.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import SearchDocument
+
+SEARCH_CONFIG = 'english'  # must match the generated column in migration 0002
+FTS_TABLE = 'search_searchdocument_fts'
+
+_words = re.compile(r'\w+', re.UNICODE)
+
+
+def _kind_filter(kinds, column):
+    if not kinds:
+        return '', []
+    return f" AND {column} IN ({', '.join(['%s'] * len(kinds))})", list(kinds)
+
+
+def _postgresql(query, kinds, limit):
+    kind_sql, kind_params = _kind_filter(kinds, 'd.kind')
+    sql = (
+        "SELECT d.id, ts_rank_cd(d.vector, q) AS rank "
+        "FROM search_searchdocument d, websearch_to_tsquery(%s::regconfig, %s) q "
+        f"WHERE d.vector @@ q{kind_sql} "
+        "ORDER BY rank DESC, d.id LIMIT %s"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [SEARCH_CONFIG, query, *kind_params, limit])
+        return cursor.fetchall()
+
+
+def _sqlite(query, kinds, limit):
+    # Quote every term so user input cannot use FTS5 query syntax; the
+    # last term also matches as a prefix ("robo" finds "robot").
+    terms = _words.findall(query)
+    if not terms:
+        return []
+    match = ' '.join(f'"{term}"' for term in terms) + '*'
+
+    kind_sql, kind_params = _kind_filter(kinds, 'd.kind')
+    sql = (
+        f"SELECT d.id, -bm25({FTS_TABLE}, 10.0, 4.0, 1.0) AS rank "
+        f"FROM {FTS_TABLE} JOIN search_searchdocument d ON d.id = {FTS_TABLE}.rowid "
+        f"WHERE {FTS_TABLE} MATCH %s{kind_sql} "
+        "ORDER BY rank DESC, d.id LIMIT %s"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [match, *kind_params, limit])
+        return cursor.fetchall()
+
+
+def _fallback(query, kinds, limit):
+    terms = _words.findall(query)
+    if not terms:
+        return []
+    condition = Q()
+    for term in terms:
+        condition &= Q(title__icontains=term) | Q(summary__icontains=term) | Q(body__icontains=term)
+    documents = SearchDocument.objects.filter(condition)
+    if kinds:
+        documents = documents.filter(kind__in=kinds)
+    return [(pk, 0.0) for pk in documents.order_by('title', 'pk').values_list('pk', flat=True)[:limit]]
+
+
+BACKENDS = {'postgresql': _postgresql, 'sqlite': _sqlite}
+
+
+def search(query, kinds=None, limit=20):
+    """Return SearchDocuments matching `query`, best first, each with `.rank`."""
+    query = query.strip()
+    if not query:
+        return []
+    ranked = BACKENDS.get(connection.vendor, _fallback)(query, kinds, limit)
+
+    documents = SearchDocument.objects.in_bulk([pk for pk, _ in ranked])
+    results = []
+    for pk, rank in ranked:
+        document = documents.get(pk)
+        if document is None:  # deleted since the ranking query
+            continue
+        document.rank = float(rank)
+        results.append(document)
+    return results
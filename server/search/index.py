@@ -0,0 +1,64 @@
+"""
+Keeps SearchDocument rows in step with the indexed models.
+
+INDEXED maps each document kind to its model and the fields that feed the
+title / summary / body columns (weighted in that order). Saves and deletes
+update a single document through the signals in search/signals.py;
+rebuild_search_index recreates everything.
+"""
+from django.apps import apps
+from django.db import transaction
+
+from .models import SearchDocument
+
+INDEXED = {
+    'project': ('projects.Project', 'name', 'summary', 'description'),
+    'team': ('teams.Team', 'name', None, 'description'),
+    'campaign': ('campaigns.Campaign', 'name', 'summary', None),
+}
+
+
+def indexed_models():
+    return {apps.get_model(label): kind for kind, (label, *_) in INDEXED.items()}
+
+
+def indexed_fields(kind):
+    return {name for name in INDEXED[kind][1:] if name}
+
+
+def _text(instance, name):
+    return (getattr(instance, name) or '') if name else ''
+
+
+def document_values(kind, instance):
+    _, title, summary, body = INDEXED[kind]
+    return {
+        'ref': instance.ref,
+        'title': _text(instance, title),
+        'summary': _text(instance, summary),
+        'body': _text(instance, body),
+    }
+
+
+def index_object(kind, instance):
+    SearchDocument.objects.update_or_create(
+        kind=kind, object_id=instance.pk, defaults=document_values(kind, instance)
+    )
+
+
+def remove_object(kind, pk):
+    SearchDocument.objects.filter(kind=kind, object_id=pk).delete()
+
+
+@transaction.atomic
+def rebuild(batch_size=500):
+    """Recreate every document; returns {kind: count}."""
+    counts = {}
+    SearchDocument.objects.all().delete()
+    for model, kind in indexed_models().items():
+        documents = (
+            SearchDocument(kind=kind, object_id=instance.pk, **document_values(kind, instance))
+            for instance in model.objects.only('pk', 'ref', *indexed_fields(kind)).iterator(chunk_size=batch_size)
+        )
+        counts[kind] = len(SearchDocument.objects.bulk_create(documents, batch_size=batch_size))
+    return counts
@@ -0,0 +1,100 @@
+"""
+Database-specific full-text index for SearchDocument (see search/backends.py),
+then a backfill of the documents for existing rows.
+"""
+from django.db import migrations
+
+POSTGRESQL = [
+    (
+        "ALTER TABLE search_searchdocument ADD COLUMN vector tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('english'::regconfig, title), 'A') || "
+        "setweight(to_tsvector('english'::regconfig, summary), 'B') || "
+        "setweight(to_tsvector('english'::regconfig, body), 'C')) STORED",
+        "ALTER TABLE search_searchdocument DROP COLUMN vector",
+    ),
+    (
+        "CREATE INDEX search_searchdocument_vector_gin ON search_searchdocument USING gin (vector)",
+        "DROP INDEX search_searchdocument_vector_gin",
+    ),
+]
+
+SQLITE = [
+    (
+        "CREATE VIRTUAL TABLE search_searchdocument_fts USING fts5("
+        "title, summary, body, content='search_searchdocument', content_rowid='id', "
+        "tokenize='porter unicode61')",
+        "DROP TABLE search_searchdocument_fts",
+    ),
+    (
+        "CREATE TRIGGER search_searchdocument_ai AFTER INSERT ON search_searchdocument BEGIN "
+        "INSERT INTO search_searchdocument_fts(rowid, title, summary, body) "
+        "VALUES (new.id, new.title, new.summary, new.body); END",
+        "DROP TRIGGER search_searchdocument_ai",
+    ),
+    (
+        "CREATE TRIGGER search_searchdocument_ad AFTER DELETE ON search_searchdocument BEGIN "
+        "INSERT INTO search_searchdocument_fts(search_searchdocument_fts, rowid, title, summary, body) "
+        "VALUES ('delete', old.id, old.title, old.summary, old.body); END",
+        "DROP TRIGGER search_searchdocument_ad",
+    ),
+    (
+        "CREATE TRIGGER search_searchdocument_au AFTER UPDATE ON search_searchdocument BEGIN "
+        "INSERT INTO search_searchdocument_fts(search_searchdocument_fts, rowid, title, summary, body) "
+        "VALUES ('delete', old.id, old.title, old.summary, old.body); "
+        "INSERT INTO search_searchdocument_fts(rowid, title, summary, body) "
+        "VALUES (new.id, new.title, new.summary, new.body); END",
+        "DROP TRIGGER search_searchdocument_au",
+    ),
+]
+
+STATEMENTS = {'postgresql': POSTGRESQL, 'sqlite': SQLITE}
+
+# kind: (model, title, summary, body), as in search/index.py
+DOCUMENTS = {
+    'project': (('projects', 'Project'), 'name', 'summary', 'description'),
+    'team': (('teams', 'Team'), 'name', None, 'description'),
+    'campaign': (('campaigns', 'Campaign'), 'name', 'summary', None),
+}
+
+
+def create_index(apps, schema_editor):
+    for forward, _ in STATEMENTS.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(forward)
+
+
+def drop_index(apps, schema_editor):
+    for _, backward in reversed(STATEMENTS.get(schema_editor.connection.vendor, [])):
+        schema_editor.execute(backward)
+
+
+def backfill(apps, schema_editor):
+    SearchDocument = apps.get_model('search', 'SearchDocument')
+    for kind, (model, *columns) in DOCUMENTS.items():
+        SearchDocument.objects.bulk_create(
+            [
+                SearchDocument(
+                    kind=kind, object_id=instance.pk, ref=instance.ref,
+                    **{
+                        target: (getattr(instance, source) or '') if source else ''
+                        for target, source in zip(('title', 'summary', 'body'), columns)
+                    },
+                )
+                for instance in apps.get_model(*model).objects.all()
+            ],
+            batch_size=500,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+        ('projects', '0003_alter_project_image'),
+        ('teams', '0002_team_parent'),
+        ('campaigns', '0003_alter_campaign_flyer'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """
+    One searchable project, team or campaign (see search/index.py).
+
+    The full-text index lives next to this table and is maintained by the
+    database: a generated tsvector column with a GIN index on Postgres, an
+    FTS5 table kept in sync by triggers on SQLite (migration 0002).
+    """
+    KIND_CHOICES = [
+        ('project', 'Project'),
+        ('team', 'Team'),
+        ('campaign', 'Campaign'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    ref = models.UUIDField()
+    title = models.CharField(max_length=255)
+    summary = models.TextField(blank=True, default='')
+    body = models.TextField(blank=True, default='')
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Search Document"
+        verbose_name_plural = "Search Documents"
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='search_document_unique_object'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}: {self.title}"
@@ -0,0 +1,36 @@
+from rest_framework import serializers
+
+from .models import SearchDocument
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=200, trim_whitespace=True)
+    kind = serializers.CharField(required=False, help_text="Comma-separated kinds: project, team, campaign")
+    limit = serializers.IntegerField(required=False, min_value=1)
+
+    def validate_kind(self, value):
+        kinds = {kind.strip() for kind in value.split(',') if kind.strip()}
+        unknown = kinds - {choice for choice, _ in SearchDocument.KIND_CHOICES}
+        if unknown:
+            raise serializers.ValidationError(f"Unknown kind: {', '.join(sorted(unknown))}.")
+        return sorted(kinds)
+
+
+class AutocompleteQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=100, trim_whitespace=True)
+    kind = serializers.ChoiceField(choices=['team', 'project'], required=False)
+    limit = serializers.IntegerField(required=False, min_value=1)
+
+
+class SuggestionSerializer(serializers.Serializer):
+    kind = serializers.CharField()
+    ref = serializers.UUIDField()
+    name = serializers.CharField()
+
+
+class SearchResultSerializer(serializers.ModelSerializer):
+    rank = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = SearchDocument
+        fields = ['kind', 'ref', 'title', 'summary', 'rank']
@@ -0,0 +1,52 @@
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_delete, post_init, post_save
+
+from .autocomplete import SOURCES, prefix_index
+from .index import index_object, indexed_fields, indexed_models, remove_object
+
+
+def document_changed(sender, instance, update_fields=None, **kwargs):
+    kind = indexed_models()[sender]
+    if update_fields is not None and not indexed_fields(kind) & set(update_fields):
+        return
+    index_object(kind, instance)
+
+
+def document_deleted(sender, instance, **kwargs):
+    remove_object(indexed_models()[sender], instance.pk)
+
+
+for model in indexed_models():
+    post_save.connect(document_changed, sender=model, dispatch_uid=f"search_index_{model._meta.label}")
+    post_delete.connect(document_deleted, sender=model, dispatch_uid=f"search_remove_{model._meta.label}")
+
+
+# Prefix index: only apply committed changes, so a rolled back save cannot
+# leave a name behind.
+AUTOCOMPLETE_KINDS = {apps.get_model(label): kind for kind, label in SOURCES.items()}
+
+
+def remember_name(sender, instance, **kwargs):
+    instance._indexed_name = instance.__dict__.get('name')  # None when deferred
+
+
+def name_changed(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and 'name' not in update_fields:
+        return
+    if not created and instance.name == getattr(instance, '_indexed_name', None):
+        return
+    instance._indexed_name = instance.name
+    kind, pk, ref, name = AUTOCOMPLETE_KINDS[sender], instance.pk, instance.ref, instance.name
+    transaction.on_commit(lambda: prefix_index.update(kind, pk, ref, name))
+
+
+def name_deleted(sender, instance, **kwargs):
+    kind, pk = AUTOCOMPLETE_KINDS[sender], instance.pk
+    transaction.on_commit(lambda: prefix_index.remove(kind, pk))
+
+
+for model in AUTOCOMPLETE_KINDS:
+    post_init.connect(remember_name, sender=model, dispatch_uid=f"autocomplete_init_{model._meta.label}")
+    post_save.connect(name_changed, sender=model, dispatch_uid=f"autocomplete_update_{model._meta.label}")
+    post_delete.connect(name_deleted, sender=model, dispatch_uid=f"autocomplete_remove_{model._meta.label}")
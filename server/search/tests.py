@@ -0,0 +1,156 @@
+import datetime
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from campaigns.models import Campaign
+from categories.models import Category
+from projects.models import Project
+from teams.models import Team
+from users.models import User
+from . import backends
+from .autocomplete import prefix_index
+from .backends import search
+from .models import SearchDocument
+
+
+class SearchTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=User.objects.create_user(email="a@test.com", password="password123"))
+
+        self.team = Team.objects.create(name="Robotics Club", description="We build robots")
+        self.robot = Project.objects.create(
+            team=self.team, name="Line follower", summary="A small robot", description="Arduino based",
+        )
+        self.lamp = Project.objects.create(
+            team=self.team, name="Robot lamp", summary="Desk lamp", description="Moves like a robot arm",
+        )
+        self.campaign = Campaign.objects.create(
+            organizer=self.team, name="Spring expo", summary="Show your gadgets", description="d",
+            date_from=datetime.date.today(), date_to=datetime.date.today(),
+        )
+
+    def test_documents_follow_saves_and_deletes(self):
+        self.assertEqual(SearchDocument.objects.count(), 4)
+
+        self.robot.name = "Maze solver"
+        self.robot.save()
+        self.assertEqual([d.ref for d in search("maze")], [self.robot.ref])
+
+        self.robot.delete()
+        self.assertEqual(search("maze"), [])
+
+    def test_ranked_endpoint(self):
+        response = self.client.get(reverse('search'), {'q': "robot"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # Title matches rank above a summary-only match; stemming finds "robots"
+        self.assertEqual(response.data[-1]['ref'], str(self.robot.ref))
+        self.assertEqual({r['kind'] for r in response.data}, {'project', 'team'})
+        ranks = [r['rank'] for r in response.data]
+        self.assertEqual(ranks, sorted(ranks, reverse=True))
+
+        response = self.client.get(reverse('search'), {'q': "robot", 'kind': "team"})
+        self.assertEqual([r['title'] for r in response.data], ["Robotics Club"])
+
+        response = self.client.get(reverse('search'), {'q': "gadg"})
+        self.assertEqual([r['kind'] for r in response.data], ['campaign'])
+
+    def test_query_syntax_is_escaped(self):
+        self.assertEqual(search('robot" (*'), search("robot"))
+        response = self.client.get(reverse('search'), {'q': "robot", 'kind': "user"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_documents_deleted_after_ranking_are_skipped(self):
+        ranked = search("robot")
+        gone = ranked[0].pk
+
+        def fake(query, kinds, limit):
+            return [(document.pk, document.rank) for document in ranked]
+
+        SearchDocument.objects.filter(pk=gone).delete()
+        with mock.patch.dict(backends.BACKENDS, {connection.vendor: fake}):
+            self.assertEqual([d.pk for d in search("robot")], [d.pk for d in ranked[1:]])
+
+    def test_rebuild(self):
+        SearchDocument.objects.all().delete()
+        call_command('rebuild_search_index', stdout=open('/dev/null', 'w'))
+        self.assertEqual(len(search("robot")), 3)
+
+    def test_search_filter_backend(self):
+        Category.objects.create(name="Robotics")
+        Category.objects.create(name="Art")
+        response = self.client.get(reverse('category-list'), {'search': "robo"})
+        self.assertEqual([c['name'] for c in response.data], ["Robotics"])
+
+
+class AutocompleteTestCase(TestCase):
+    def setUp(self):
+        prefix_index.reset()
+        self.client = APIClient()
+        self.user = User.objects.create_user(email="a@test.com", password="password123")
+        self.client.force_authenticate(user=self.user)
+        self.team = Team.objects.create(name="Robotics Club")
+        Project.objects.create(team=self.team, name="robot  Arm", summary="s", description="d")
+        Project.objects.create(team=self.team, name="Lamp", summary="s", description="d")
+
+    def test_prefix_lookup_without_queries(self):
+        prefix_index.suggest("x")  # build
+        with CaptureQueriesContext(connection) as queries:
+            suggestions = prefix_index.suggest("ROBOT ")
+        self.assertEqual(len(queries), 0)
+        self.assertEqual([s['name'] for s in suggestions], ["robot  Arm", "Robotics Club"])
+
+        response = self.client.get(reverse('autocomplete'), {'q': "rob", 'kind': "team"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [{'kind': 'team', 'ref': str(self.team.ref), 'name': "Robotics Club"}])
+
+    def test_index_follows_committed_changes(self):
+        prefix_index.suggest("x")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.team.name = "Makers"
+            self.team.save()
+            Team.objects.create(name="Robo Rangers")
+        self.assertEqual([s['name'] for s in prefix_index.suggest("robo")], ["Robo Rangers", "robot  Arm"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.team.delete()
+        self.assertEqual(prefix_index.suggest("mak"), [])
+
+    def test_unshared_cache_rebuilds_after_ttl(self):
+        prefix_index.suggest("x")
+        # Renamed by another worker: no signal reaches this process
+        Team.objects.filter(pk=self.team.pk).update(name="Makers")
+        self.assertEqual(prefix_index.suggest("mak"), [])
+
+        with self.settings(AUTOCOMPLETE_REBUILD_TTL=0):
+            self.assertEqual([s['name'] for s in prefix_index.suggest("mak")], ["Makers"])
+
+    def test_shared_cache_generation_triggers_rebuild(self):
+        with mock.patch('search.autocomplete.is_shared', return_value=True), \
+                mock.patch('search.autocomplete._generation', side_effect=[1, 1, 2]):
+            prefix_index.suggest("x")
+            Team.objects.filter(pk=self.team.pk).update(name="Makers")
+            self.assertEqual(prefix_index.suggest("mak"), [])
+            self.assertEqual([s['name'] for s in prefix_index.suggest("mak")], ["Makers"])
+
+    def test_team_names_unique_ignoring_case(self):
+        response = self.client.post(reverse('team-list'), {'name': " robotics club "})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('name', response.data)
+
+        # A stale index still cannot let a duplicate through
+        prefix_index.suggest("x")
+        Team.objects.create(name="Unlisted")
+        response = self.client.post(reverse('team-list'), {'name': "UNLISTED"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(reverse('team-list'), {'name': " New team "})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['name'], "New team")
@@ -0,0 +1,52 @@
+from django.conf import settings
+from drf_spectacular.utils import extend_schema
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from auth0.authentication import ClaimsJWTAuthentication
+from .autocomplete import prefix_index
+from .backends import search
+from .serializers import (
+    AutocompleteQuerySerializer, SearchQuerySerializer, SearchResultSerializer, SuggestionSerializer,
+)
+
+
+@extend_schema(tags=['Search'])
+class SearchView(APIView):
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [ClaimsJWTAuthentication]  # no user query on reads
+
+    @extend_schema(
+        summary="Search projects, teams and campaigns",
+        parameters=[SearchQuerySerializer],
+        responses={200: SearchResultSerializer(many=True)},
+    )
+    def get(self, request):
+        params = SearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        limit = min(params.validated_data.get('limit', settings.SEARCH_DEFAULT_LIMIT), settings.SEARCH_MAX_LIMIT)
+
+        results = search(params.validated_data['q'], params.validated_data.get('kind'), limit)
+        return Response(SearchResultSerializer(results, many=True).data)
+
+
+@extend_schema(tags=['Search'])
+class AutocompleteView(APIView):
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [ClaimsJWTAuthentication]
+
+    @extend_schema(
+        summary="Suggest team and project names starting with a prefix",
+        parameters=[AutocompleteQuerySerializer],
+        responses={200: SuggestionSerializer(many=True)},
+    )
+    def get(self, request):
+        params = AutocompleteQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        kind = params.validated_data.get('kind')
+        limit = min(params.validated_data.get('limit', settings.AUTOCOMPLETE_DEFAULT_LIMIT),
+                    settings.AUTOCOMPLETE_MAX_LIMIT)
+
+        suggestions = prefix_index.suggest(params.validated_data['q'], {kind} if kind else None, limit)
+        return Response(SuggestionSerializer(suggestions, many=True).data)
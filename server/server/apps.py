@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class ServerConfig(AppConfig):
+    """Project-wide plumbing (conditional GET, ...) shared by every app."""
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'server'
+
+    def ready(self):
+        import server.signals
@@ -0,0 +1,18 @@
+"""
+Whether a configured cache is shared between worker processes.
+
+Several features keep cross-worker state in the cache (JWT blacklist entries,
+ETag data versions, the autocomplete generation counter). With locmem or the
+dummy backend each worker sees only its own writes, so those features need a
+different strategy; they call is_shared() to pick one.
+"""
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def is_shared(alias='default', override=None):
+    """`override` (a True/False setting) wins; otherwise anything but locmem/dummy counts as shared."""
+    if override is not None:
+        return override
+    return not isinstance(caches[alias], (LocMemCache, DummyCache))
@@ -0,0 +1,158 @@
+"""
+ETag / If-None-Match support for read endpoints.
+
+The ETag is not a hash of the rendered body (that would still need the query
+and serializer we want to skip). It hashes the version of every table the
+response is built from, plus who is asking and the exact URL.
+
+Versions live in TableVersion, one row per table in ETAG_MODELS, bumped by
+server.signals on every save, delete and m2m change. Reading them is one
+primary-key lookup for all tables, and being in the database they are the same
+for every worker whatever the cache backend. Writes that skip signals
+(queryset.update(), bulk_create()) on those models must call bump_version()
+themselves.
+
+Bumps are deferred to transaction.on_commit and coalesced, so a transaction
+touching a table many times adds one short UPDATE per table after it commits
+and never holds the version row's lock while the writer's transaction runs.
+
+A matching If-None-Match gets a 304 right after authentication and
+permission checks, before the queryset is evaluated or serialized.
+"""
+import hashlib
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models import F
+from django.http import HttpResponseNotModified
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags, quote_etag
+
+from .models import TableVersion
+
+# Every model some ConditionalGetMixin view lists in `etag_models`
+ETAG_MODELS = frozenset({
+    'campaigns.campaign',
+    'categories.category',
+    'projects.project',
+    'projects.projectcampaign',
+    'teams.team',
+    'teams.teammember',
+    'users.user',
+    'votes.vote',
+})
+
+
+def _label(model):
+    if isinstance(model, str):
+        return model.lower()
+    return model._meta.label_lower
+
+
+def _write_version(label):
+    if not TableVersion.objects.filter(table=label).update(version=F('version') + 1):
+        _, created = TableVersion.objects.get_or_create(table=label, defaults={'version': 1})
+        if not created:  # another process inserted it first
+            TableVersion.objects.filter(table=label).update(version=F('version') + 1)
+
+
+class _PendingBumps(set):
+    """on_commit callback holding the tables written in one transaction."""
+    done = False
+
+    def __call__(self):
+        self.done = True
+        for label in sorted(self):  # fixed order, so concurrent flushes can't deadlock
+            _write_version(label)
+
+
+def bump_version(model):
+    label = _label(model)
+    if label not in ETAG_MODELS:
+        return
+    connection = transaction.get_connection()
+    if not connection.in_atomic_block:
+        _write_version(label)
+        return
+    # Join this transaction's pending callback if it has one; rolled-back
+    # callbacks are dropped by Django, so a stale one is never reused.
+    pending = next((
+        func for _, func, _ in connection.run_on_commit
+        if isinstance(func, _PendingBumps) and not func.done
+    ), None)
+    if pending is None:
+        pending = _PendingBumps()
+        transaction.on_commit(pending)
+    pending.add(label)
+
+
+def data_version(models):
+    """Opaque string that changes whenever any of `models` changes."""
+    labels = [_label(m) for m in models]
+    versions = dict(TableVersion.objects.filter(table__in=labels).values_list('table', 'version'))
+    return "|".join(f"{label}:{versions.get(label, 0)}" for label in labels)
+
+
+class _NotModified(Exception):
+    def __init__(self, etag):
+        self.etag = etag
+
+
+class ConditionalGetMixin:
+    """
+    Add ETags to a viewset's reads and answer If-None-Match with 304.
+
+    `etag_models` lists every model the serialized output depends on (as
+    "app_label.Model" strings); it defaults to the queryset's model.
+    `etag_actions` are the GET actions covered.
+    """
+    etag_models = ()
+    etag_actions = ('list', 'retrieve')
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        models = cls.etag_models or ([cls.queryset.model] if getattr(cls, 'queryset', None) is not None else [])
+        untracked = {_label(m) for m in models} - ETAG_MODELS
+        if untracked:
+            raise ImproperlyConfigured(
+                f"{cls.__name__} depends on {', '.join(sorted(untracked))}; add them to server.etags.ETAG_MODELS"
+            )
+
+    def get_etag(self, request):
+        user = request.user.pk if request.user and request.user.is_authenticated else None
+        raw = "\n".join([
+            data_version(self.etag_models or [self.queryset.model]),
+            str(user),
+            request.get_full_path(),
+            request.accepted_media_type or '',
+            str(timezone.localdate()),  # campaign status/is_open roll over at midnight
+        ])
+        return quote_etag(hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest())
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._etag = None
+        if request.method in ('GET', 'HEAD') and self.action in self.etag_actions:
+            self._etag = self.get_etag(request)
+            if_none_match = request.headers.get('If-None-Match')
+            if if_none_match:
+                # Weak comparison, as RFC 9110 requires for If-None-Match
+                tags = {tag.removeprefix('W/') for tag in parse_etags(if_none_match)}
+                if '*' in tags or self._etag in tags:
+                    raise _NotModified(self._etag)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, _NotModified):
+            response = HttpResponseNotModified()
+            response['ETag'] = exc.etag
+            patch_vary_headers(response, ['Authorization'])
+            return response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, '_etag', None) and response.status_code == 200:
+            response['ETag'] = self._etag
+            patch_vary_headers(response, ['Authorization'])
+        return response
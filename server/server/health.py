@@ -0,0 +1,167 @@
+"""
+Liveness and readiness probes.
+
+/health/live/ only says the process can serve a request; a failing liveness
+probe gets the worker restarted, so it must not depend on anything else.
+
+/health/ready/ runs the dependency checks below and answers 503 if a
+critical one fails, so the load balancer stops routing to this worker until
+it recovers. /health/ stays a liveness check for existing monitors.
+
+- database: SELECT 1, bounded by HEALTH_DB_TIMEOUT
+- cache: set/get/delete round trip on the default cache
+- migrations: no unapplied migrations for the current code; once that holds
+  it is remembered for the life of the process instead of reloading the graph
+- backend: TCP connect to BACKEND_URL (the web views call the API there);
+  not critical, and skipped when BACKEND_URL is a loopback address, which is
+  this app itself (or nothing at all on Vercel)
+- email_queue: due OutboundEmail rows; a backlog over HEALTH_EMAIL_QUEUE_WARN
+  is reported as "warn" but does not fail the probe
+
+Once the database check fails, the checks that need it are reported as
+skipped instead of each waiting out its own timeout. The endpoint is
+unauthenticated, so a failed check only reports "unavailable"; the exception
+itself goes to the server log.
+
+Results are kept in process memory for HEALTH_CACHE_TTL seconds (not in the
+cache, which is one of the things being checked), so frequent probes cost one
+round of checks per worker per TTL.
+"""
+import ipaddress
+import logging
+import socket
+import threading
+import time
+import uuid
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.http import JsonResponse
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class CheckFailed(Exception):
+    pass
+
+
+def check_database():
+    connection = connections[DEFAULT_DB_ALIAS]
+    with transaction.atomic(using=DEFAULT_DB_ALIAS), connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute("SET LOCAL statement_timeout = %s", [int(settings.HEALTH_DB_TIMEOUT * 1000)])
+        cursor.execute("SELECT 1")
+        cursor.fetchone()
+
+
+def check_cache():
+    key = f"health:{uuid.uuid4().hex}"
+    cache.set(key, 1, 10)
+    try:
+        if cache.get(key) != 1:
+            raise CheckFailed("value written to the cache could not be read back")
+    finally:
+        cache.delete(key)
+
+
+_migrations_applied = False  # the code can't change under a running process
+
+
+def check_migrations():
+    global _migrations_applied
+    if _migrations_applied:
+        return
+    from django.db.migrations.executor import MigrationExecutor
+    executor = MigrationExecutor(connections[DEFAULT_DB_ALIAS])
+    plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    if plan:
+        raise CheckFailed(f"{len(plan)} unapplied migration(s), first {plan[0][0].app_label}.{plan[0][0].name}")
+    _migrations_applied = True
+
+
+def _is_loopback(hostname):
+    if hostname == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(hostname).is_loopback
+    except ValueError:
+        return False
+
+
+def check_backend():
+    url = urlparse(settings.BACKEND_URL)
+    if _is_loopback(url.hostname):
+        return {'status': 'skipped', 'reason': "BACKEND_URL is this app"}
+    port = url.port or (443 if url.scheme == 'https' else 80)
+    with socket.create_connection((url.hostname, port), timeout=settings.HEALTH_TCP_TIMEOUT):
+        pass
+
+
+def check_email_queue():
+    from emails.models import OutboundEmail
+    depth = OutboundEmail.objects.filter(status='pending', next_attempt_at__lte=timezone.now()).count()
+    if depth > settings.HEALTH_EMAIL_QUEUE_WARN:
+        return {'status': 'warn', 'depth': depth}
+    return {'depth': depth}
+
+
+# name: (check, critical, needs_database)
+CHECKS = {
+    'database': (check_database, True, False),
+    'cache': (check_cache, True, False),
+    'migrations': (check_migrations, True, True),
+    'backend': (check_backend, False, False),
+    'email_queue': (check_email_queue, False, True),
+}
+
+
+def run_checks():
+    results = {}
+    healthy = True
+    for name, (check, critical, needs_database) in CHECKS.items():
+        if needs_database and results['database']['status'] == 'fail':
+            results[name] = {'status': 'skipped', 'reason': "database unavailable"}
+            continue
+        start = time.perf_counter()
+        try:
+            result = {'status': 'ok', **(check() or {})}
+        except Exception:
+            logger.log(logging.ERROR if critical else logging.WARNING, f"Health check {name!r} failed", exc_info=True)
+            result = {'status': 'fail', 'error': "unavailable"}
+            healthy = healthy and not critical
+        result['ms'] = round((time.perf_counter() - start) * 1000, 1)
+        results[name] = result
+    return {'status': 'ok' if healthy else 'fail', 'checks': results}
+
+
+_lock = threading.Lock()
+_cached = {'report': None, 'at': 0.0}
+
+
+def readiness_report():
+    """Return (report, from_cache), running the checks at most once per HEALTH_CACHE_TTL."""
+    with _lock:
+        if _cached['report'] is not None and time.monotonic() - _cached['at'] < settings.HEALTH_CACHE_TTL:
+            return _cached['report'], True
+        report = run_checks()
+        _cached['report'], _cached['at'] = report, time.monotonic()
+        return report, False
+
+
+def reset():
+    global _migrations_applied
+    with _lock:
+        _cached['report'] = None
+        _migrations_applied = False
+
+
+def liveness_view(request):
+    return JsonResponse({'status': 'ok'})
+
+
+def readiness_view(request):
+    report, from_cache = readiness_report()
+    return JsonResponse({**report, 'cached': from_cache}, status=200 if report['status'] == 'ok' else 503)
@@ -0,0 +1,181 @@
+"""
+Per-request SQL instrumentation.
+
+QueryInstrumentationMiddleware installs a connection.execute_wrapper for the
+duration of a (sampled) request and records the query count, total DB time
+and how often each statement fingerprint ran. A fingerprint is the SQL with
+parameters left as placeholders and IN lists collapsed, so the same query
+issued once per row of a list (an N+1) shows up as one fingerprint with a
+high repeat count.
+
+Each instrumented response gets a Server-Timing header ("db" and "app"
+entries, visible in browser dev tools) and one log line on the
+"server.queries" logger, at WARNING when the request goes over
+QUERY_BUDGET queries or repeats a statement QUERY_DUPLICATE_THRESHOLD times.
+Totals per endpoint are kept in process memory for /api/debug/queries/.
+
+Only QUERY_SAMPLE_RATE of requests are instrumented: all of them with DEBUG
+on, 1% otherwise, so production pays for the wrapper on a small sample.
+"""
+import hashlib
+import logging
+import random
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('server.queries')
+
+_whitespace = re.compile(r'\s+')
+_in_list = re.compile(r'IN \((?:%s, )*%s\)')
+
+
+def fingerprint(sql):
+    normalized = _in_list.sub('IN (...)', _whitespace.sub(' ', sql).strip())
+    return hashlib.blake2b(normalized.encode(), digest_size=6).hexdigest(), normalized
+
+
+class QueryStats:
+    """Collected by the execute wrapper for one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+        self.statements = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+            key, normalized = fingerprint(sql)
+            self.fingerprints[key] += 1
+            self.statements.setdefault(key, normalized)
+
+    def duplicates(self, threshold=2):
+        """[(fingerprint, repeats)] of statements run at least `threshold` times, worst first."""
+        return [(key, n) for key, n in self.fingerprints.most_common() if n >= threshold]
+
+
+class EndpointStats:
+    """Running totals per endpoint, for the debug view."""
+    MAX_SIGNATURES = 10
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, endpoint, stats):
+        with self._lock:
+            entry = self._endpoints.setdefault(endpoint, {
+                'requests': 0, 'queries': 0, 'max_queries': 0, 'db_time': 0.0, 'signatures': {},
+            })
+            entry['requests'] += 1
+            entry['queries'] += stats.count
+            entry['max_queries'] = max(entry['max_queries'], stats.count)
+            entry['db_time'] += stats.duration
+
+            signatures = entry['signatures']
+            for key, repeats in stats.duplicates():
+                current = signatures.get(key)
+                if current is None or current['repeats'] < repeats:
+                    signatures[key] = {'fingerprint': key, 'sql': stats.statements[key], 'repeats': repeats}
+            if len(signatures) > self.MAX_SIGNATURES:
+                worst = sorted(signatures.values(), key=lambda s: -s['repeats'])[:self.MAX_SIGNATURES]
+                entry['signatures'] = {s['fingerprint']: s for s in worst}
+
+    def worst(self, limit=20):
+        """Endpoints ordered by their worst repeated statement, then average query count."""
+        with self._lock:
+            rows = []
+            for endpoint, entry in self._endpoints.items():
+                signatures = sorted(entry['signatures'].values(), key=lambda s: -s['repeats'])
+                rows.append({
+                    'endpoint': endpoint,
+                    'requests': entry['requests'],
+                    'avg_queries': round(entry['queries'] / entry['requests'], 1),
+                    'max_queries': entry['max_queries'],
+                    'avg_db_ms': round(entry['db_time'] * 1000 / entry['requests'], 2),
+                    'max_repeats': signatures[0]['repeats'] if signatures else 1,
+                    'signatures': signatures,
+                })
+        rows.sort(key=lambda row: (-row['max_repeats'], -row['avg_queries']))
+        return rows[:limit]
+
+    def reset(self):
+        with self._lock:
+            self._endpoints = {}
+
+
+endpoint_stats = EndpointStats()
+
+
+def request_route(request):
+    """URL pattern the request resolved to, e.g. "/api/teams/<ref>/", or "(unresolved)"."""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return "(unresolved)"
+    return f"/{match.route.replace('^', '').replace('$', '')}"  # router routes are regexes
+
+
+def endpoint_label(request):
+    """Method and route, e.g. "GET /api/teams/"; bounded by the URLconf, unlike request.path."""
+    return f"{request.method} {request_route(request)}"
+
+
+class QueryInstrumentationMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.QUERY_INSTRUMENTATION or random.random() >= settings.QUERY_SAMPLE_RATE:
+            return self.get_response(request)
+
+        stats = request.query_stats = QueryStats()
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(stats))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        endpoint = endpoint_label(request)
+        endpoint_stats.record(endpoint, stats)
+        self.report(request, response, endpoint, stats, elapsed)
+        return response
+
+    def report(self, request, response, endpoint, stats, elapsed):
+        db_ms = stats.duration * 1000
+        if settings.QUERY_SERVER_TIMING:
+            timing = f'db;dur={db_ms:.1f};desc="{stats.count} queries", app;dur={(elapsed - stats.duration) * 1000:.1f}'
+            existing = response.get('Server-Timing')
+            response['Server-Timing'] = f"{existing}, {timing}" if existing else timing
+
+        duplicates = stats.duplicates(settings.QUERY_DUPLICATE_THRESHOLD)
+        over_budget = stats.count > settings.QUERY_BUDGET
+        level = logging.WARNING if over_budget or duplicates else logging.DEBUG
+        logger.log(
+            level,
+            f"{endpoint} status={response.status_code} queries={stats.count} db_ms={db_ms:.1f} "
+            f"total_ms={elapsed * 1000:.1f} duplicates={len(duplicates)}",
+            extra={'query_stats': {
+                'endpoint': endpoint,
+                'path': request.path,
+                'status': response.status_code,
+                'queries': stats.count,
+                'db_ms': round(db_ms, 2),
+                'total_ms': round(elapsed * 1000, 2),
+                'over_budget': over_budget,
+                'duplicates': [
+                    {'fingerprint': key, 'repeats': n, 'sql': stats.statements[key]} for key, n in duplicates
+                ],
+            }},
+        )
@@ -0,0 +1,85 @@
+import datetime
+import decimal
+import json
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.urls import resolve, reverse
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from server.renderers import ORJSONRenderer, orjson
+from users.models import User
+
+ENDPOINTS = ['project-list', 'campaign-list', 'vote-list', 'vote-leaderboard']
+
+
+def _synthetic_payload(rows):
+    now = timezone.now()
+    team = {'id': 1, 'ref': uuid.uuid4(), 'name': "Team", 'member_count': 4, 'created_at': now}
+    return [
+        {
+            'ref': uuid.uuid4(), 'name': f"Project {i}", 'summary': "Summary " * 10,
+            'score': decimal.Decimal('12.50'), 'created_at': now, 'updated_at': now,
+            'team': team,
+            'campaigns': [
+                {'campaign': {'ref': uuid.uuid4(), 'name': "Campaign", 'date_from': datetime.date.today()},
+                 'category': {'id': 3, 'name': "Robotics"}, 'joined_at': now}
+                for _ in range(3)
+            ],
+        }
+        for i in range(rows)
+    ]
+
+
+class Command(BaseCommand):
+    help = "Compare DRF's JSONRenderer with the orjson renderer on the current API payloads"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50, help="Renders per measurement")
+        parser.add_argument('--synthetic', type=int, default=0,
+                            help="Also benchmark a generated payload with this many nested rows")
+
+    def payloads(self, options):
+        factory = APIRequestFactory()
+        user = User.objects.filter(is_superuser=True).first() or User(email="benchmark@localhost", is_staff=True)
+        for name in ENDPOINTS:
+            path = reverse(name)
+            request = factory.get(path)
+            force_authenticate(request, user=user)
+            try:
+                match = resolve(path)
+                response = match.func(request, *match.args, **match.kwargs)
+            except Exception as e:  # a broken endpoint shouldn't stop the rest
+                self.stdout.write(f"{name:<20} skipped: {e}")
+                continue
+            if response.status_code != 200:
+                self.stdout.write(f"{name:<20} skipped: HTTP {response.status_code}")
+                continue
+            yield name, response.data
+        if options['synthetic']:
+            yield f"synthetic x{options['synthetic']}", _synthetic_payload(options['synthetic'])
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stderr.write("orjson is not installed; ORJSONRenderer falls back to DRF's renderer.")
+        iterations = options['iterations']
+        renderers = [JSONRenderer(), ORJSONRenderer()]
+
+        self.stdout.write(f"{'payload':<20} {'bytes':>10} {'json ms':>9} {'orjson ms':>10} {'speedup':>8}")
+        for name, data in self.payloads(options):
+            timings, outputs = [], []
+            for renderer in renderers:
+                outputs.append(renderer.render(data))
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    renderer.render(data)
+                timings.append((time.perf_counter() - start) / iterations * 1000)
+
+            same = json.loads(outputs[0]) == json.loads(outputs[1])
+            self.stdout.write(
+                f"{name:<20} {len(outputs[0]):>10} {timings[0]:>9.3f} {timings[1]:>10.3f} "
+                f"{timings[0] / timings[1]:>7.1f}x" + ("" if same else "  OUTPUT DIFFERS")
+            )
@@ -0,0 +1,76 @@
+import os
+import subprocess
+import sys
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# What a fresh process does before it can answer its first request
+STAGES = {
+    'settings': "import {settings_module}",
+    'setup': "import django; django.setup()",
+    'wsgi': "import server.wsgi",
+    'urls': "import server.wsgi; from django.urls import get_resolver; get_resolver().url_patterns",
+}
+
+
+def parse_importtime(stderr):
+    """[(module, self_us, cumulative_us)] from `python -X importtime` output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+class Command(BaseCommand):
+    help = "Report per-module import times for a cold start (python -X importtime in a fresh process)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--stage', choices=STAGES, default='urls',
+                            help="How far to boot: settings, setup, wsgi or urls (default, as on a first request)")
+        parser.add_argument('--limit', type=int, default=25, help="Rows per table")
+        parser.add_argument('--sort', choices=['cumulative', 'self'], default='cumulative')
+        parser.add_argument('--runs', type=int, default=3, help="Cold starts to time (best one is reported)")
+
+    def run(self, code, importtime=False):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', settings.SETTINGS_MODULE)}
+        args = [sys.executable, *(['-X', 'importtime'] if importtime else []), '-c', code]
+        start = time.perf_counter()
+        result = subprocess.run(args, env=env, cwd=settings.BASE_DIR, capture_output=True, text=True)
+        elapsed = time.perf_counter() - start
+        if result.returncode:
+            raise CommandError(f"Startup failed:\n{result.stderr[-2000:]}")
+        return elapsed, result.stderr
+
+    def handle(self, *args, **options):
+        code = STAGES[options['stage']].format(settings_module=settings.SETTINGS_MODULE)
+
+        timings = [self.run(code)[0] for _ in range(max(1, options['runs']))]
+        _, stderr = self.run(code, importtime=True)
+        rows = parse_importtime(stderr)
+        if not rows:
+            raise CommandError("No -X importtime output; is this CPython 3.7+?")
+
+        total_us = sum(self_us for _, self_us, _ in rows)
+        self.stdout.write(
+            f"Stage '{options['stage']}': best of {len(timings)} cold starts {min(timings) * 1000:.0f} ms, "
+            f"{len(rows)} modules imported, {total_us / 1000:.0f} ms in imports\n"
+        )
+
+        key = 2 if options['sort'] == 'cumulative' else 1
+        self.stdout.write(f"{'module':<60} {'self ms':>9} {'cumul ms':>9}")
+        for name, self_us, cumulative_us in sorted(rows, key=lambda row: -row[key])[:options['limit']]:
+            self.stdout.write(f"{name[:60]:<60} {self_us / 1000:>9.1f} {cumulative_us / 1000:>9.1f}")
+
+        # Self time summed per top-level package: what each dependency costs overall
+        packages = Counter()
+        for name, self_us, _ in rows:
+            packages[name.split('.')[0]] += self_us
+        self.stdout.write(f"\n{'package':<60} {'ms':>9} {'share':>9}")
+        for package, self_us in packages.most_common(options['limit']):
+            self.stdout.write(f"{package:<60} {self_us / 1000:>9.1f} {self_us / total_us:>9.1%}")
@@ -0,0 +1,161 @@
+"""
+Prometheus metrics, exported in the text format at /metrics.
+
+- votes_cast_total{kind} and votes_rejected_total{reason} (VoteCreateSerializer)
+- http_request_duration_seconds{method,endpoint,status} (MetricsMiddleware)
+- http_request_db_seconds / http_request_queries{endpoint}, taken from the
+  request's QueryStats when QueryInstrumentationMiddleware sampled it
+- cache_requests_total{cache,result} for the JWT user and blacklist caches;
+  the hit ratio is rate(result="hit") / rate(all) on the Prometheus side
+- auth_token_refresh_total{result} (RefreshView)
+
+Each gunicorn worker has its own memory, so scraping one of them only shows
+that worker's share. Setting PROMETHEUS_MULTIPROC_DIR (an empty directory,
+cleared before the server starts) makes prometheus_client write values to
+per-process files there, and /metrics then sums all of them. Dead workers
+should be cleaned up from gunicorn.conf.py:
+
+    def child_exit(server, worker):
+        from server.metrics import mark_process_dead
+        mark_process_dead(worker.pid)
+
+/metrics requires "Authorization: Bearer <METRICS_TOKEN>"; without a token
+configured it is only served with DEBUG on. prometheus_client is optional;
+without it every metric is a no-op and /metrics answers 503.
+"""
+import os
+import time
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+
+from .instrumentation import request_route
+
+try:
+    import prometheus_client
+    from prometheus_client import CollectorRegistry, Counter, Histogram, multiprocess
+except ImportError:  # optional dependency
+    prometheus_client = None
+
+VOTE_REJECTION_REASONS = ('campaign_closed', 'duplicate', 'bad_category', 'not_participating', 'invalid')
+LATENCY_BUCKETS = (.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)
+DB_BUCKETS = (.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 30, 50, 100, 200)
+
+
+def multiprocess_mode():
+    return bool(os.environ.get('PROMETHEUS_MULTIPROC_DIR') or os.environ.get('prometheus_multiproc_dir'))
+
+
+class _NoopMetric:
+    def labels(self, *args, **kwargs):
+        return self
+
+    def inc(self, amount=1):
+        pass
+
+    def observe(self, amount):
+        pass
+
+
+if prometheus_client:
+    registry = CollectorRegistry()
+
+    votes_cast = Counter(
+        'votes_cast_total', "Votes successfully cast", ['kind'], registry=registry,
+    )
+    votes_rejected = Counter(
+        'votes_rejected_total', "Vote attempts rejected during validation", ['reason'], registry=registry,
+    )
+    request_duration = Histogram(
+        'http_request_duration_seconds', "Request latency",
+        ['method', 'endpoint', 'status'], buckets=LATENCY_BUCKETS, registry=registry,
+    )
+    request_db_time = Histogram(
+        'http_request_db_seconds', "Time spent in SQL per request",
+        ['endpoint'], buckets=DB_BUCKETS, registry=registry,
+    )
+    request_queries = Histogram(
+        'http_request_queries', "SQL queries per request",
+        ['endpoint'], buckets=QUERY_BUCKETS, registry=registry,
+    )
+    cache_requests = Counter(
+        'cache_requests_total', "Cache lookups by outcome", ['cache', 'result'], registry=registry,
+    )
+    token_refreshes = Counter(
+        'auth_token_refresh_total', "JWT refresh attempts", ['result'], registry=registry,
+    )
+
+    # Export zeroes up front so rates and ratios exist before the first event
+    for _reason in VOTE_REJECTION_REASONS:
+        votes_rejected.labels(_reason)
+    for _kind in ('overall', 'category'):
+        votes_cast.labels(_kind)
+    for _result in ('success', 'failure'):
+        token_refreshes.labels(_result)
+else:
+    registry = None
+    votes_cast = votes_rejected = request_duration = request_db_time = request_queries = \
+        cache_requests = token_refreshes = _NoopMetric()
+
+
+def record_cache(cache, hit):
+    cache_requests.labels(cache, 'hit' if hit else 'miss').inc()
+
+
+def mark_process_dead(pid):
+    """Drop a dead worker's live-value files (gunicorn child_exit hook)."""
+    if prometheus_client and multiprocess_mode():
+        multiprocess.mark_process_dead(pid)
+
+
+def collect():
+    """Return (body, content_type) in the Prometheus text format."""
+    if multiprocess_mode():
+        # Aggregate every worker's files, not just this process's registry
+        target = CollectorRegistry()
+        multiprocess.MultiProcessCollector(target)
+    else:
+        target = registry
+    return prometheus_client.generate_latest(target), prometheus_client.CONTENT_TYPE_LATEST
+
+
+def metrics_view(request):
+    if prometheus_client is None:
+        return HttpResponse("prometheus_client is not installed.\n", status=503, content_type='text/plain')
+    if settings.METRICS_TOKEN:
+        header = request.headers.get('Authorization', '')
+        if not constant_time_compare(header, f"Bearer {settings.METRICS_TOKEN}"):
+            return HttpResponse(status=401, headers={'WWW-Authenticate': 'Bearer'})
+    elif not settings.DEBUG:
+        # Per-endpoint traffic and SQL timings are not for the public
+        return HttpResponse("Set METRICS_TOKEN to enable /metrics.\n", status=403, content_type='text/plain')
+    body, content_type = collect()
+    return HttpResponse(body, content_type=content_type)
+
+
+class MetricsMiddleware:
+    """Observes latency for every request, plus DB time for instrumented ones."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.METRICS_ENABLED or prometheus_client is None:
+            return self.get_response(request)
+
+        start = time.perf_counter()
+        response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        if request.path == '/metrics':
+            return response
+        endpoint = request_route(request)
+        request_duration.labels(request.method, endpoint, str(response.status_code)).observe(elapsed)
+
+        stats = getattr(request, 'query_stats', None)
+        if stats is not None:
+            request_db_time.labels(endpoint).observe(stats.duration)
+            request_queries.labels(endpoint).observe(stats.count)
+        return response
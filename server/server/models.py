@@ -0,0 +1,10 @@
+from django.db import models
+
+
+class TableVersion(models.Model):
+    """Write counter per table ("app_label.model"), bumped by server.signals and read by server.etags."""
+    table = models.CharField(max_length=100, primary_key=True)
+    version = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.table} v{self.version}"
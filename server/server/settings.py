@@ -1,27 +1,19 @@
 import os
-import socket
 from pathlib import Path
 from datetime import timedelta
-from dotenv import load_dotenv
-from urllib.parse import urlparse, parse_qsl
-
-# Load .env file
-load_dotenv()
-
-def get_ipv4_host(hostname):
-    """Resolve hostname to IPv4 address"""
-    try:
-        # Get only IPv4 addresses
-        info = socket.getaddrinfo(hostname, 5432, socket.AF_INET)
-        if info:
-            return info[0][4][0]  # Return first IPv4 address
-    except:
-        pass
-    return hostname  # Fallback to original hostname
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
+# Load .env for local development. Only an existing file is read: deployments
+# (Vercel, gunicorn) set real environment variables and skip python-dotenv and
+# its directory search entirely.
+for _env_file in (BASE_DIR / '.env', BASE_DIR.parent / '.env'):
+    if _env_file.is_file():
+        from dotenv import load_dotenv
+        load_dotenv(_env_file)
+        break
+
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
@@ -44,6 +36,12 @@ EMAIL_HOST_USER = 'your-email@gmail.com'
 EMAIL_HOST_PASSWORD = 'your-app-password'  # Use App Password
 DEFAULT_FROM_EMAIL = 'Student Voting <noreply@yourdomain.com>'
 
+# Outbound email queue (drained by `manage.py send_queued_emails --loop`)
+EMAIL_QUEUE_BATCH_SIZE = 50
+EMAIL_QUEUE_MAX_ATTEMPTS = 5
+EMAIL_QUEUE_RETRY_DELAY = 60  # seconds, doubled on every retry
+EMAIL_QUEUE_CLAIM_TIMEOUT = 600  # seconds before a batch claimed by a dead worker is retried
+
 ALLOWED_HOSTS = [
     "127.0.0.1",
     "localhost", 
@@ -58,6 +56,15 @@ CORS_ALLOW_ALL_ORIGINS = True
 AUTH_USER_MODEL = 'users.User'
 LOGIN_URL = '/login/'
 
+# Password reset tokens: 'stateless' (signed, bound to the password hash, no DB
+# state) or 'profile' (random token stored on UserProfile)
+PASSWORD_RESET_TOKEN_MODE = 'stateless'
+PASSWORD_RESET_TIMEOUT = 60 * 60  # seconds
+
+# Password hashing processes for bulk user imports (1 = inline). The pool is
+# created once per web worker and shared by all imports, so keep it small.
+USER_IMPORT_PROCESSES = int(os.getenv('USER_IMPORT_PROCESSES', min(2, os.cpu_count() or 1)))
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
@@ -77,6 +84,35 @@ SIMPLE_JWT = {
     'TOKEN_TYPE_CLAIM': 'token_type',
 }
 
+# Cache shared by all workers. Set REDIS_URL in production: without it every
+# process gets its own locmem cache, and the features that rely on cross-worker
+# state fall back to per-process behaviour (see server/caches.py): the JWT
+# blacklist queries the DB on every refresh, autocomplete rebuilds on a timer,
+# and user-cache invalidation and throttle counters only reach one worker.
+if os.getenv('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+    }
+
+# Blacklist lookups on refresh go through this cache (see auth0/blacklist.py).
+# The Bloom filter shortcut is only used when the cache is shared between
+# workers; None = auto-detect (anything but locmem/dummy counts as shared).
+JWT_BLACKLIST_CACHE = 'default'
+JWT_BLACKLIST_SHARED_CACHE = None
+JWT_BLACKLIST_BLOOM_TTL = 300  # seconds between snapshot rebuilds
+JWT_BLACKLIST_BLOOM_ERROR_RATE = 0.01
+
+# ClaimsJWTAuthentication: how long a user fetched on a write request is reused
+# for read requests (invalidated on save; across workers only with a shared cache)
+JWT_USER_CACHE_TTL = 60  # seconds
+
 # Application definition
 INSTALLED_APPS = [
     'django.contrib.admin',
@@ -103,10 +139,16 @@ INSTALLED_APPS = [
     'votes',
     'users',
     'auth0',
+    'emails',
+    'uploads',
+    'search',
+    'server',
     'web'
 ]
 
 MIDDLEWARE = [
+    'server.metrics.MetricsMiddleware',
+    'server.instrumentation.QueryInstrumentationMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -148,7 +190,6 @@ DATABASES = {
     }
 }
 """
-tmpPostgres = urlparse(os.getenv("DATABASE_URL"))
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -157,20 +198,45 @@ DATABASES = {
         'PASSWORD': os.getenv("DATABASE_PASS"),
         'HOST': os.getenv("DATABASE_HOST"),
         'PORT': os.getenv("DATABASE_PORT"),
+        'OPTIONS': {'connect_timeout': int(os.getenv("DATABASE_CONNECT_TIMEOUT", 5))},  # seconds
     }
 }
 
-print(f"Using host: {os.getenv('DATABASE_HOST')} -> {os.getenv('DATABASE_NAME')}")
-
 REST_FRAMEWORK = {
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
-    'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
+    'DEFAULT_FILTER_BACKENDS': [
+        'django_filters.rest_framework.DjangoFilterBackend',
+        'rest_framework.filters.SearchFilter',
+        'rest_framework.filters.OrderingFilter',
+    ],
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # orjson-backed JSON (see server/renderers.py); falls back to DRF's if orjson is missing
+    'DEFAULT_RENDERER_CLASSES': [
+        'server.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'server.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    # Proxies in front of the app that append to X-Forwarded-For (1 = Vercel's
+    # edge). The client IP is read that many entries from the right, so a
+    # client-supplied header can't dodge the per-IP throttles; 0 = REMOTE_ADDR.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', 1)),
+    # Sliding-window limits for the auth endpoints (see auth0/throttling.py)
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': '30/min',
+        'login_account': '5/min',
+        'forgot_password_ip': '10/hour',
+        'forgot_password_account': '3/hour',
+        'register_ip': '20/hour',
+    },
 }
 
 SPECTACULAR_SETTINGS = {
@@ -197,8 +263,30 @@ SPECTACULAR_SETTINGS = {
     'COMPONENT_SPLIT_REQUEST': True,
     'SCHEMA_PATH_PREFIX': r'/api/',
     'SECURITY': [{'bearerAuth': []}],
+    # Registers the auth0 schema extensions when a schema is generated, not at startup
+    'PREPROCESSING_HOOKS': ['auth0.schema.register_extensions'],
 }
 
+# Password hashing
+# PASSWORD_HASHER picks the algorithm for new hashes; the others stay listed so
+# existing hashes still verify and get upgraded on the next login. Cost
+# parameters can be sized with `manage.py benchmark_hashers`.
+PASSWORD_HASHER = os.getenv('PASSWORD_HASHER', 'pbkdf2')  # pbkdf2 | scrypt | argon2 (needs argon2-cffi)
+PBKDF2_ITERATIONS = int(os.getenv('PBKDF2_ITERATIONS', 1_000_000))
+SCRYPT_WORK_FACTOR = int(os.getenv('SCRYPT_WORK_FACTOR', 2 ** 14))
+ARGON2_TIME_COST = int(os.getenv('ARGON2_TIME_COST', 2))
+ARGON2_MEMORY_COST = int(os.getenv('ARGON2_MEMORY_COST', 102400))  # KiB
+ARGON2_PARALLELISM = int(os.getenv('ARGON2_PARALLELISM', 8))
+
+_PASSWORD_HASHERS = {
+    'pbkdf2': 'users.hashers.TunablePBKDF2PasswordHasher',
+    'scrypt': 'users.hashers.TunableScryptPasswordHasher',
+    'argon2': 'users.hashers.TunableArgon2PasswordHasher',
+}
+PASSWORD_HASHERS = [_PASSWORD_HASHERS[PASSWORD_HASHER]] + [
+    path for name, path in _PASSWORD_HASHERS.items() if name != PASSWORD_HASHER
+]
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -237,6 +325,46 @@ STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
+# Uploaded media
+MEDIA_URL = '/media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+MEDIA_GC_GRACE = 24 * 3600  # seconds an unreferenced blob survives gc_media
+
+# Image variants for Project.image / Campaign.flyer (see uploads/images.py)
+IMAGE_VARIANT_WIDTHS = [320, 640, 1280]
+IMAGE_MAX_DIMENSION = 2048  # longest side of the stored original
+IMAGE_PROCESSING_ASYNC = True  # False = build variants inline after commit
+
+# Resumable chunked uploads (see uploads/chunked.py)
+UPLOAD_CHUNK_SIZE = 5 * 1024 * 1024  # max bytes per PUT
+UPLOAD_MAX_SIZE = 25 * 1024 * 1024
+UPLOAD_IMAGE_FORMATS = ['JPEG', 'PNG', 'WEBP', 'GIF']
+UPLOAD_EXPIRY = 24 * 3600  # seconds before unfinished/unclaimed uploads are cleared
+
+# Full-text search (see search/backends.py)
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+AUTOCOMPLETE_DEFAULT_LIMIT = 10  # see search/autocomplete.py
+AUTOCOMPLETE_MAX_LIMIT = 50
+AUTOCOMPLETE_REBUILD_TTL = 60  # seconds; rebuild interval when the cache is not shared
+
+# Per-request SQL instrumentation (see server/instrumentation.py)
+QUERY_INSTRUMENTATION = True
+QUERY_SAMPLE_RATE = float(os.getenv('QUERY_SAMPLE_RATE', 1.0 if DEBUG else 0.01))  # fraction of requests instrumented
+QUERY_SERVER_TIMING = True  # add a Server-Timing header to instrumented responses
+QUERY_BUDGET = 30  # queries per request before the log line becomes a warning
+QUERY_DUPLICATE_THRESHOLD = 5  # same statement this many times in one request = N+1 suspect
+
+# Prometheus metrics at /metrics (see server/metrics.py); set PROMETHEUS_MULTIPROC_DIR under gunicorn
+METRICS_ENABLED = True
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')  # scrapers send "Authorization: Bearer <token>"; unset = DEBUG only
+
+# Readiness probe (see server/health.py)
+HEALTH_CACHE_TTL = 5  # seconds a readiness report is reused
+HEALTH_DB_TIMEOUT = 2  # seconds, statement timeout for the database check
+HEALTH_TCP_TIMEOUT = 1  # seconds, connect timeout for the BACKEND_URL check
+HEALTH_EMAIL_QUEUE_WARN = 500  # due emails before the queue check reports "warn"
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -0,0 +1,18 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .etags import bump_version
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_table_version(sender, **kwargs):
+    bump_version(sender)
+
+
+@receiver(m2m_changed)
+def bump_m2m_versions(sender, instance, action, model, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        bump_version(sender)
+        bump_version(type(instance))
+        bump_version(model)
@@ -0,0 +1,161 @@
+"""
+Sparse fieldsets and expansion control: ?fields=, ?omit=, ?expand=.
+
+    ?fields=ref,name,team.name   only these keys (dotted paths reach into relations)
+    ?omit=description,team.members
+    ?expand=team,team.members    embed only these relations; other nested
+                                 objects/lists are left out (without ?expand=
+                                 every relation is embedded, as before)
+
+SparseFieldsMixin prunes the serializer's fields for safe (GET) requests and
+only applies the viewset's select_related / prefetch_related lookups for
+relations that survive the pruning, so unrequested relations are never
+queried. Projections (server/projections.py) apply the same FieldSpec to the
+dicts they build.
+"""
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.serializers import BaseSerializer
+
+SPARSE_PARAMETERS = [
+    OpenApiParameter('fields', OpenApiTypes.STR,
+                     description="Comma-separated fields to return; dotted paths select nested fields"),
+    OpenApiParameter('omit', OpenApiTypes.STR, description="Comma-separated fields to leave out"),
+    OpenApiParameter('expand', OpenApiTypes.STR,
+                     description="Comma-separated relations to embed (default: all of them)"),
+]
+
+
+def _parse(raw):
+    """'a,b.c,b.d' -> {'a': {}, 'b': {'c': {}, 'd': {}}}"""
+    tree = {}
+    for path in raw.split(','):
+        node = tree
+        for name in filter(None, (part.strip() for part in path.split('.'))):
+            node = node.setdefault(name, {})
+    return tree
+
+
+class FieldSpec:
+    """Parsed fields/omit/expand trees for one level of the output."""
+
+    def __init__(self, fields=None, omit=None, expand=None):
+        self.fields = fields or None  # None = everything
+        self.omit = omit or {}
+        self.expand = expand  # None = every relation, {} = none
+
+    @classmethod
+    def from_request(cls, request):
+        if request is None or request.method not in SAFE_METHODS:
+            return cls()
+        params = request.query_params
+        expand = params.get('expand')
+        return cls(
+            fields=_parse(params['fields']) if params.get('fields') else None,
+            omit=_parse(params['omit']) if params.get('omit') else None,
+            expand=_parse(expand) if expand is not None else None,
+        )
+
+    @property
+    def is_default(self):
+        return self.fields is None and not self.omit and self.expand is None
+
+    def includes(self, name, relation=True):
+        if self.fields is not None and name not in self.fields:
+            return False
+        if self.omit.get(name) == {}:
+            return False
+        return not (relation and self.expand is not None and name not in self.expand)
+
+    def child(self, name):
+        return FieldSpec(
+            fields=(self.fields or {}).get(name) or None,
+            omit=self.omit.get(name),
+            expand=self.expand.get(name, {}) if self.expand is not None else None,
+        )
+
+    def prune_serializer(self, serializer):
+        """Delete excluded fields from a (list) serializer, recursively."""
+        serializer = getattr(serializer, 'child', serializer)
+        if self.is_default or not isinstance(serializer, BaseSerializer):
+            return
+        fields = serializer.fields
+        for name, field in list(fields.items()):
+            relation = isinstance(field, BaseSerializer)
+            if not self.includes(name, relation):
+                del fields[name]
+            elif relation:
+                self.child(name).prune_serializer(field)
+
+    def prune_data(self, data, relations=()):
+        """
+        Apply the spec to already built dicts (or a list of them).
+        `relations` are the dotted paths that count as relations for ?expand=.
+        """
+        if self.is_default:
+            return data
+        if isinstance(data, list):
+            return [self.prune_data(item, relations) for item in data]
+        if not isinstance(data, dict):
+            return data
+
+        result = {}
+        for name, value in data.items():
+            relation = name in relations
+            if self.includes(name, relation):
+                if relation:
+                    prefix = f"{name}."
+                    value = self.child(name).prune_data(
+                        value, {path[len(prefix):] for path in relations if path.startswith(prefix)}
+                    )
+                result[name] = value
+        return result
+
+
+def has_field(serializer, path):
+    for name in path.split('.'):
+        serializer = getattr(serializer, 'child', serializer)
+        fields = getattr(serializer, 'fields', None) if isinstance(serializer, BaseSerializer) else None
+        if fields is None or name not in fields:
+            return False
+        serializer = fields[name]
+    return True
+
+
+class SparseFieldsMixin:
+    """
+    `select_related_fields` / `prefetch_related_fields` map an output path
+    (e.g. "team", "team.members") to the lookup it needs; a lookup is only
+    applied when that path is still in the pruned serializer.
+    """
+    select_related_fields = {}
+    prefetch_related_fields = {}
+
+    def get_field_spec(self):
+        if getattr(self, '_field_spec', None) is None:
+            self._field_spec = FieldSpec.from_request(self.request)
+        return self._field_spec
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        self.get_field_spec().prune_serializer(serializer)
+        return serializer
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if not (self.select_related_fields or self.prefetch_related_fields):
+            return queryset
+
+        if self.get_field_spec().is_default:
+            select = list(self.select_related_fields.values())
+            prefetch = list(self.prefetch_related_fields.values())
+        else:
+            serializer = self.get_serializer()
+            select = [lookup for path, lookup in self.select_related_fields.items() if has_field(serializer, path)]
+            prefetch = [lookup for path, lookup in self.prefetch_related_fields.items() if has_field(serializer, path)]
+        if select:
+            queryset = queryset.select_related(*select)
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset
@@ -0,0 +1,434 @@
+import datetime
+import decimal
+import io
+import socket
+import uuid
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from campaigns.models import Campaign
+from campaigns.serializers import CampaignSerializer
+from categories.models import Category
+from emails.queue import enqueue_email
+from projects.models import Project, ProjectCampaign
+from projects.serializers import ProjectSerializer
+from teams.models import Team, TeamMember
+from votes.models import Vote
+from votes.serializers import VoteSerializer
+from users.models import User
+from . import health
+from .etags import _PendingBumps, data_version
+from .instrumentation import endpoint_stats
+from .metrics import registry
+from .models import TableVersion
+from .renderers import ORJSONParser, ORJSONRenderer
+
+
+class ConditionalGetTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user = User.objects.create_user(email="etag@test.com", password="password123")
+            self.team = Team.objects.create(name="Cachers")
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_not_modified_until_data_changes(self):
+        url = reverse('team-list')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertFalse(any('"teams_team"."name"' in q['sql'] for q in queries.captured_queries))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Team.objects.create(name="Newcomers")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_detail_changes_without_timestamp(self):
+        url = reverse('team-detail', args=[self.team.ref])
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=f'W/{etag}').status_code,
+                         status.HTTP_304_NOT_MODIFIED)
+
+        # No timestamp changes here; the signal-bumped table version catches it
+        with self.captureOnCommitCallbacks(execute=True):
+            member = TeamMember.objects.create(team=self.team, user=self.user, role='member')
+        etag = self.client.get(url)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            member.role = 'admin'
+            member.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+    def test_versions_are_one_indexed_lookup(self):
+        with CaptureQueriesContext(connection) as queries:
+            data_version(['teams.Team', 'teams.TeamMember', 'projects.Project'])
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('COUNT', queries[0]['sql'].upper())
+
+        # Only tables some view depends on are versioned
+        with self.captureOnCommitCallbacks(execute=True):
+            enqueue_email("Hi", ["a@test.com"], body="x")
+            Team.objects.create(name="Versioned")
+        self.assertFalse(TableVersion.objects.filter(table='emails.outboundemail').exists())
+        self.assertTrue(TableVersion.objects.filter(table='teams.team').exists())
+
+    def test_bumps_wait_for_commit_and_coalesce(self):
+        before = data_version(['teams.Team'])
+        with self.captureOnCommitCallbacks() as callbacks:
+            for i in range(3):
+                Team.objects.create(name=f"Batch {i}")
+            self.assertEqual(data_version(['teams.Team']), before)
+        bumps = [callback for callback in callbacks if isinstance(callback, _PendingBumps)]
+        self.assertEqual(len(bumps), 1)
+        bumps[0]()
+        self.assertEqual(
+            TableVersion.objects.get(table='teams.team').version,
+            int(before.split(':')[1]) + 1,
+        )
+
+    def test_etag_differs_per_user_and_query(self):
+        url = reverse('team-list')
+        etag = self.client.get(url)['ETag']
+        self.assertNotEqual(self.client.get(url, {'page': 2})['ETag'], etag)
+
+        other = User.objects.create_user(email="other@test.com", password="password123")
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+
+class ORJSONRendererTestCase(TestCase):
+    data = {
+        'ref': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'created_at': datetime.datetime(2025, 1, 2, 3, 4, 5, 678000, tzinfo=datetime.timezone.utc),
+        'local': datetime.datetime(2025, 1, 2, 3, 4, 5, tzinfo=ZoneInfo('Europe/Berlin')),
+        'day': datetime.date(2025, 1, 2),
+        'score': decimal.Decimal('12.50'),
+        'label': gettext_lazy("Robotics"),
+        'text': "line\u2028separator",
+        'nested': [{1: 'int key', 'duration': datetime.timedelta(minutes=2)}],
+    }
+
+    def test_matches_drf_renderer(self):
+        self.assertEqual(ORJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+
+    def test_indented_output_uses_drf(self):
+        rendered = ORJSONRenderer().render({'a': 1}, 'application/json; indent=4')
+        self.assertEqual(rendered, b'{\n    "a": 1\n}')
+
+    def test_parser(self):
+        self.assertEqual(ORJSONParser().parse(io.BytesIO(b'{"a": [1, 2.5, null]}')), {'a': [1, 2.5, None]})
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"a": NaN}'))
+
+
+class ProjectionTestCase(TestCase):
+    """values()-based list projections must render exactly like the serializers."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(email="voter@test.com", password="password123")
+        self.client.force_authenticate(user=self.user)
+
+        team = Team.objects.create(name="Builders", description="We build")
+        TeamMember.objects.create(team=team, user=self.user, role='admin')
+        other_team = Team.objects.create(name="Makers")
+        robotics = Category.objects.create(name="Robotics", description="Bots")
+        today = datetime.date.today()
+        open_campaign = Campaign.objects.create(
+            organizer=team, name="Expo", summary="s", description="d", is_active=True,
+            date_from=today - datetime.timedelta(days=1), date_to=today + datetime.timedelta(days=1),
+        )
+        draft = Campaign.objects.create(
+            organizer=other_team, name="Draft", summary="s", description="d",
+            date_from=today, date_to=today,
+        )
+        open_campaign.categories.add(robotics)
+
+        robot = Project.objects.create(team=team, name="Robot", summary="s", description="d")
+        Project.objects.create(team=other_team, name="Lamp", summary="s", description="d")
+        entry = ProjectCampaign.objects.create(project=robot, campaign=open_campaign, category=robotics)
+        ProjectCampaign.objects.create(project=robot, campaign=draft)
+        Vote.objects.create(voter=self.user, project_campaign=entry, is_overall=True)
+
+    def assertSameAsSerializer(self, url_name, serializer_class, queryset):
+        url = reverse(url_name)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        request = Request(APIRequestFactory().get(url))
+        expected = serializer_class(queryset, many=True, context={'request': request}).data
+        self.assertEqual(response.content, JSONRenderer().render(expected))
+
+    def test_project_list(self):
+        self.assertSameAsSerializer('project-list', ProjectSerializer, Project.objects.all())
+
+    def test_campaign_list(self):
+        self.assertSameAsSerializer('campaign-list', CampaignSerializer, Campaign.objects.all())
+
+    def test_vote_list(self):
+        self.assertSameAsSerializer('vote-list', VoteSerializer, Vote.objects.all())
+
+    def test_sparse_fields_skip_nested_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('project-list'), {'fields': 'ref,name'})
+        self.assertEqual([set(row) for row in response.data], [{'ref', 'name'}] * 2)
+        self.assertFalse(any('teams_team' in q['sql'] for q in queries.captured_queries[1:]))
+
+
+class SparseFieldsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        user = User.objects.create_user(email="member@test.com", password="password123")
+        self.client.force_authenticate(user=user)
+
+        self.team = Team.objects.create(name="Builders")
+        TeamMember.objects.create(team=self.team, user=user, role='admin')
+        campaign = Campaign.objects.create(
+            organizer=self.team, name="Expo", summary="s", description="d",
+            date_from=datetime.date.today(), date_to=datetime.date.today(),
+        )
+        self.project = Project.objects.create(team=self.team, name="Robot", summary="s", description="d")
+        ProjectCampaign.objects.create(project=self.project, campaign=campaign)
+        self.url = reverse('project-detail', args=[self.project.ref])
+
+    def sql_after_etag(self, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data, ' '.join(q['sql'] for q in queries.captured_queries[1:])
+
+    def test_nested_fields(self):
+        data, _ = self.sql_after_etag({'fields': 'name,team.name'})
+        self.assertEqual(data, {'name': "Robot", 'team': {'name': "Builders"}})
+
+        response = self.client.get(reverse('project-list'), {'fields': 'name,campaigns.campaign.name'})
+        self.assertEqual(response.data, [{'name': "Robot", 'campaigns': [{'campaign': {'name': "Expo"}}]}])
+
+    def test_omit_skips_relation_queries(self):
+        data, sql = self.sql_after_etag({'omit': 'team,campaigns,description'})
+        self.assertNotIn('team', data)
+        self.assertNotIn('description', data)
+        self.assertNotIn('teams_team', sql)
+        self.assertNotIn('projects_projectcampaign', sql)
+
+    def test_expand_limits_embedded_relations(self):
+        data, sql = self.sql_after_etag({'expand': 'team'})
+        self.assertIn('team', data)
+        self.assertNotIn('members', data['team'])
+        self.assertNotIn('campaigns', data)
+        self.assertNotIn('projects_projectcampaign', sql)
+
+        response = self.client.get(reverse('project-list'), {'expand': 'team.members'})
+        self.assertEqual([m['role'] for m in response.data[0]['team']['members']], ['admin'])
+        self.assertNotIn('campaigns', response.data[0])
+
+    def test_default_shape_unchanged(self):
+        data, _ = self.sql_after_etag({})
+        self.assertEqual(set(data), {
+            'ref', 'name', 'summary', 'description', 'image', 'image_variants',
+            'team', 'campaigns', 'created_at', 'updated_at',
+        })
+
+
+@override_settings(QUERY_SAMPLE_RATE=1.0)
+class QueryInstrumentationTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        endpoint_stats.reset()
+        self.client = APIClient()
+        self.staff = User.objects.create_user(email="staff@test.com", password="password123", is_staff=True)
+        for i in range(5):
+            User.objects.create_user(email=f"user{i}@test.com", password="password123")
+        self.client.force_authenticate(user=self.staff)
+
+    def test_server_timing_and_n_plus_one_report(self):
+        # UserSerializer.is_team_leader runs one query per user
+        with self.assertLogs('server.queries', 'WARNING') as logs:
+            response = self.client.get(reverse('user-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertRegex(response['Server-Timing'], r'^db;dur=[\d.]+;desc="\d+ queries", app;dur=[\d.]+$')
+        stats = logs.records[0].query_stats
+        self.assertEqual(stats['endpoint'], "GET /api/users/")
+        self.assertEqual(stats['duplicates'][0]['repeats'], 6)
+        self.assertIn('teams_teammember', stats['duplicates'][0]['sql'])
+
+        response = self.client.get(reverse('debug-queries'))
+        worst = response.data['endpoints'][0]
+        self.assertEqual((worst['endpoint'], worst['requests'], worst['max_repeats']), ("GET /api/users/", 1, 6))
+
+    @override_settings(QUERY_SAMPLE_RATE=0.0)
+    def test_unsampled_requests_are_untouched(self):
+        response = self.client.get(reverse('user-list'))
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(self.client.get(reverse('debug-queries')).data['endpoints'], [])
+
+    def test_debug_endpoint_is_staff_only(self):
+        self.client.force_authenticate(user=User.objects.get(email="user0@test.com"))
+        self.assertEqual(self.client.get(reverse('debug-queries')).status_code, status.HTTP_403_FORBIDDEN)
+
+
+@override_settings(QUERY_SAMPLE_RATE=1.0)
+class MetricsTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = User.objects.create_user(email="metrics@test.com", password="password123")
+        self.client.force_authenticate(user=self.user)
+
+    def sample(self, name, **labels):
+        return registry.get_sample_value(name, labels) or 0
+
+    def test_vote_outcomes_are_counted(self):
+        team = Team.objects.create(name="Counters")
+        today = datetime.date.today()
+        campaign = Campaign.objects.create(
+            organizer=team, name="Past", summary="s", description="d", is_active=True,
+            date_from=today - datetime.timedelta(days=3), date_to=today - datetime.timedelta(days=1),
+        )
+        project = Project.objects.create(team=team, name="Robot", summary="s", description="d")
+        ProjectCampaign.objects.create(project=project, campaign=campaign)
+        closed = self.sample('votes_rejected_total', reason='campaign_closed')
+        cast = self.sample('votes_cast_total', kind='overall')
+
+        response = self.client.post(reverse('vote-list'), {
+            'project_ref': project.ref, 'campaign_ref': campaign.ref, 'is_overall': True,
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.sample('votes_rejected_total', reason='campaign_closed'), closed + 1)
+        self.assertEqual(self.sample('votes_cast_total', kind='overall'), cast)
+
+    def test_clean_errors_are_counted_by_reason(self):
+        team = Team.objects.create(name="Reasons")
+        today = datetime.date.today()
+        campaign = Campaign.objects.create(
+            organizer=team, name="Open", summary="s", description="d", is_active=True,
+            date_from=today - datetime.timedelta(days=1), date_to=today + datetime.timedelta(days=1),
+        )
+        category = Category.objects.create(name="Hardware")
+        campaign.categories.add(category)
+        project = Project.objects.create(team=team, name="Drone", summary="s", description="d")
+        # Entry without a category: Vote.clean() refuses a category vote for it
+        ProjectCampaign.objects.create(project=project, campaign=campaign)
+        bad_category = self.sample('votes_rejected_total', reason='bad_category')
+        duplicate = self.sample('votes_rejected_total', reason='duplicate')
+
+        response = self.client.post(reverse('vote-list'), {
+            'project_ref': project.ref, 'campaign_ref': campaign.ref, 'category_id': category.id,
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.sample('votes_rejected_total', reason='bad_category'), bad_category + 1)
+        self.assertEqual(self.sample('votes_rejected_total', reason='duplicate'), duplicate)
+
+    @override_settings(DEBUG=True)
+    def test_metrics_endpoint_exports_request_latency(self):
+        self.client.get(reverse('user-list'))
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        body = response.content.decode()
+        self.assertIn('http_request_duration_seconds_count{endpoint="/api/users/",method="GET",status="200"}', body)
+        self.assertIn('http_request_queries_bucket{endpoint="/api/users/"', body)
+        self.assertIn('votes_rejected_total{reason="duplicate"}', body)
+        self.assertNotIn('endpoint="/metrics"', body)
+
+    def test_metrics_closed_without_token_outside_debug(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, status.HTTP_403_FORBIDDEN)
+
+    @override_settings(METRICS_TOKEN='scrape-secret')
+    def test_metrics_token(self):
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.get(reverse('metrics'), HTTP_AUTHORIZATION='Bearer scrape-secret')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class HealthTestCase(TestCase):
+    def setUp(self):
+        health.reset()
+        self.listener = socket.create_server(('127.0.0.1', 0))
+        self.addCleanup(self.listener.close)
+        self.backend_url = f"http://127.0.0.1:{self.listener.getsockname()[1]}/api/"
+
+    def ready(self, loopback=False):
+        # Unless told otherwise, the local listener stands in for a separate backend host
+        with self.settings(BACKEND_URL=self.backend_url), \
+                mock.patch('server.health._is_loopback', return_value=loopback):
+            return self.client.get(reverse('health-ready'))
+
+    def test_liveness_has_no_dependencies(self):
+        for name in ('health-live', 'health'):
+            with self.assertNumQueries(0):
+                response = self.client.get(reverse(name))
+            self.assertEqual(response.json(), {'status': 'ok'})
+
+    def test_readiness_runs_checks_and_caches_the_report(self):
+        response = self.ready()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.json()
+        self.assertEqual(set(body['checks']), {'database', 'cache', 'migrations', 'backend', 'email_queue'})
+        self.assertTrue(all(check['status'] == 'ok' for check in body['checks'].values()))
+        self.assertFalse(body['cached'])
+
+        with self.assertNumQueries(0):
+            self.assertTrue(self.client.get(reverse('health-ready')).json()['cached'])
+
+    def test_migration_graph_is_loaded_until_it_is_up_to_date(self):
+        with mock.patch('django.db.migrations.executor.MigrationExecutor') as executor:
+            executor.return_value.migration_plan.return_value = []
+            health.check_migrations()
+            health.check_migrations()
+        self.assertEqual(executor.call_count, 1)
+
+    def test_backend_is_not_critical_and_skipped_on_loopback(self):
+        self.listener.close()
+        with self.assertLogs('server.health', 'WARNING'):
+            response = self.ready()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['checks']['backend']['status'], 'fail')
+
+        health.reset()
+        self.assertEqual(self.ready(loopback=True).json()['checks']['backend']['status'], 'skipped')
+
+    def test_database_failure_skips_dependent_checks(self):
+        def database_down():
+            raise OSError("could not connect to db.internal:5432 as app:s3cret")
+
+        with mock.patch.dict(health.CHECKS, database=(database_down, True, False)), \
+                self.assertLogs('server.health', 'ERROR'):
+            response = self.ready()
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        checks = response.json()['checks']
+        self.assertEqual(checks['database']['status'], 'fail')
+        # Nothing from the exception reaches the unauthenticated response
+        self.assertEqual(checks['database']['error'], "unavailable")
+        self.assertNotIn(b"db.internal", response.content)
+        self.assertEqual((checks['migrations']['status'], checks['email_queue']['status']), ('skipped', 'skipped'))
+        self.assertEqual(checks['cache']['status'], 'ok')
+
+
+class SchemaViewsTestCase(TestCase):
+    def test_lazily_loaded_schema_includes_auth_extension(self):
+        response = self.client.get(reverse('schema'), {'format': 'json'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('claimsJwtAuth', response.json()['components']['securitySchemes'])
+        self.assertEqual(self.client.get(reverse('swagger-ui')).status_code, status.HTTP_200_OK)
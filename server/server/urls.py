@@ -1,7 +1,11 @@
+from django.conf import settings
+from django.conf.urls.static import static
 from django.contrib import admin
-from django.http import JsonResponse
 from django.urls import path, include
-from drf_spectacular.views import SpectacularAPIView, SpectacularRedocView, SpectacularSwaggerView
+from uploads.views import serve_media
+from server.health import liveness_view, readiness_view
+from server.metrics import metrics_view
+from server.views import QueryStatsView, lazy_view
 
 urlpatterns = [
     path('', include('web.urls')),
@@ -13,15 +17,21 @@ urlpatterns = [
     path('api/', include('projects.urls')),
     path('api/', include('campaigns.urls')),
     path('api/', include('categories.urls')),
+    path('api/', include('uploads.urls')),
+    path('api/', include('search.urls')),
 
-    path('health/', lambda r: JsonResponse({"status": "ok"})),
+    path('health/', liveness_view, name='health'),
+    path('health/live/', liveness_view, name='health-live'),
+    path('health/ready/', readiness_view, name='health-ready'),
+    path('api/debug/queries/', QueryStatsView.as_view(), name='debug-queries'),
+    path('metrics', metrics_view, name='metrics'),
 
     # === OPENAPI SCHEMA ===
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
+    path('api/schema/', lazy_view('drf_spectacular.views.SpectacularAPIView'), name='schema'),
     
     # === SWAGGER UI ===
-    path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
+    path('api/docs/', lazy_view('drf_spectacular.views.SpectacularSwaggerView', url_name='schema'), name='swagger-ui'),
     
     # === REDOC UI (Alternative) ===
-    path('api/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
-]
+    path('api/redoc/', lazy_view('drf_spectacular.views.SpectacularRedocView', url_name='schema'), name='redoc'),
+] + static(settings.MEDIA_URL, view=serve_media, document_root=settings.MEDIA_ROOT)
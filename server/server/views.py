@@ -0,0 +1,59 @@
+import os
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+from django.views.decorators.csrf import csrf_exempt
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .instrumentation import endpoint_stats
+
+
+@extend_schema(tags=['Debug'])
+class QueryStatsView(APIView):
+    """Worst endpoints by repeated statements (N+1) and query count, for this worker process."""
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        summary="Per-endpoint SQL statistics (staff only)",
+        parameters=[OpenApiParameter('limit', OpenApiTypes.INT, description="Endpoints to return (default 20)")],
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    def get(self, request):
+        try:
+            limit = max(1, int(request.query_params.get('limit', 20)))
+        except ValueError:
+            return Response({"error": "limit must be an integer."}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'pid': os.getpid(),
+            'sample_rate': settings.QUERY_SAMPLE_RATE,
+            'endpoints': endpoint_stats.worst(limit),
+        })
+
+    @extend_schema(summary="Reset the collected statistics", responses={204: None})
+    def delete(self, request):
+        endpoint_stats.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+def lazy_view(dotted_path, **initkwargs):
+    """
+    URLconf entry for a class-based view that is imported on its first request.
+
+    Used for the schema/docs views so drf_spectacular's generator and renderers
+    are not imported by every worker (or serverless cold start) at boot.
+    """
+    view = None
+
+    @csrf_exempt
+    def dispatch(request, *args, **kwargs):
+        nonlocal view
+        if view is None:
+            view = import_string(dotted_path).as_view(**initkwargs)
+        return view(request, *args, **kwargs)
+
+    return dispatch
@@ -0,0 +1,56 @@
+"""
+Reads over the team hierarchy, backed by TeamClosure.
+
+Each function is a single query whatever the depth of the tree: subtrees and
+ancestor chains are one join on the closure table, and the rolled-up counts
+are correlated subqueries grouped by ancestor.
+"""
+from django.db.models import Count, F, Q
+
+from projects.models import Project
+from server.projections import related_count
+from votes.models import Vote
+from .models import Team, TeamClosure, TeamMember
+
+
+def _nodes(links, side):
+    return links.values(
+        'depth',
+        ref=F(f'{side}__ref'),
+        name=F(f'{side}__name'),
+        parent=F(f'{side}__parent__ref'),
+    )
+
+
+def descendants(team):
+    """Every team below `team`, nearest first."""
+    return _nodes(TeamClosure.objects.filter(ancestor=team, depth__gt=0), 'descendant') \
+        .order_by('depth', 'descendant__name')
+
+
+def ancestors(team):
+    """The chain from the root down to team's parent."""
+    return _nodes(TeamClosure.objects.filter(descendant=team, depth__gt=0), 'ancestor').order_by('-depth')
+
+
+def with_rollups(queryset):
+    """Annotate teams with counts over their whole subtree (themselves included)."""
+    return queryset.annotate(
+        subtree_teams=related_count(TeamClosure, 'ancestor'),
+        subtree_members=related_count(
+            TeamMember, 'team__ancestor_links__ancestor', Count('user', distinct=True)
+        ),
+        subtree_projects=related_count(Project, 'team__ancestor_links__ancestor'),
+        subtree_votes=related_count(Vote, 'project_campaign__project__team__ancestor_links__ancestor'),
+    )
+
+
+def rollup(team):
+    """Subtree totals for `team` and each of its direct sub-teams, in one query."""
+    teams = with_rollups(Team.objects.filter(Q(pk=team.pk) | Q(parent=team))).values(
+        'pk', 'ref', 'name', 'subtree_teams', 'subtree_members', 'subtree_projects', 'subtree_votes',
+    )
+    rows = {row.pop('pk'): row for row in teams}
+    result = rows.pop(team.pk)
+    result['children'] = sorted(rows.values(), key=lambda row: row['name'])
+    return result
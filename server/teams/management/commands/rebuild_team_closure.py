@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from teams.models import TeamClosure
+
+
+class Command(BaseCommand):
+    help = "Recreate the team hierarchy closure table from Team.parent"
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = TeamClosure.objects.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} team closure rows."))
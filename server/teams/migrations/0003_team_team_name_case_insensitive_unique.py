@@ -0,0 +1,42 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:11
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+def rename_case_duplicates(apps, schema_editor):
+    """
+    Rename teams whose names differ only by case so the constraint can be added.
+
+    The oldest team keeps its name; later ones become "Name (2)", "Name (3)"...
+    Merging is left to an admin since members and projects would move.
+    """
+    Team = apps.get_model('teams', 'Team')
+    names = dict(Team.objects.order_by('pk').values_list('pk', 'name'))
+    taken = {name.lower() for name in names.values()}
+    seen = set()
+    for pk, name in names.items():
+        if name.lower() not in seen:
+            seen.add(name.lower())
+            continue
+        n = 2
+        while f"{name[:92]} ({n})".lower() in taken:
+            n += 1
+        new_name = f"{name[:92]} ({n})"
+        taken.add(new_name.lower())
+        Team.objects.filter(pk=pk).update(name=new_name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0002_team_parent'),
+    ]
+
+    operations = [
+        migrations.RunPython(rename_case_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='team',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('name'), name='team_name_case_insensitive_unique'),
+        ),
+    ]
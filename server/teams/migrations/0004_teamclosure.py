@@ -0,0 +1,42 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_closure(apps, schema_editor):
+    Team = apps.get_model('teams', 'Team')
+    TeamClosure = apps.get_model('teams', 'TeamClosure')
+    parents = dict(Team.objects.values_list('pk', 'parent_id'))
+    rows = []
+    for team in parents:
+        node, depth, seen = team, 0, set()
+        while node is not None and node not in seen:
+            seen.add(node)
+            rows.append(TeamClosure(ancestor_id=node, descendant_id=team, depth=depth))
+            node, depth = parents.get(node), depth + 1
+    TeamClosure.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teams', '0003_team_team_name_case_insensitive_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamClosure',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField()),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to='teams.team')),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to='teams.team')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['descendant', 'depth'], name='teamclosure_descendant_depth')],
+                'unique_together': {('ancestor', 'descendant')},
+            },
+        ),
+        migrations.RunPython(build_closure, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,7 @@
 import uuid
-from django.db import models
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models.functions import Lower
 from users.models import User
 
 # Create your models here.
@@ -15,6 +17,9 @@ class Team(models.Model):
     class Meta:
         verbose_name_plural = "Teams"
         ordering = ['name']
+        constraints = [
+            models.UniqueConstraint(Lower('name'), name='team_name_case_insensitive_unique'),
+        ]
 
     @property
     def member_count(self):
@@ -33,7 +38,100 @@ class Team(models.Model):
     
     def __str__(self):
         return self.name
-    
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        team = super().from_db(db, field_names, values)
+        team._loaded_parent_id = team.__dict__.get('parent_id')
+        return team
+
+    def clean(self):
+        if self.pk and self.parent_id and TeamClosure.objects.filter(
+            ancestor_id=self.pk, descendant_id=self.parent_id
+        ).exists():
+            raise ValidationError({'parent': "A team cannot be nested under itself or one of its sub-teams."})
+
+    def save(self, *args, **kwargs):
+        # Keep TeamClosure in step with `parent`
+        adding = self._state.adding
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if adding:
+                TeamClosure.objects.attach(self)
+            elif self.parent_id != getattr(self, '_loaded_parent_id', self.parent_id):
+                TeamClosure.objects.move(self)
+        self._loaded_parent_id = self.parent_id
+
+
+class TeamClosureManager(models.Manager):
+    """
+    Writes for the closure table. Every team has a (team, team, 0) row plus
+    one row per ancestor, so a subtree or an ancestor chain is one indexed
+    lookup whatever the depth.
+    """
+
+    def attach(self, team):
+        """Add the rows for a newly created team."""
+        ancestors = self.filter(descendant_id=team.parent_id).values_list('ancestor_id', 'depth') \
+            if team.parent_id else []
+        self.bulk_create(
+            [self.model(ancestor_id=team.pk, descendant_id=team.pk, depth=0)]
+            + [self.model(ancestor_id=ancestor, descendant_id=team.pk, depth=depth + 1)
+               for ancestor, depth in ancestors]
+        )
+
+    def move(self, team):
+        """Re-link the subtree under team.parent after `parent` changed."""
+        subtree = dict(self.filter(ancestor_id=team.pk).values_list('descendant_id', 'depth'))
+        if team.parent_id in subtree:
+            raise ValueError(f"Team {team.pk} cannot be nested under its own subtree.")
+
+        self.filter(descendant_id__in=subtree).exclude(ancestor_id__in=subtree).delete()
+        if team.parent_id:
+            ancestors = self.filter(descendant_id=team.parent_id).values_list('ancestor_id', 'depth')
+            self.bulk_create([
+                self.model(ancestor_id=ancestor, descendant_id=descendant, depth=above + below + 1)
+                for ancestor, above in ancestors
+                for descendant, below in subtree.items()
+            ])
+
+    def detach(self, team):
+        """Cut the subtree loose from team's ancestors (before team is deleted)."""
+        subtree = list(self.filter(ancestor_id=team.pk).values_list('descendant_id', flat=True))
+        ancestors = list(self.filter(descendant_id=team.pk, depth__gt=0).values_list('ancestor_id', flat=True))
+        if ancestors:
+            self.filter(descendant_id__in=subtree, ancestor_id__in=ancestors).delete()
+
+    def rebuild(self):
+        """Recreate every row from Team.parent; returns the row count."""
+        parents = dict(Team.objects.values_list('pk', 'parent_id'))
+        rows = []
+        for team in parents:
+            node, depth, seen = team, 0, set()
+            while node is not None and node not in seen:
+                seen.add(node)
+                rows.append(self.model(ancestor_id=node, descendant_id=team, depth=depth))
+                node, depth = parents.get(node), depth + 1
+        self.all().delete()
+        return len(self.bulk_create(rows, batch_size=1000))
+
+
+class TeamClosure(models.Model):
+    """Ancestor/descendant pairs of the Team.parent hierarchy (see TeamClosureManager)."""
+    ancestor = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='descendant_links')
+    descendant = models.ForeignKey(Team, on_delete=models.CASCADE, related_name='ancestor_links')
+    depth = models.PositiveIntegerField()
+
+    objects = TeamClosureManager()
+
+    class Meta:
+        unique_together = ('ancestor', 'descendant')
+        indexes = [models.Index(fields=['descendant', 'depth'], name='teamclosure_descendant_depth')]
+
+    def __str__(self):
+        return f"{self.ancestor_id} -> {self.descendant_id} ({self.depth})"
+
+
 class TeamMember(models.Model):
     ROLE_CHOICES = [
         ('admin', 'Admin'),
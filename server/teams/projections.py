@@ -0,0 +1,44 @@
+from collections import defaultdict
+
+from server.projections import Projection, format_datetime, format_uuid, related_count
+from server.sparse import FieldSpec
+from .models import Team, TeamMember
+from projects.models import Project
+
+
+class TeamProjection(Projection):
+    """Same output as TeamSerializer."""
+
+    relations = ('members',)
+
+    def by_id(self, teams, spec=None):
+        """`teams` is a Team queryset (or pk subquery); returns {team id: dict}."""
+        spec = spec or FieldSpec()
+        rows = Team.objects.filter(pk__in=teams).annotate(
+            member_count=related_count(TeamMember, 'team'),
+            project_count=related_count(Project, 'team'),
+        ).values('id', 'ref', 'name', 'description', 'created_at', 'updated_at', 'member_count', 'project_count')
+
+        members = defaultdict(list)
+        if spec.includes('members'):
+            memberships = TeamMember.objects.filter(team__in=teams).order_by('pk').values('team_id', 'role', 'joined_at')
+            for member in memberships:
+                members[member['team_id']].append({
+                    'role': member['role'],
+                    'joined_at': format_datetime(member['joined_at']),
+                })
+
+        return {
+            team['id']: {
+                'id': team['id'],
+                'ref': format_uuid(team['ref']),
+                'name': team['name'],
+                'description': team['description'],
+                'created_at': format_datetime(team['created_at']),
+                'updated_at': format_datetime(team['updated_at']),
+                'member_count': team['member_count'],
+                'project_count': team['project_count'],
+                'members': members[team['id']],
+            }
+            for team in rows
+        }
@@ -1,5 +1,7 @@
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
-from teams.models import Team, TeamMember
+from search.autocomplete import prefix_index
+from teams.models import Team, TeamClosure, TeamMember
 from users.models import User
 #from users.serializers import User, UserSerializer
 
@@ -25,6 +27,9 @@ class TeamSerializer(serializers.ModelSerializer):
     )
     member_count = serializers.IntegerField(read_only=True)
     project_count = serializers.IntegerField(read_only=True)
+    parent = serializers.SlugRelatedField(
+        slug_field='ref', queryset=Team.objects.all(), write_only=True, required=False, allow_null=True
+    )
 
     class Meta:
         model = Team
@@ -32,10 +37,38 @@ class TeamSerializer(serializers.ModelSerializer):
             'id', 'ref', 'name', 'description',
             'created_at', 'updated_at',
             'member_count', 'project_count',
-            'leader', 'members'
+            'leader', 'members', 'parent'
         ]
         read_only_fields = ['created_at', 'updated_at', 'member_count', 'project_count', 'leader']
 
+    def validate_parent(self, value):
+        if value and self.instance and TeamClosure.objects.filter(ancestor=self.instance, descendant=value).exists():
+            raise serializers.ValidationError("A team cannot be nested under itself or one of its sub-teams.")
+        return value
+
+
+class TeamNodeSerializer(serializers.Serializer):
+    ref = serializers.UUIDField()
+    name = serializers.CharField()
+    parent = serializers.UUIDField(allow_null=True, help_text="Ref of the parent team")
+    depth = serializers.IntegerField(help_text="Distance from the requested team")
+
+
+class TeamSubtreeCountsSerializer(serializers.Serializer):
+    ref = serializers.UUIDField()
+    name = serializers.CharField()
+    subtree_teams = serializers.IntegerField()
+    subtree_members = serializers.IntegerField()
+    subtree_projects = serializers.IntegerField()
+    subtree_votes = serializers.IntegerField()
+
+
+class TeamRollupSerializer(TeamSubtreeCountsSerializer):
+    children = TeamSubtreeCountsSerializer(many=True)
+
+
+DUPLICATE_NAME = "A team with this name already exists."
+
 
 class TeamCreateSerializer(serializers.ModelSerializer):
     """Used only for creating team (admin or first member)"""
@@ -44,6 +77,17 @@ class TeamCreateSerializer(serializers.ModelSerializer):
         fields = ['name', 'description']
 
     def validate_name(self, value):
-        if Team.objects.filter(name__iexact=value).exists():
-            raise serializers.ValidationError("A team with this name already exists.")
-        return value.strip().name()
\ No newline at end of file
+        value = value.strip()
+        # The prefix index answers "no" without a query; a "yes" is confirmed
+        # against the DB in case the index is stale
+        if prefix_index.exists('team', value) and Team.objects.filter(name__iexact=value).exists():
+            raise serializers.ValidationError(DUPLICATE_NAME)
+        return value
+
+    def create(self, validated_data):
+        # Team.Meta's Lower(name) constraint catches what the check above missed
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError({'name': [DUPLICATE_NAME]})
\ No newline at end of file
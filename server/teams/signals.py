@@ -0,0 +1,11 @@
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from .models import Team, TeamClosure
+
+
+@receiver(pre_delete, sender=Team)
+def detach_subtree(sender, instance, **kwargs):
+    # Sub-teams become roots (parent is SET_NULL), so drop their links to
+    # the deleted team's ancestors; links to the team itself cascade.
+    TeamClosure.objects.detach(instance)
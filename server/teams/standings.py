@@ -0,0 +1,29 @@
+"""
+Team standings for the teams page.
+
+Member, project and vote totals are correlated COUNT subqueries (one indexed
+lookup per team and relation, no join product across memberships, projects
+and votes), and the rank is a window function over the same row set, so the
+whole table comes back ordered and ranked from a single query.
+"""
+from django.db.models import F, Window
+from django.db.models.functions import Rank
+
+from projects.models import Project
+from server.projections import related_count
+from votes.models import Vote
+from .models import Team, TeamMember
+
+RANK_ORDER = [F('total_votes').desc(), F('project_total').desc()]
+
+
+def standings(queryset=None):
+    """Teams annotated with member_total, project_total, total_votes and rank, best first."""
+    queryset = Team.objects.all() if queryset is None else queryset
+    return queryset.annotate(
+        member_total=related_count(TeamMember, 'team'),
+        project_total=related_count(Project, 'team'),
+        total_votes=related_count(Vote, 'project_campaign__project__team'),
+    ).annotate(
+        rank=Window(Rank(), order_by=RANK_ORDER),
+    ).order_by('rank', 'name')
@@ -1,9 +1,15 @@
+import datetime
+
 from django.test import TestCase
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
-from .models import Team, TeamMember
+from campaigns.models import Campaign
+from projects.models import Project, ProjectCampaign
 from users.models import User
+from votes.models import Vote
+from .models import Team, TeamClosure, TeamMember
+from .standings import standings
 
 class TeamAPITestCase(TestCase):
     def setUp(self):
@@ -33,4 +39,74 @@ class TeamAPITestCase(TestCase):
         TeamMember.objects.create(team=team, user=self.user1, role='member')
         response = self.client.post(reverse('team-leave', kwargs={'ref': team.ref}))
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
-        self.assertFalse(TeamMember.objects.filter(user=self.user1).exists())
\ No newline at end of file
+        self.assertFalse(TeamMember.objects.filter(user=self.user1).exists())
+
+class TeamHierarchyTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(email="h@test.com", password="pass")
+        self.client.force_authenticate(user=self.user)
+
+        self.school = Team.objects.create(name="School")
+        self.science = Team.objects.create(name="Science", parent=self.school)
+        self.physics = Team.objects.create(name="Physics", parent=self.science)
+        self.art = Team.objects.create(name="Art", parent=self.school)
+        TeamMember.objects.create(team=self.physics, user=self.user)
+        TeamMember.objects.create(team=self.art, user=self.user)
+
+    def refs(self, url_name, team):
+        response = self.client.get(reverse(url_name, kwargs={'ref': team.ref}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(row['name'], row['depth']) for row in response.data]
+
+    def test_descendants_and_ancestors(self):
+        with self.assertNumQueries(3):  # ETag versions, team lookup, closure join
+            self.assertEqual(
+                self.refs('team-descendants', self.school),
+                [("Art", 1), ("Science", 1), ("Physics", 2)],
+            )
+        self.assertEqual(self.refs('team-ancestors', self.physics), [("School", 2), ("Science", 1)])
+
+    def test_moving_a_subtree(self):
+        self.science.parent = self.art
+        self.science.save()
+        self.assertEqual(self.refs('team-ancestors', self.physics), [("School", 3), ("Art", 2), ("Science", 1)])
+
+        self.science.parent = self.physics
+        with self.assertRaises(ValueError):
+            self.science.save()
+
+        self.art.delete()
+        self.assertEqual(self.refs('team-ancestors', self.physics), [("Science", 1)])
+        self.assertEqual(TeamClosure.objects.count(), TeamClosure.objects.rebuild())
+
+    def test_rollup(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('team-rollup', kwargs={'ref': self.school.ref}))
+        self.assertEqual(response.data['subtree_teams'], 4)
+        self.assertEqual(response.data['subtree_members'], 1)  # same user in two sub-teams
+        self.assertEqual(
+            [(c['name'], c['subtree_teams'], c['subtree_members']) for c in response.data['children']],
+            [("Art", 1, 1), ("Science", 2, 1)],
+        )
+
+
+class TeamStandingsTestCase(TestCase):
+    def test_single_ranked_query(self):
+        voters = [User.objects.create_user(email=f"v{i}@test.com", password="pass") for i in range(3)]
+        alpha, beta, gamma = (Team.objects.create(name=name) for name in ("Alpha", "Beta", "Gamma"))
+        campaign = Campaign.objects.create(
+            organizer=alpha, name="Expo", summary="s", description="d",
+            date_from=datetime.date.today(), date_to=datetime.date.today(),
+        )
+        for team, team_voters in ((alpha, voters[:1]), (beta, voters[1:])):
+            project = Project.objects.create(team=team, name=team.name, summary="s", description="d")
+            entry = ProjectCampaign.objects.create(project=project, campaign=campaign)
+            for voter in team_voters:
+                Vote.objects.create(voter=voter, project_campaign=entry, is_overall=True)
+        TeamMember.objects.create(team=gamma, user=voters[0])
+        TeamMember.objects.create(team=gamma, user=voters[1])
+
+        with self.assertNumQueries(1):
+            rows = [(t.name, t.rank, t.total_votes, t.project_total, t.member_total) for t in standings()]
+        self.assertEqual(rows, [("Beta", 1, 2, 1, 0), ("Alpha", 2, 1, 1, 0), ("Gamma", 3, 0, 0, 2)])
@@ -5,22 +5,41 @@ from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 
+from server.etags import ConditionalGetMixin
+from server.sparse import SPARSE_PARAMETERS, SparseFieldsMixin
+from teams import hierarchy
 from teams.models import Team, TeamMember
-from teams.serializers import TeamSerializer, TeamCreateSerializer, TeamMemberSerializer
+from teams.serializers import (
+    TeamSerializer, TeamCreateSerializer, TeamMemberSerializer, TeamNodeSerializer, TeamRollupSerializer,
+)
+
+HIERARCHY_ACTIONS = ('descendants', 'ancestors', 'rollup')
 
 
 @extend_schema(tags=['Teams'])
-class TeamViewSet(viewsets.ModelViewSet):
+class TeamViewSet(ConditionalGetMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Team.objects.all()
     lookup_field = 'ref'
+    prefetch_related_fields = {'members': 'memberships'}
+    etag_models = ['teams.Team', 'teams.TeamMember', 'projects.Project']
+    etag_actions = ('list', 'retrieve', 'descendants', 'ancestors')
+
+    def get_queryset(self):
+        if self.action in HIERARCHY_ACTIONS:
+            return Team.objects.all()  # no member prefetch, only the team is needed
+        return super().get_queryset()
 
     def get_serializer_class(self):
         if self.action == 'create':
             return TeamCreateSerializer
+        if self.action in ('descendants', 'ancestors'):
+            return TeamNodeSerializer
+        if self.action == 'rollup':
+            return TeamRollupSerializer
         return TeamSerializer
 
     def get_permissions(self):
-        if self.action in ['list', 'retrieve']:
+        if self.action in ['list', 'retrieve', *HIERARCHY_ACTIONS]:
             return [IsAuthenticated()]
         elif self.action == 'create':
             return [IsAuthenticated()]
@@ -29,11 +48,16 @@ class TeamViewSet(viewsets.ModelViewSet):
 
     @extend_schema(
         summary="List all teams",
+        parameters=SPARSE_PARAMETERS,
         responses={200: TeamSerializer(many=True)}
     )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @extend_schema(parameters=SPARSE_PARAMETERS)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     @extend_schema(
         summary="Create a new team (user becomes admin)",
         responses={201: TeamSerializer}
@@ -98,4 +122,22 @@ class TeamViewSet(viewsets.ModelViewSet):
         member = get_object_or_404(TeamMember, team=team, user_id=user_id)
         member.role = 'admin'
         member.save()
-        return Response(TeamMemberSerializer(member).data)
\ No newline at end of file
+        return Response(TeamMemberSerializer(member).data)
+
+    @extend_schema(summary="All sub-teams, nearest first")
+    @action(detail=True, methods=['get'])
+    def descendants(self, request, ref=None):
+        team = self.get_object()
+        return Response(self.get_serializer(hierarchy.descendants(team), many=True).data)
+
+    @extend_schema(summary="Parent chain, from the root down")
+    @action(detail=True, methods=['get'])
+    def ancestors(self, request, ref=None):
+        team = self.get_object()
+        return Response(self.get_serializer(hierarchy.ancestors(team), many=True).data)
+
+    @extend_schema(summary="Member, project and vote counts for the team's subtree and each sub-team")
+    @action(detail=True, methods=['get'])
+    def rollup(self, request, ref=None):
+        team = self.get_object()
+        return Response(self.get_serializer(hierarchy.rollup(team)).data)
@@ -0,0 +1,51 @@
+"""
+Reference counting for content-addressed blobs.
+
+Counts change in the same transaction as the row that gains or drops the
+reference: the post_save/post_delete handlers in uploads/signals.py cover
+ordinary saves, and build_variants() adjusts them itself since it writes
+with a queryset update.
+"""
+from collections import Counter
+
+from django.db.models import F
+
+from .models import MediaBlob
+from .storage import is_blob
+
+
+def referenced_names(image_name, variants):
+    """All blob names held by one image field plus its variants."""
+    names = {image_name} if is_blob(image_name) else set()
+    for key, formats in (variants or {}).items():
+        if key != 'source':
+            names.update(name for name in formats.values() if is_blob(name))
+    return names
+
+
+def adjust_refs(before, after):
+    added, removed = set(after) - set(before), set(before) - set(after)
+    if added:
+        MediaBlob.objects.bulk_create([MediaBlob(name=name) for name in added], ignore_conflicts=True)
+        MediaBlob.objects.filter(name__in=added).update(ref_count=F('ref_count') + 1)
+    if removed:
+        MediaBlob.objects.filter(name__in=removed, ref_count__gt=0).update(ref_count=F('ref_count') - 1)
+
+
+def recount_refs(fields):
+    """
+    Rebuild every count from the model rows.
+
+    `fields` maps model -> (image field, variants field), as in uploads/tasks.py.
+    """
+    counts = Counter()
+    for model, (image_field, variants_field) in fields.items():
+        for image_name, variants in model.objects.values_list(image_field, variants_field).iterator():
+            counts.update(referenced_names(image_name, variants))
+
+    MediaBlob.objects.bulk_create([MediaBlob(name=name) for name in counts], ignore_conflicts=True)
+    blobs = list(MediaBlob.objects.all())
+    for blob in blobs:
+        blob.ref_count = counts.get(blob.name, 0)
+    MediaBlob.objects.bulk_update(blobs, ['ref_count'], batch_size=500)
+    return counts
@@ -0,0 +1,164 @@
+"""
+Resumable chunked uploads.
+
+    POST /api/uploads/                 {"filename", "size"} -> ref, chunk_size
+    PUT  /api/uploads/<ref>/           raw bytes, Content-Range: bytes <start>-<end>/<size>
+    GET  /api/uploads/<ref>/           bytes received so far, to resume after a failure
+    POST /api/uploads/<ref>/complete/  stitch the parts into the final file
+
+Each PUT streams its body straight into a part file in storage, so nothing is
+buffered in memory or temp files and no request lasts longer than one chunk.
+After the first chunk the image header is checked with Pillow (which only
+parses the header, not the pixel data), so a bad upload is rejected before
+the rest of it is sent. The finished file goes into the content-addressed
+media store and is attached to a project or campaign through its ref (see
+uploads/serializers.py).
+"""
+import re
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db.models import F
+from django.utils import timezone
+
+from .models import ChunkedUpload
+from .storage import content_addressed_storage
+
+CONTENT_RANGE = re.compile(r'^bytes (\d+)-(\d+)/(\d+)$')
+
+
+class UploadError(Exception):
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class _LimitedReader:
+    """File-like view of the next `size` bytes of the request body."""
+
+    def __init__(self, stream, size):
+        self.stream = stream
+        self.size = size
+        self.remaining = size
+
+    def read(self, size=-1):
+        if self.remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.stream.read(size)
+        if not data:
+            raise UploadError("Request body is shorter than its Content-Range.")
+        self.remaining -= len(data)
+        return data
+
+
+class _ConcatenatedParts:
+    """File-like object reading stored parts back to back."""
+
+    def __init__(self, storage, names, size):
+        self.storage = storage
+        self.names = list(names)
+        self.size = size
+        self.current = None
+
+    def read(self, size=-1):
+        while self.current or self.names:
+            if self.current is None:
+                self.current = self.storage.open(self.names.pop(0), 'rb')
+            data = self.current.read(size)
+            if data:
+                return data
+            self.current.close()
+            self.current = None
+        return b''
+
+
+def part_name(upload, index):
+    return f"uploads/chunks/{upload.ref}/{index:05d}.part"
+
+
+def check_image_header(name):
+    from PIL import Image, UnidentifiedImageError  # Pillow is only needed once an upload completes
+
+    try:
+        with default_storage.open(name, 'rb') as f:
+            image = Image.open(f)  # lazy: reads the header only
+            image_format, (width, height) = image.format, image.size
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError):
+        raise UploadError("File is not a supported image.")
+
+    if image_format not in settings.UPLOAD_IMAGE_FORMATS:
+        raise UploadError(f"{image_format} images are not supported.")
+    if Image.MAX_IMAGE_PIXELS and width * height > Image.MAX_IMAGE_PIXELS:
+        raise UploadError("Image dimensions are too large.")
+
+
+def write_chunk(upload, stream, content_range, content_length):
+    """Store the next chunk of `upload` from the request stream."""
+    if upload.status != 'uploading':
+        raise UploadError("Upload is already complete.", status=409)
+
+    match = CONTENT_RANGE.match(content_range or '')
+    if not match:
+        raise UploadError("Content-Range header must look like 'bytes <start>-<end>/<size>'.")
+    start, end, total = map(int, match.groups())
+    length = end - start + 1
+
+    if total != upload.size or end >= total or length <= 0:
+        raise UploadError("Content-Range does not match the declared upload size.")
+    if start != upload.received:
+        raise UploadError(f"Expected a chunk starting at byte {upload.received}.", status=409)
+    if length > settings.UPLOAD_CHUNK_SIZE:
+        raise UploadError(f"Chunks may not exceed {settings.UPLOAD_CHUNK_SIZE} bytes.", status=413)
+    if content_length != length:
+        raise UploadError("Content-Length does not match Content-Range.")
+
+    name = part_name(upload, upload.parts)
+    default_storage.delete(name)  # left over from an interrupted attempt
+    try:
+        default_storage.save(name, File(_LimitedReader(stream, length), name))
+        if start == 0:
+            check_image_header(name)
+    except UploadError:
+        default_storage.delete(name)
+        if start == 0:
+            discard_upload(upload)
+        raise
+
+    # Guarded on the offset so a duplicate concurrent chunk can't be counted twice
+    updated = ChunkedUpload.objects.filter(
+        pk=upload.pk, received=start, parts=upload.parts
+    ).update(received=end + 1, parts=F('parts') + 1, updated_at=timezone.now())
+    if not updated:
+        raise UploadError("Chunk conflicts with a concurrent request.", status=409)
+
+    upload.refresh_from_db(fields=['received', 'parts', 'updated_at'])
+    return upload
+
+
+def complete_upload(upload):
+    """Join the stored parts into the final file and mark the upload complete."""
+    if upload.status == 'complete':
+        return upload
+    if upload.received != upload.size:
+        raise UploadError(f"Only {upload.received} of {upload.size} bytes were received.")
+
+    names = [part_name(upload, i) for i in range(upload.parts)]
+    content = File(_ConcatenatedParts(default_storage, names, upload.size), upload.filename)
+    # Straight into the media blob store; attaching it only adds a reference
+    upload.file = content_addressed_storage().save(upload.filename, content)
+    upload.status = 'complete'
+    upload.save(update_fields=['file', 'status', 'updated_at'])
+
+    for name in names:
+        default_storage.delete(name)
+    return upload
+
+
+def discard_upload(upload):
+    """Delete an upload and its parts (a finished blob is left to gc_media)."""
+    for index in range(upload.parts + 1):
+        default_storage.delete(part_name(upload, index))
+    upload.delete()
@@ -0,0 +1,103 @@
+"""
+Resized image variants for uploaded project images and campaign flyers.
+
+process_image() normalises the stored original (orientation applied, EXIF
+and other metadata dropped, longest side capped at IMAGE_MAX_DIMENSION) and
+writes WebP + JPEG copies at each IMAGE_VARIANT_WIDTHS width. It returns the
+storage names so the model can keep them in a JSONField:
+
+    {"source": "blobs/3f/3fa4...e1.jpg",
+     "320": {"webp": "blobs/9c/9c02...7b.webp", "jpeg": "blobs/d1/d1e8...40.jpg"}, ...}
+
+The names are blob names because both fields use ContentAddressedStorage
+(uploads/storage.py); with a plain storage they would be robot__320w.webp etc.
+
+Pillow is imported inside the functions that use it: serializers import
+variant_urls() from here, and importing PIL on every worker boot would cost
+more than the rest of this app.
+"""
+import io
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+
+SAVE_OPTIONS = {
+    'JPEG': {'quality': 85, 'optimize': True, 'progressive': True},
+    'WEBP': {'quality': 80, 'method': 4},
+    'PNG': {'optimize': True},
+}
+VARIANT_FORMATS = {'webp': ('webp', 'WEBP'), 'jpeg': ('jpg', 'JPEG')}
+
+
+def _encode(image, image_format):
+    if image_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    buffer = io.BytesIO()
+    image.save(buffer, image_format, **SAVE_OPTIONS.get(image_format, {}))
+    return ContentFile(buffer.getvalue())
+
+
+def _replace(storage, name, content):
+    storage.delete(name)
+    return storage.save(name, content)
+
+
+def _normalise_original(field_file, image, image_format):
+    """Rewrite the original if it carries metadata or is too large."""
+    from PIL import Image, ImageOps
+
+    max_dimension = settings.IMAGE_MAX_DIMENSION
+    has_metadata = bool(image.getexif()) or 'exif' in image.info or 'icc_profile' in image.info
+    oversized = max(image.size) > max_dimension
+
+    image = ImageOps.exif_transpose(image)
+    if oversized:
+        image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+    if has_metadata or oversized:
+        image.info.clear()
+        name = _replace(field_file.storage, field_file.name, _encode(image, image_format))
+    else:
+        name = field_file.name
+    return image, name
+
+
+def process_image(field_file):
+    """Normalise the original and (re)build all variants; return the variant map."""
+    from PIL import Image
+
+    storage = field_file.storage
+    with field_file.open('rb') as f:
+        image = Image.open(f)
+        image_format = image.format if image.format in SAVE_OPTIONS else 'JPEG'
+        image.load()
+
+    image, name = _normalise_original(field_file, image, image_format)
+    root, _ = os.path.splitext(name)
+    variants = {'source': name}
+
+    for width in settings.IMAGE_VARIANT_WIDTHS:
+        if width >= image.width:
+            resized = image
+        else:
+            height = round(image.height * width / image.width)
+            resized = image.resize((width, height), Image.LANCZOS)
+
+        variants[str(width)] = {
+            key: _replace(storage, f"{root}__{width}w.{ext}", _encode(resized, fmt))
+            for key, (ext, fmt) in VARIANT_FORMATS.items()
+        }
+    return variants
+
+
+def variant_urls(storage, variants, request=None):
+    """Map a stored variant dict to URLs, as exposed by the serializers."""
+    def url(name):
+        value = storage.url(name)
+        return request.build_absolute_uri(value) if request else value
+
+    return {
+        width: {fmt: url(name) for fmt, name in formats.items()}
+        for width, formats in (variants or {}).items()
+        if width != 'source'
+    }
@@ -0,0 +1,55 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from uploads.blobs import recount_refs
+from uploads.models import ChunkedUpload, MediaBlob
+from uploads.storage import BLOB_DIR, content_addressed_storage
+from uploads.tasks import IMAGE_FIELDS
+
+
+def _walk(storage, path):
+    dirs, files = storage.listdir(path)
+    for name in files:
+        yield f"{path}/{name}"
+    for name in dirs:
+        if name != 'tmp':
+            yield from _walk(storage, f"{path}/{name}")
+
+
+class Command(BaseCommand):
+    help = "Delete media blobs that no project, campaign or pending upload references"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace', type=int, default=settings.MEDIA_GC_GRACE,
+                            help="Keep unreferenced blobs written within this many seconds")
+        parser.add_argument('--recount', action='store_true',
+                            help="Rebuild reference counts from the model rows first")
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        storage = content_addressed_storage()
+        if options['recount']:
+            counts = recount_refs(IMAGE_FIELDS)
+            self.stdout.write(f"Recounted references for {len(counts)} blobs")
+        if not storage.exists(BLOB_DIR):
+            return
+
+        keep = set(MediaBlob.objects.filter(ref_count__gt=0).values_list('name', flat=True))
+        keep.update(ChunkedUpload.objects.exclude(file='').values_list('file', flat=True))
+        cutoff = timezone.now() - timedelta(seconds=options['grace'])
+
+        orphans = [
+            name for name in _walk(storage, BLOB_DIR)
+            if name not in keep and storage.get_modified_time(name) < cutoff
+        ]
+        freed = sum(storage.size(name) for name in orphans)
+        if not options['dry_run']:
+            for name in orphans:
+                storage.purge(name)
+            MediaBlob.objects.filter(name__in=orphans, ref_count=0).delete()
+
+        verb = "Would delete" if options['dry_run'] else "Deleted"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {len(orphans)} orphaned blobs ({freed} bytes)."))
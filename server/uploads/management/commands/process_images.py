@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from uploads.tasks import IMAGE_FIELDS, build_variants
+
+
+class Command(BaseCommand):
+    help = "Build missing (or, with --all, all) image variants for projects and campaigns"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help="Rebuild existing variants too")
+
+    def handle(self, *args, **options):
+        for model, (image_field, variants_field) in IMAGE_FIELDS.items():
+            qs = model.objects.exclude(**{image_field: ''}).exclude(**{f"{image_field}__isnull": True})
+            processed = 0
+            for pk, name, variants in qs.values_list('pk', image_field, variants_field).iterator():
+                if options['all'] or (variants or {}).get('source') != name:
+                    build_variants(model, pk)
+                    processed += 1
+            self.stdout.write(f"{model.__name__}: processed {processed} images")
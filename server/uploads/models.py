@@ -0,0 +1,53 @@
+import uuid
+from django.db import models
+from users.models import User
+
+# Create your models here.
+class ChunkedUpload(models.Model):
+    """
+    A resumable upload sent in sequential chunks (see uploads/chunked.py).
+
+    Each chunk is stored as its own part file; `complete` stitches them into
+    `file`, which a project or campaign then claims by `ref`.
+    """
+    STATUS_CHOICES = [
+        ('uploading', 'Uploading'),
+        ('complete', 'Complete'),
+    ]
+
+    ref = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='chunked_uploads')
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField(help_text="Declared total size in bytes")
+    received = models.PositiveBigIntegerField(default=0)
+    parts = models.PositiveIntegerField(default=0)
+    file = models.CharField(max_length=255, blank=True, help_text="Storage name once complete")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='uploading')
+
+    updated_at = models.DateTimeField(auto_now=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Chunked Upload"
+        verbose_name_plural = "Chunked Uploads"
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size}, {self.status})"
+
+
+class MediaBlob(models.Model):
+    """Reference count for one content-addressed blob (see uploads/storage.py)."""
+    name = models.CharField(max_length=255, unique=True)
+    ref_count = models.PositiveIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Media Blob"
+        verbose_name_plural = "Media Blobs"
+        ordering = ['name']
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
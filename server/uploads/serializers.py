@@ -0,0 +1,83 @@
+import os
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.utils.text import get_valid_filename
+from rest_framework import serializers
+
+from .models import ChunkedUpload
+from .storage import content_addressed_storage
+
+
+class ChunkedUploadSerializer(serializers.ModelSerializer):
+    chunk_size = serializers.SerializerMethodField()
+    url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ChunkedUpload
+        fields = ['ref', 'filename', 'size', 'received', 'status', 'chunk_size', 'url', 'created_at']
+        read_only_fields = ['ref', 'received', 'status', 'created_at']
+
+    def get_chunk_size(self, obj) -> int:
+        return settings.UPLOAD_CHUNK_SIZE
+
+    def get_url(self, obj) -> str | None:
+        return content_addressed_storage().url(obj.file) if obj.file else None
+
+    def validate_filename(self, value):
+        try:
+            return get_valid_filename(os.path.basename(value))
+        except SuspiciousFileOperation:
+            raise serializers.ValidationError("Invalid filename.")
+
+    def validate_size(self, value):
+        if not 0 < value <= settings.UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(f"Size must be between 1 and {settings.UPLOAD_MAX_SIZE} bytes.")
+        return value
+
+
+class UploadRefField(serializers.UUIDField):
+    """Ref of a completed ChunkedUpload owned by the requesting user."""
+    default_error_messages = {
+        'not_found': "No completed upload with this ref.",
+    }
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('write_only', True)
+        kwargs.setdefault('required', False)
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        ref = super().to_internal_value(data)
+        request = self.context.get('request')
+        upload = ChunkedUpload.objects.filter(
+            ref=ref, user_id=getattr(request.user, 'pk', None), status='complete'
+        ).first() if request else None
+        if upload is None:
+            self.fail('not_found')
+        return upload
+
+
+class AttachUploadsMixin:
+    """
+    Swap UploadRefFields for the file they point at.
+
+    `upload_fields` maps each ref field to the model file field it fills;
+    the claimed uploads are deleted (not their files) once the instance saves.
+    """
+    upload_fields = {}
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        self._claimed_uploads = []
+        for ref_field, file_field in self.upload_fields.items():
+            upload = attrs.pop(ref_field, None)
+            if upload is not None:
+                attrs[file_field] = upload.file
+                self._claimed_uploads.append(upload.pk)
+        return attrs
+
+    def save(self, **kwargs):
+        instance = super().save(**kwargs)
+        ChunkedUpload.objects.filter(pk__in=getattr(self, '_claimed_uploads', [])).delete()
+        return instance
@@ -0,0 +1,35 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from campaigns.models import Campaign
+from projects.models import Project
+from .blobs import adjust_refs, referenced_names
+from .tasks import IMAGE_FIELDS, schedule_variants
+
+
+@receiver(pre_save, sender=Project)
+@receiver(pre_save, sender=Campaign)
+def remember_blobs(sender, instance, **kwargs):
+    image_field, variants_field = IMAGE_FIELDS[sender]
+    row = sender.objects.filter(pk=instance.pk).values_list(image_field, variants_field).first() \
+        if instance.pk else None
+    instance._blobs_before = referenced_names(*row) if row else set()
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Campaign)
+def image_changed(sender, instance, **kwargs):
+    image_field, variants_field = IMAGE_FIELDS[sender]
+    image = getattr(instance, image_field)
+    variants = getattr(instance, variants_field) or {}
+    adjust_refs(getattr(instance, '_blobs_before', set()), referenced_names(image.name, variants))
+
+    if image and image.name != variants.get('source'):
+        schedule_variants(sender, instance.pk)
+
+
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Campaign)
+def release_blobs(sender, instance, **kwargs):
+    image_field, variants_field = IMAGE_FIELDS[sender]
+    adjust_refs(referenced_names(getattr(instance, image_field).name, getattr(instance, variants_field)), set())
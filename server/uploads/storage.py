@@ -0,0 +1,75 @@
+"""
+Content-addressed media storage.
+
+Every file is streamed through SHA-256 while it is written, then stored once
+as blobs/<first two hex digits>/<sha256><ext>; the name passed to save() only
+contributes its extension. Saving content that already exists returns the
+existing blob, so the same logo uploaded to ten projects is stored once.
+
+Blob names never change content, so they can be served with immutable cache
+headers. Because blobs are shared, delete() does nothing: MediaBlob keeps a
+reference count across Project.image / Campaign.flyer (and their variants),
+and `manage.py gc_media` purges blobs nobody references any more.
+"""
+import hashlib
+import os
+import tempfile
+
+from django.core.files.storage import FileSystemStorage
+
+BLOB_DIR = 'blobs'
+
+
+def blob_name(digest, ext):
+    return f"{BLOB_DIR}/{digest[:2]}/{digest}{ext}"
+
+
+def is_blob(name):
+    return bool(name) and name.startswith(f"{BLOB_DIR}/")
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    def get_available_name(self, name, max_length=None):
+        # The final name is only known once the content is hashed in _save()
+        return name
+
+    def _save(self, name, content):
+        ext = os.path.splitext(name)[1].lower()
+        tmp_dir = self.path(f"{BLOB_DIR}/tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        try:
+            digest = hashlib.sha256()
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    f.write(chunk)
+
+            name = blob_name(digest.hexdigest(), ext)
+            path = self.path(name)
+            if os.path.exists(path):
+                os.utime(path)  # restart the gc grace period
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                if self.file_permissions_mode is not None:
+                    os.chmod(tmp_path, self.file_permissions_mode)
+                os.replace(tmp_path, path)
+                tmp_path = None
+        finally:
+            if tmp_path is not None:
+                os.unlink(tmp_path)
+        return name
+
+    def delete(self, name):
+        """Blobs may be shared; they are only removed by purge() via gc_media."""
+
+    def purge(self, name):
+        super().delete(name)
+
+
+_storage = ContentAddressedStorage()
+
+
+def content_addressed_storage():
+    """Storage callable for model fields (keeps migrations free of instances)."""
+    return _storage
@@ -0,0 +1,71 @@
+"""
+Off-request-thread execution for image processing.
+
+Jobs are handed to a small in-process thread pool once the surrounding
+transaction commits, so the upload request returns without waiting on Pillow.
+`manage.py process_images` rebuilds anything a crashed or frozen worker
+(e.g. a serverless instance) never finished.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from campaigns.models import Campaign
+from server.etags import bump_version
+from projects.models import Project
+from .blobs import adjust_refs, referenced_names
+from .images import process_image
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='image-variants')
+
+# model -> (image field, variants field)
+IMAGE_FIELDS = {
+    Project: ('image', 'image_variants'),
+    Campaign: ('flyer', 'flyer_variants'),
+}
+
+
+def build_variants(model, pk):
+    image_field, variants_field = IMAGE_FIELDS[model]
+    instance = model.objects.filter(pk=pk).only(image_field).first()
+    field_file = getattr(instance, image_field, None) if instance else None
+    if not field_file:
+        return
+
+    try:
+        variants = process_image(field_file)
+    except Exception:
+        logger.exception(f"Building image variants failed for {model.__name__} {pk}")
+        return
+
+    with transaction.atomic():
+        # Only store them if the image wasn't replaced while we were working
+        current = model.objects.select_for_update().filter(
+            pk=pk, **{image_field: field_file.name}
+        ).values_list(variants_field, flat=True).first()
+        if current is None:
+            return  # anything written here is unreferenced and left to gc_media
+        model.objects.filter(pk=pk).update(
+            **{image_field: variants['source'], variants_field: variants, 'updated_at': timezone.now()}
+        )
+        bump_version(model)
+        adjust_refs(referenced_names(field_file.name, current), referenced_names(variants['source'], variants))
+
+
+def _run(model, pk):
+    try:
+        build_variants(model, pk)
+    finally:
+        close_old_connections()
+
+
+def schedule_variants(model, pk):
+    if settings.IMAGE_PROCESSING_ASYNC:
+        transaction.on_commit(lambda: _executor.submit(_run, model, pk))
+    else:
+        transaction.on_commit(lambda: build_variants(model, pk))
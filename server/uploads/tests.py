@@ -0,0 +1,216 @@
+import io
+import shutil
+import tempfile
+from types import SimpleNamespace
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from projects.models import Project
+from projects.serializers import ProjectSerializer
+from teams.models import Team
+from users.models import User
+from .models import ChunkedUpload, MediaBlob
+from .storage import content_addressed_storage
+from .views import serve_media
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def jpeg_bytes(size=(3000, 1500), exif=True):
+    image = Image.new('RGB', size, 'red')
+    metadata = Image.Exif()
+    metadata[0x010F] = "PhoneMaker"  # Make
+    buffer = io.BytesIO()
+    image.save(buffer, 'JPEG', **({'exif': metadata} if exif else {}))
+    return buffer.getvalue()
+
+
+def make_jpeg(size=(3000, 1500)):
+    return ContentFile(jpeg_bytes(size), name='photo.jpg')
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT,
+    IMAGE_PROCESSING_ASYNC=False,
+    IMAGE_VARIANT_WIDTHS=[320, 640],
+    IMAGE_MAX_DIMENSION=1024,
+)
+class ImageVariantTestCase(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        self.team = Team.objects.create(name='Imagers')
+
+    def create_project(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            project = Project.objects.create(
+                team=self.team, name='Robot', summary='s', description='d', image=make_jpeg()
+            )
+        project.refresh_from_db()
+        return project
+
+    def test_variants_built_after_commit(self):
+        project = self.create_project()
+        variants = project.image_variants
+
+        self.assertEqual(variants['source'], project.image.name)
+        self.assertEqual(set(variants), {'source', '320', '640'})
+        with project.image.storage.open(variants['320']['webp']) as f:
+            self.assertEqual(Image.open(f).size, (320, 160))
+        with project.image.storage.open(variants['640']['jpeg']) as f:
+            self.assertEqual(Image.open(f).format, 'JPEG')
+
+    def test_original_capped_and_stripped(self):
+        project = self.create_project()
+        with project.image.open('rb') as f:
+            image = Image.open(f)
+            self.assertEqual(image.size, (1024, 512))
+            self.assertFalse(image.getexif())
+
+    def test_serializer_exposes_urls(self):
+        project = self.create_project()
+        data = ProjectSerializer(project).data
+        self.assertTrue(data['image_variants']['320']['webp'].startswith('/media/'))
+        self.assertTrue(data['image_variants']['640']['jpeg'].endswith('.jpg'))
+
+    def test_unchanged_image_not_reprocessed(self):
+        project = self.create_project()
+        with self.captureOnCommitCallbacks() as callbacks:
+            project.summary = 'Changed'
+            project.save()
+        self.assertEqual(callbacks, [])
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, IMAGE_PROCESSING_ASYNC=False, UPLOAD_CHUNK_SIZE=1024)
+class ChunkedUploadTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(email='uploader@test.com', password='password123')
+        self.client.force_authenticate(user=self.user)
+
+    def start(self, data):
+        response = self.client.post(
+            reverse('upload-list'), {'filename': '../my photo.jpg', 'size': len(data)}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['filename'], 'my_photo.jpg')
+        return response.data['ref']
+
+    def put_chunk(self, ref, data, start, end):
+        return self.client.generic(
+            'PUT', reverse('upload-detail', args=[ref]), data[start:end + 1],
+            content_type='application/octet-stream',
+            HTTP_CONTENT_RANGE=f"bytes {start}-{end}/{len(data)}",
+        )
+
+    def test_upload_in_chunks_and_attach(self):
+        data = jpeg_bytes((1200, 800), exif=False)
+        ref = self.start(data)
+
+        for start in range(0, len(data), 1024):
+            end = min(start + 1024, len(data)) - 1
+            response = self.put_chunk(ref, data, start, end)
+            self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+            self.assertEqual(response.data['received'], end + 1)
+
+        response = self.client.post(reverse('upload-complete', args=[ref]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        upload = ChunkedUpload.objects.get(ref=ref)
+        with default_storage.open(upload.file) as f:
+            self.assertEqual(f.read(), data)
+        self.assertFalse(default_storage.exists(f"uploads/chunks/{ref}/00000.part"))
+
+        project = Project.objects.create(team=Team.objects.create(name='Chunkers'), name='P', summary='s', description='d')
+        serializer = ProjectSerializer(
+            project, data={'image_upload_ref': ref}, partial=True,
+            context={'request': SimpleNamespace(user=self.user)},
+        )
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        with self.captureOnCommitCallbacks(execute=True):
+            serializer.save()
+        project.refresh_from_db()
+        self.assertEqual(project.image.name, upload.file)
+        self.assertIn('320', project.image_variants)
+        self.assertFalse(ChunkedUpload.objects.filter(ref=ref).exists())
+
+    def test_non_image_rejected_after_first_chunk(self):
+        data = b'%PDF-1.4 not an image' * 100
+        ref = self.start(data)
+
+        response = self.put_chunk(ref, data, 0, 1023)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(ChunkedUpload.objects.filter(ref=ref).exists())
+
+    def test_out_of_order_chunk_and_early_complete(self):
+        data = jpeg_bytes((1200, 800))
+        ref = self.start(data)
+
+        response = self.put_chunk(ref, data, 1024, 2047)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+
+        response = self.client.post(reverse('upload-complete', args=[ref]))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(MEDIA_ROOT=MEDIA_ROOT, IMAGE_PROCESSING_ASYNC=False, IMAGE_VARIANT_WIDTHS=[320])
+class ContentAddressedMediaTestCase(TestCase):
+    def setUp(self):
+        self.team = Team.objects.create(name='Dedupers')
+
+    def create_project(self, name, data):
+        with self.captureOnCommitCallbacks(execute=True):
+            project = Project.objects.create(
+                team=self.team, name=name, summary='s', description='d',
+                image=ContentFile(data, name=f'{name}.jpg'),
+            )
+        project.refresh_from_db()
+        return project
+
+    def test_same_content_stored_once_and_counted(self):
+        logo = jpeg_bytes((200, 100), exif=False)
+        first = self.create_project('first', logo)
+        second = self.create_project('second', logo)
+
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertTrue(first.image.name.startswith('blobs/'))
+        self.assertEqual(first.image_variants, second.image_variants)
+        self.assertEqual(MediaBlob.objects.get(name=first.image.name).ref_count, 2)
+        self.assertEqual(MediaBlob.objects.get(name=first.image_variants['320']['webp']).ref_count, 2)
+
+        first.delete()
+        self.assertEqual(MediaBlob.objects.get(name=second.image.name).ref_count, 1)
+        call_command('gc_media', grace=0, stdout=io.StringIO())
+        self.assertTrue(content_addressed_storage().exists(second.image.name))
+
+        second.delete()
+        call_command('gc_media', grace=0, stdout=io.StringIO())
+        self.assertFalse(content_addressed_storage().exists(second.image.name))
+        self.assertFalse(MediaBlob.objects.filter(name=second.image.name).exists())
+
+    def test_gc_respects_grace_period_and_recount(self):
+        project = self.create_project('robot', jpeg_bytes((200, 100), exif=False))
+        orphan = content_addressed_storage().save('orphan.jpg', ContentFile(b'unreferenced'))
+        MediaBlob.objects.all().update(ref_count=0)  # simulate drifted counts
+
+        call_command('gc_media', stdout=io.StringIO())
+        self.assertTrue(content_addressed_storage().exists(orphan))
+
+        call_command('gc_media', grace=0, recount=True, stdout=io.StringIO())
+        self.assertFalse(content_addressed_storage().exists(orphan))
+        self.assertTrue(content_addressed_storage().exists(project.image.name))
+        self.assertEqual(MediaBlob.objects.get(name=project.image.name).ref_count, 1)
+
+    def test_blobs_served_immutable(self):
+        name = content_addressed_storage().save('logo.png', ContentFile(b'png bytes'))
+        response = serve_media(RequestFactory().get(f'/media/{name}'), name, document_root=MEDIA_ROOT)
+        self.assertEqual(response['Cache-Control'], 'public, max-age=31536000, immutable')
@@ -0,0 +1,81 @@
+from django.db import transaction
+from django.views.static import serve
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from auth0.authentication import ClaimsJWTAuthentication
+from .chunked import UploadError, complete_upload, write_chunk
+from .models import ChunkedUpload
+from .serializers import ChunkedUploadSerializer
+from .storage import is_blob
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+
+def serve_media(request, path, document_root=None):
+    """
+    Development media view. A blob's name is its content hash, so it can be
+    cached forever; production web servers should send the same header for
+    MEDIA_URL + 'blobs/'.
+    """
+    response = serve(request, path, document_root=document_root)
+    if is_blob(path):
+        response['Cache-Control'] = IMMUTABLE
+    return response
+
+
+@extend_schema(tags=['Uploads'])
+class ChunkedUploadViewSet(mixins.CreateModelMixin,
+                           mixins.RetrieveModelMixin,
+                           viewsets.GenericViewSet):
+    serializer_class = ChunkedUploadSerializer
+    lookup_field = 'ref'
+    permission_classes = [IsAuthenticated]
+    authentication_classes = [ClaimsJWTAuthentication]  # no user query on reads
+
+    def get_queryset(self):
+        return ChunkedUpload.objects.filter(user_id=self.request.user.pk)
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+    @extend_schema(summary="Start a resumable image upload")
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
+
+    @extend_schema(summary="Get upload progress (to resume after a failure)")
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    @extend_schema(
+        summary="Upload the next chunk",
+        request={'application/octet-stream': OpenApiTypes.BINARY},
+        parameters=[OpenApiParameter(
+            'Content-Range', OpenApiTypes.STR, OpenApiParameter.HEADER, required=True,
+            description="bytes <start>-<end>/<size>",
+        )],
+    )
+    def update(self, request, *args, **kwargs):
+        upload = self.get_object()
+        try:
+            content_length = int(request.META.get('CONTENT_LENGTH') or 0)
+            # Read the raw body; touching request.data would buffer it
+            upload = write_chunk(upload, request.stream, request.headers.get('Content-Range'), content_length)
+        except UploadError as e:
+            return Response({"error": str(e)}, status=e.status)
+        return Response(self.get_serializer(upload).data)
+
+    @extend_schema(summary="Finish the upload", request=None)
+    @action(detail=True, methods=['post'])
+    def complete(self, request, ref=None):
+        with transaction.atomic():
+            upload = self.get_queryset().select_for_update().get(pk=self.get_object().pk)
+            try:
+                upload = complete_upload(upload)
+            except UploadError as e:
+                return Response({"error": str(e)}, status=e.status)
+        return Response(self.get_serializer(upload).data, status=status.HTTP_200_OK)
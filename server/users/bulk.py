@@ -0,0 +1,131 @@
+"""
+Bulk user import for cohort onboarding.
+
+Rows are read lazily from a CSV (header: email,password,first_name,last_name),
+validated, hashed in a process pool and inserted with bulk_create in batches.
+Bad rows are reported back and never abort the rest of the batch.
+"""
+import csv
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+
+from server.etags import bump_version
+
+from .hashing import hash_passwords
+from .models import User
+
+BATCH_SIZE = 500
+PASSWORD_MIN_LENGTH = 8  # same as UserRegisterSerializer
+
+
+def _clean_row(row):
+    """Return (data, error) for one CSV row."""
+    email = (row.get('email') or '').strip().lower()
+    password = row.get('password') or ''
+    if not email:
+        return None, "Email is required."
+    try:
+        validate_email(email)
+    except ValidationError:
+        return None, "Enter a valid email address."
+    if password and len(password) < PASSWORD_MIN_LENGTH:
+        return None, f"Password must be at least {PASSWORD_MIN_LENGTH} characters."
+    return {
+        'email': email,
+        'password': password,
+        'first_name': (row.get('first_name') or '').strip(),
+        'last_name': (row.get('last_name') or '').strip(),
+    }, None
+
+
+def _insert_rows(users):
+    with transaction.atomic():
+        created = len(User.objects.bulk_create(users))
+        bump_version(User)
+        return created
+
+
+def _flush(batch, result, pool):
+    emails = [data['email'] for _, data in batch]
+    existing = set(
+        User.objects.annotate(email_lower=Lower('email'))
+        .filter(email_lower__in=emails)
+        .values_list('email_lower', flat=True)
+    )
+
+    pending = []
+    for line, data in batch:
+        if data['email'] in existing:
+            result['errors'].append({
+                'line': line, 'email': data['email'],
+                'error': "A user with this email already exists.",
+            })
+        else:
+            pending.append((line, data))
+    if not pending:
+        return
+
+    hashes = hash_passwords([data['password'] for _, data in pending], pool)
+    users = [
+        User(
+            email=data['email'],
+            first_name=data['first_name'],
+            last_name=data['last_name'],
+            password=hashed,
+        )
+        for (_, data), hashed in zip(pending, hashes)
+    ]
+
+    try:
+        result['created'] += _insert_rows(users)
+    except IntegrityError:
+        # Someone registered one of these emails meanwhile: isolate the offender(s)
+        for (line, data), user in zip(pending, users):
+            user.pk = None
+            try:
+                result['created'] += _insert_rows([user])
+            except IntegrityError:
+                result['errors'].append({
+                    'line': line, 'email': data['email'],
+                    'error': "A user with this email already exists.",
+                })
+
+
+def import_users(csv_file, batch_size=BATCH_SIZE, pool=None):
+    """
+    Import users from an open text file (or any iterable of CSV lines),
+    hashing in `pool` (see hashing.shared_pool) or inline when it is None.
+
+    Returns {"created": int, "errors": [{"line", "email", "error"}, ...]}.
+    """
+    result = {'created': 0, 'errors': []}
+    reader = csv.DictReader(csv_file)
+    seen = set()
+    batch = []
+
+    for row in reader:
+        data, error = _clean_row(row)
+        if data and data['email'] in seen:
+            error = "Duplicate email in file."
+        if error:
+            result['errors'].append({
+                'line': reader.line_num,
+                'email': (row.get('email') or '').strip(),
+                'error': error,
+            })
+            continue
+
+        seen.add(data['email'])
+        batch.append((reader.line_num, data))
+        if len(batch) >= batch_size:
+            _flush(batch, result, pool)
+            batch = []
+
+    if batch:
+        _flush(batch, result, pool)
+
+    result['errors'].sort(key=lambda e: e['line'])
+    return result
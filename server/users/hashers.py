@@ -0,0 +1,43 @@
+"""
+Password hashers whose cost comes from settings.
+
+Django's hashers hard-code their cost parameters. These subclasses read them
+from PBKDF2_ITERATIONS / SCRYPT_WORK_FACTOR / ARGON2_* so login capacity can be
+sized per deployment (see `manage.py benchmark_hashers`). must_update() compares
+stored parameters with the configured ones, so changing a setting rehashes each
+password transparently on the user's next successful login.
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    Argon2PasswordHasher,
+    PBKDF2PasswordHasher,
+    ScryptPasswordHasher,
+)
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return settings.PBKDF2_ITERATIONS
+
+
+class TunableScryptPasswordHasher(ScryptPasswordHasher):
+    @property
+    def work_factor(self):
+        return settings.SCRYPT_WORK_FACTOR
+
+
+class TunableArgon2PasswordHasher(Argon2PasswordHasher):
+    """Requires the optional argon2-cffi package."""
+
+    @property
+    def time_cost(self):
+        return settings.ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.ARGON2_PARALLELISM
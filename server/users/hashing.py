@@ -0,0 +1,69 @@
+"""
+Password hashing helpers that can run inside a process pool.
+
+This module must stay importable before Django is set up (spawned workers
+import it by reference), so it only touches the ORM-free hashers API.
+"""
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.apps import apps
+
+
+def _init_worker():
+    # Spawned workers start with a fresh interpreter; forked ones are ready.
+    if not apps.ready:
+        django.setup()
+
+
+def _hash_password(password):
+    from django.contrib.auth.hashers import make_password
+    # None produces an unusable password (user must go through reset)
+    return make_password(password or None)
+
+
+def time_hasher(hasher_path, count):
+    """Encode `count` passwords with one hasher; return elapsed seconds."""
+    import time
+    from django.utils.module_loading import import_string
+    hasher = import_string(hasher_path)()
+    start = time.perf_counter()
+    for i in range(count):
+        hasher.encode(f"benchmark-password-{i}", hasher.salt())
+    return time.perf_counter() - start
+
+
+def hashing_pool(processes=None):
+    """Return a process pool for hash_passwords, or None to hash inline."""
+    processes = processes or os.cpu_count() or 1
+    if processes <= 1:
+        return None
+    return ProcessPoolExecutor(max_workers=processes, initializer=_init_worker)
+
+
+_shared_lock = threading.Lock()
+_shared = {'pool': None, 'processes': None, 'pid': None}
+
+
+def shared_pool():
+    """
+    Return this process's long-lived pool of USER_IMPORT_PROCESSES workers,
+    or None to hash inline. Created on first use and reused by every request;
+    a forked child (e.g. a preloaded gunicorn worker) gets its own.
+    """
+    from django.conf import settings
+    processes = settings.USER_IMPORT_PROCESSES
+    with _shared_lock:
+        if _shared['processes'] != processes or _shared['pid'] != os.getpid():
+            _shared['pool'] = hashing_pool(processes) if processes > 1 else None
+            _shared['processes'], _shared['pid'] = processes, os.getpid()
+        return _shared['pool']
+
+
+def hash_passwords(passwords, pool=None):
+    """Hash a list of raw passwords, preserving order."""
+    if pool is None:
+        return [_hash_password(p) for p in passwords]
+    return list(pool.map(_hash_password, passwords, chunksize=16))
@@ -0,0 +1,46 @@
+import os
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from users.hashing import hashing_pool, time_hasher
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure password hashes/sec per core (and across a process pool) for the "
+        "configured PASSWORD_HASHERS, to size login/registration capacity."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=10, help="Hashes per measurement")
+        parser.add_argument('--processes', type=int, default=os.cpu_count() or 1)
+        parser.add_argument('--hasher', action='append', dest='hashers',
+                            help="Hasher import path (repeatable, default: PASSWORD_HASHERS)")
+
+    def handle(self, *args, **options):
+        count = options['count']
+        processes = options['processes']
+        hashers = options['hashers'] or settings.PASSWORD_HASHERS
+
+        self.stdout.write(f"{'hasher':<50} {'ms/hash':>9} {'hash/s/core':>12} {f'hash/s x{processes}':>12}")
+        for path in hashers:
+            try:
+                elapsed = time_hasher(path, count)
+            except (ValueError, ImportError) as e:  # e.g. argon2-cffi not installed
+                self.stdout.write(f"{path:<50} skipped: {e}")
+                continue
+            per_core = count / elapsed
+
+            total = per_core
+            pool = hashing_pool(processes)
+            if pool is not None:
+                with pool:
+                    # Warm the workers up so start-up cost isn't measured
+                    list(pool.map(time_hasher, [path] * processes, [1] * processes))
+                    start = time.perf_counter()
+                    list(pool.map(time_hasher, [path] * processes, [count] * processes))
+                    total = processes * count / (time.perf_counter() - start)
+
+            self.stdout.write(f"{path:<50} {elapsed / count * 1000:>9.1f} {per_core:>12.1f} {total:>12.1f}")
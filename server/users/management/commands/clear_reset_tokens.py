@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
+
+from users.models import UserProfile
+
+
+class Command(BaseCommand):
+    help = "Delete password reset state whose token has expired or was never set"
+
+    def handle(self, *args, **options):
+        deleted, _ = UserProfile.objects.filter(
+            Q(reset_token_expiry__lt=timezone.now()) | Q(reset_token__isnull=True)
+        ).delete()
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired reset tokens."))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from users.bulk import BATCH_SIZE, import_users
+from users.hashing import hashing_pool
+
+
+class Command(BaseCommand):
+    help = "Bulk import users from a CSV file (email,password,first_name,last_name)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('csv_path')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            '--processes', type=int, default=None,
+            help="Password hashing processes for this run (default: CPU count, 1 = inline)",
+        )
+
+    def handle(self, *args, **options):
+        pool = hashing_pool(options['processes'])
+        try:
+            with open(options['csv_path'], newline='', encoding='utf-8') as f:
+                result = import_users(f, batch_size=options['batch_size'], pool=pool)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        for error in result['errors']:
+            self.stderr.write(f"line {error['line']} ({error['email']}): {error['error']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {result['created']} users, {len(result['errors'])} errors."
+        ))
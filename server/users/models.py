@@ -56,6 +56,7 @@ class User(AbstractUser):
         return TeamMember.objects.filter(user=self, role='leader').exists()
     
 class UserProfile(models.Model):
+    """Pending password reset state, created on demand by ForgotPasswordView"""
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     reset_token = models.CharField(max_length=255, null=True, blank=True)
     reset_token_expiry = models.DateTimeField(null=True, blank=True)
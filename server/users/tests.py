@@ -1,8 +1,17 @@
-from django.test import TestCase
+import io
+import os
+import tempfile
+
+from django.contrib.auth import authenticate
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
-from .models import User
+from .bulk import import_users
+from .hashing import shared_pool
+from .models import User, UserProfile
 
 class UserAPITestCase(TestCase):
     def setUp(self):
@@ -39,4 +48,75 @@ class UserAPITestCase(TestCase):
         self.client.force_authenticate(user=self.admin)
         response = self.client.get(reverse('user-list'))
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 2)
\ No newline at end of file
+        self.assertEqual(len(response.data), 2)
+
+    def test_bulk_import_reports_row_errors(self):
+        csv_data = io.StringIO(
+            "email,password,first_name,last_name\n"
+            "a@cohort.com,longpassword,Ann,A\n"
+            "not-an-email,longpassword,,\n"
+            "USER@test.com,longpassword,,\n"
+            "b@cohort.com,short,,\n"
+            "A@cohort.com,longpassword,,\n"
+            "c@cohort.com,,Cid,\n"
+        )
+        result = import_users(csv_data, batch_size=2)
+
+        self.assertEqual(result['created'], 2)
+        self.assertEqual([e['line'] for e in result['errors']], [3, 4, 5, 6])
+        self.assertTrue(User.objects.get(email="a@cohort.com").check_password("longpassword"))
+        self.assertFalse(User.objects.get(email="c@cohort.com").has_usable_password())
+        # Profiles are created lazily on the first password reset
+        self.assertFalse(UserProfile.objects.filter(user__email__endswith="@cohort.com").exists())
+
+    @override_settings(USER_IMPORT_PROCESSES=1)
+    def test_bulk_import_endpoint(self):
+        upload = SimpleUploadedFile(
+            "users.csv", b"email,password,first_name,last_name\nnew@cohort.com,longpassword,New,User\n"
+        )
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(reverse('user-bulk-import'), {"file": upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        upload.seek(0)
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.post(reverse('user-bulk-import'), {"file": upload}, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['created'], 1)
+        self.assertTrue(User.objects.filter(email="new@cohort.com").exists())
+
+    def test_import_users_command(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False) as f:
+            f.write("email,password,first_name,last_name\ncli@cohort.com,longpassword,Cli,User\n")
+        self.addCleanup(os.remove, f.name)
+        out = io.StringIO()
+        call_command('import_users', f.name, processes=1, stdout=out, stderr=io.StringIO())
+        self.assertIn("Created 1 users, 0 errors.", out.getvalue())
+        self.assertTrue(User.objects.get(email="cli@cohort.com").check_password("longpassword"))
+
+    def test_shared_hashing_pool_is_reused(self):
+        with self.settings(USER_IMPORT_PROCESSES=1):
+            self.assertIsNone(shared_pool())
+        with self.settings(USER_IMPORT_PROCESSES=2):
+            pool = shared_pool()
+            self.assertIsNotNone(pool)
+            self.assertIs(shared_pool(), pool)
+        pool.shutdown()
+
+    @override_settings(PBKDF2_ITERATIONS=1000)
+    def test_password_rehashed_on_login_when_cost_changes(self):
+        user = User.objects.create_user(email="hash@test.com", password="pass12345")
+        self.assertTrue(user.password.startswith("pbkdf2_sha256$1000$"))
+
+        with self.settings(PBKDF2_ITERATIONS=2000):
+            self.assertIsNotNone(authenticate(username="hash@test.com", password="pass12345"))
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("pbkdf2_sha256$2000$"))
+
+        with self.settings(PASSWORD_HASHERS=[
+            'users.hashers.TunableScryptPasswordHasher',
+            'users.hashers.TunablePBKDF2PasswordHasher',
+        ]):
+            self.assertIsNotNone(authenticate(username="hash@test.com", password="pass12345"))
+        user.refresh_from_db()
+        self.assertTrue(user.password.startswith("scrypt$"))
@@ -1,17 +1,26 @@
+import io
+
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 
+from server.etags import ConditionalGetMixin
+from server.sparse import SPARSE_PARAMETERS, SparseFieldsMixin
+from .bulk import import_users
+from .hashing import shared_pool
 from .models import User
 from .serializers import UserSerializer, UserMeSerializer, UserRegisterSerializer
 
 
 @extend_schema(tags=['Users'])
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ConditionalGetMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     lookup_field = 'ref'
+    etag_models = ['users.User', 'teams.Team', 'teams.TeamMember', 'projects.Project']
+    etag_actions = ('list', 'retrieve', 'me')
 
     def get_serializer_class(self):
         if self.action == 'register':
@@ -29,6 +38,14 @@ class UserViewSet(viewsets.ModelViewSet):
             permission_classes = [IsAdminUser]
         return [permission() for permission in permission_classes]
 
+    @extend_schema(summary="List users", parameters=SPARSE_PARAMETERS)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @extend_schema(parameters=SPARSE_PARAMETERS)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     @extend_schema(
         summary="Register a new user",
         request=UserRegisterSerializer,
@@ -43,6 +60,7 @@ class UserViewSet(viewsets.ModelViewSet):
 
     @extend_schema(
         summary="Get current user profile",
+        parameters=SPARSE_PARAMETERS,
         responses={200: UserMeSerializer}
     )
     @action(detail=False, methods=['get', 'patch'], permission_classes=[IsAuthenticated])
@@ -55,4 +73,30 @@ class UserViewSet(viewsets.ModelViewSet):
             serializer = self.get_serializer(user, data=request.data, partial=True)
             serializer.is_valid(raise_exception=True)
             serializer.save()
-            return Response(serializer.data)
\ No newline at end of file
+            return Response(serializer.data)
+
+    @extend_schema(
+        summary="Bulk import users from CSV (admin only)",
+        request={
+            "multipart/form-data": {
+                "type": "object",
+                "properties": {"file": {"type": "string", "format": "binary"}},
+            }
+        },
+        responses={
+            200: {"type": "object", "properties": {
+                "created": {"type": "integer"},
+                "errors": {"type": "array", "items": {"type": "object"}},
+            }},
+            400: OpenApiResponse(description="No file uploaded"),
+        }
+    )
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser])
+    def bulk_import(self, request):
+        upload = request.FILES.get('file')
+        if not upload:
+            return Response({"error": "CSV file is required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        csv_file = io.TextIOWrapper(upload.file, encoding='utf-8', newline='')
+        result = import_users(csv_file, pool=shared_pool())
+        return Response(result, status=status.HTTP_200_OK)
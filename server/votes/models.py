@@ -23,21 +23,24 @@ class Vote(models.Model):
         # Overall vote: only one per user
         if self.is_overall:
             if Vote.objects.filter(voter=self.voter, is_overall=True).exclude(pk=self.pk).exists():
-                raise ValidationError("You have already cast an overall vote.")
+                raise ValidationError("You have already cast an overall vote.", code='duplicate')
 
         # Category vote: one per category
         else:
             if not self.project_campaign:
-                raise ValidationError("Project campaign is required for category vote.")
+                raise ValidationError("Project campaign is required for category vote.", code='not_participating')
             if not self.project_campaign.category:
-                raise ValidationError("Project campaign must belong to a category for a category vote.")
+                raise ValidationError(
+                    "Project campaign must belong to a category for a category vote.", code='bad_category'
+                )
             if Vote.objects.filter(
                 voter=self.voter,
                 project_campaign__category=self.project_campaign.category,
                 is_overall=False
             ).exclude(pk=self.pk).exists():
                 raise ValidationError(
-                    f"You have already voted in the '{self.project_campaign.category.name}' category."
+                    f"You have already voted in the '{self.project_campaign.category.name}' category.",
+                    code='duplicate',
                 )
 
     def save(self, *args, **kwargs):
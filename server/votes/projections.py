@@ -0,0 +1,28 @@
+from django.db.models import F
+
+from server.projections import Projection, format_datetime
+
+
+class VoteProjection(Projection):
+    """Same output as VoteSerializer, for the vote list."""
+
+    def rows(self, queryset, spec):
+        votes = queryset.select_related(None).values(
+            'id', 'is_overall', 'created_at',
+            project=F('project_campaign__project__name'),
+            campaign=F('project_campaign__campaign__name'),
+            category=F('project_campaign__category__name'),
+            voter_email=F('voter__email'),
+        )
+        return [
+            {
+                'id': vote['id'],
+                'project': vote['project'],
+                'campaign': vote['campaign'],
+                'category': vote['category'],
+                'is_overall': vote['is_overall'],
+                'voter_email': vote['voter_email'],
+                'created_at': format_datetime(vote['created_at']),
+            }
+            for vote in votes
+        ]
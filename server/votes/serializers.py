@@ -1,7 +1,33 @@
 # votes/serializers.py
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 from .models import Vote
 from projects.models import ProjectCampaign
+from server.metrics import votes_cast, votes_rejected
+
+
+def reject(reason, message):
+    votes_rejected.labels(reason).inc()
+    raise serializers.ValidationError(message)
+
+
+# Vote.full_clean() error code -> votes_rejected reason
+CLEAN_REJECTION_REASONS = {
+    'not_participating': 'not_participating',
+    'bad_category': 'bad_category',
+    'duplicate': 'duplicate',
+    'unique_together': 'duplicate',  # validate_unique()
+}
+
+
+def rejection_reason(error):
+    error_lists = error.error_dict.values() if hasattr(error, 'error_dict') else [error.error_list]
+    for errors in error_lists:
+        for e in errors:
+            if e.code in CLEAN_REJECTION_REASONS:
+                return CLEAN_REJECTION_REASONS[e.code]
+    return 'invalid'
 
 class VoteCreateSerializer(serializers.ModelSerializer):
     project_ref = serializers.UUIDField(write_only=True)
@@ -26,31 +52,22 @@ class VoteCreateSerializer(serializers.ModelSerializer):
                 campaign__ref=campaign_ref
             )
         except ProjectCampaign.DoesNotExist:
-            raise serializers.ValidationError("Project not participating in this campaign.")
+            reject('not_participating', "Project not participating in this campaign.")
 
         # Check campaign is open
         if not pc.campaign.is_open:
-            raise serializers.ValidationError("This campaign is not open for voting.")
+            reject('campaign_closed', "This campaign is not open for voting.")
 
         # Category validation
         if not is_overall:
             if not data.get('category_id'):
-                raise serializers.ValidationError("category_id is required for category vote.")
+                reject('bad_category', "category_id is required for category vote.")
             if not pc.campaign.categories.filter(id=data['category_id']).exists():
-                raise serializers.ValidationError("This category is not part of the campaign.")
-
-        # Check already voted
-        exists = Vote.objects.filter(
-            voter=user,
-            project_campaign=pc,
-            is_overall=is_overall,
-            category_id=data.get('category_id')
-        ).exists()
-
-        if exists:
-            raise serializers.ValidationError(
-                "You have already voted in this category for this project in this campaign."
-            )
+                reject('bad_category', "This category is not part of the campaign.")
+
+        # Check already voted (one vote per voter and entry, see Vote.Meta)
+        if Vote.objects.filter(voter=user, project_campaign=pc).exists():
+            reject('duplicate', "You have already voted in this category for this project in this campaign.")
 
         data['project_campaign'] = pc
         return data
@@ -58,20 +75,28 @@ class VoteCreateSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         validated_data.pop('project_ref')
         validated_data.pop('campaign_ref')
-        category_id = validated_data.pop('category_id', None)
-        if category_id:
-            validated_data['category_id'] = category_id
+        # The category comes from the ProjectCampaign entry; Vote has no category field
+        validated_data.pop('category_id', None)
 
-        return Vote.objects.create(
-            voter=self.context['request'].user,
-            **validated_data
-        )
+        try:
+            with transaction.atomic():
+                vote = Vote.objects.create(
+                    voter=self.context['request'].user,
+                    **validated_data
+                )
+        except DjangoValidationError as e:
+            reject(rejection_reason(e), e.messages)
+        except IntegrityError:
+            # Lost a race with a concurrent request for the same entry
+            reject('duplicate', "You have already voted for this project in this campaign.")
+        votes_cast.labels('overall' if vote.is_overall else 'category').inc()
+        return vote
 
 
 class VoteSerializer(serializers.ModelSerializer):
     project = serializers.CharField(source='project_campaign.project.name', read_only=True)
     campaign = serializers.CharField(source='project_campaign.campaign.name', read_only=True)
-    category = serializers.CharField(source='category.name', read_only=True, allow_null=True)
+    category = serializers.CharField(source='project_campaign.category.name', read_only=True, allow_null=True)
     voter_email = serializers.CharField(source='voter.email', read_only=True)
 
     class Meta:
@@ -6,20 +6,44 @@ from rest_framework.permissions import IsAuthenticated
 from django.db.models import Count, Q, Case, When, IntegerField
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 
+from auth0.authentication import ClaimsJWTAuthentication
+from server.etags import ConditionalGetMixin
+from server.projections import ProjectionListMixin
+from server.sparse import SPARSE_PARAMETERS, SparseFieldsMixin
 from .models import Vote
+from .projections import VoteProjection
 from .serializers import VoteCreateSerializer, VoteSerializer
 
 
 @extend_schema(tags=['Votes'])
-class VoteViewSet(viewsets.ModelViewSet):
-    queryset = Vote.objects.select_related(
-        'voter', 'project_campaign__project', 'project_campaign__campaign', 'category'
-    ).all()
+class VoteViewSet(ConditionalGetMixin, SparseFieldsMixin, ProjectionListMixin, viewsets.ModelViewSet):
+    queryset = Vote.objects.all()
     permission_classes = [IsAuthenticated]
+    authentication_classes = [ClaimsJWTAuthentication]  # no user query on reads
+    list_projection = VoteProjection  # values()-based list, same JSON as VoteSerializer
+    select_related_fields = {
+        'project': 'project_campaign__project',
+        'campaign': 'project_campaign__campaign',
+        'category': 'project_campaign__category',
+        'voter_email': 'voter',
+    }
+    etag_models = [
+        'votes.Vote', 'projects.ProjectCampaign', 'projects.Project', 'campaigns.Campaign',
+        'categories.Category', 'users.User',
+    ]
+    etag_actions = ('list', 'retrieve', 'my_votes', 'leaderboard')
 
     def get_serializer_class(self):
         return VoteCreateSerializer if self.action == 'create' else VoteSerializer
 
+    @extend_schema(summary="List votes", parameters=SPARSE_PARAMETERS)
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @extend_schema(parameters=SPARSE_PARAMETERS)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     @extend_schema(
         summary="Cast a vote",
         request=VoteCreateSerializer,
@@ -31,14 +55,14 @@ class VoteViewSet(viewsets.ModelViewSet):
         vote = serializer.save()
         return Response(VoteSerializer(vote).data, status=status.HTTP_201_CREATED)
 
-    @extend_schema(summary="My votes")
+    @extend_schema(summary="My votes", parameters=SPARSE_PARAMETERS)
     @action(detail=False, methods=['get'])
     def my_votes(self, request):
-        votes = Vote.objects.filter(voter=request.user)
-        serializer = VoteSerializer(votes, many=True)
+        votes = self.get_queryset().filter(voter=request.user)
+        serializer = self.get_serializer(votes, many=True)
         return Response(serializer.data)
 
-    @extend_schema(summary="Leaderboard (all campaigns)")
+    @extend_schema(summary="Leaderboard (all campaigns)", parameters=SPARSE_PARAMETERS)
     @action(detail=False, methods=['get'], url_path='leaderboard')
     def leaderboard(self, request):
         campaign_ref = request.query_params.get('campaign_ref')
@@ -66,4 +90,4 @@ class VoteViewSet(viewsets.ModelViewSet):
             )
         ).order_by('-rank')[:20]
 
-        return Response(list(leaderboard))
\ No newline at end of file
+        return Response(self.get_field_spec().prune_data(list(leaderboard)))
\ No newline at end of file
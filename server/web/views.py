@@ -7,7 +7,7 @@ from django.utils import timezone
 from django.conf import settings
 from django.contrib import messages
 from django.core.cache import cache
-from django.db.models import Count, Q, F, Sum
+from django.db.models import Count, Q, F
 from django.shortcuts import render, redirect
 from django.views.generic import TemplateView
 from django.contrib.auth.mixins import LoginRequiredMixin
@@ -16,9 +16,12 @@ from django.contrib.auth import get_user_model, authenticate, login, logout
 
 from votes.models import Vote
 from teams.forms import Team, TeamForm
+from teams.models import TeamMember
+from teams.standings import standings
 from campaigns.models import Campaign
 from categories.models import Category
 from projects.models import Project, ProjectCampaign
+from server.projections import related_count
 
 # Create your views here.
 API_URL = settings.BACKEND_URL
@@ -487,25 +490,8 @@ class TeamView(TemplateView, LoginRequiredMixin):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        # Annotate teams with correct counts using the real relations
-        teams = Team.objects.annotate(
-            # Count members → through TeamMember model (reverse name = 'memberships')
-            member_count=Count('memberships', distinct=True),
-
-            # Count projects → reverse relation 'projects'
-            project_count=Count('projects', distinct=True),
-
-            # Total votes received by all projects of this team
-            total_votes=Count(
-                'projects__projectcampaign__votes',  # project → projectcampaign → votes
-                distinct=True
-            ),
-        )
-
-        # Rank teams by total votes
-        ranked_teams = teams.order_by('-total_votes', '-project_count')
-        for rank, team in enumerate(ranked_teams, start=1):
-            team.rank = rank
+        # Counts and rank come from one query (see teams/standings.py)
+        teams = list(standings())
 
         # Add per-user flags (leader, can_join, etc.)
         user = self.request.user
@@ -522,12 +508,11 @@ class TeamView(TemplateView, LoginRequiredMixin):
             )
 
             # Can user join? (example: max 5 members)
-            team.can_join = team.member_count < 5
+            team.can_join = team.member_total < 5
 
-        # Final ordering & context
         context.update({
-            'teams': teams.order_by('-total_votes', '-project_count'),
-            'total_members': teams.aggregate(total=Sum('member_count'))['total'] or 0,
+            'teams': teams,
+            'total_members': sum(team.member_total for team in teams),
         })
 
         return context
@@ -538,23 +523,24 @@ class CampaignView(TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
-        # All campaigns with project count
-        campaigns = Campaign.objects.annotate(
-            project_count=Count('projectcampaign', distinct=True)
-        ).prefetch_related('categories')
+        # All campaigns with project count and status (annotated in SQL)
+        campaigns = list(
+            Campaign.objects.with_status().annotate(
+                project_count=related_count(ProjectCampaign, 'campaign')
+            ).prefetch_related('categories')
+        )
 
-        # Add status and organizer info
-        now = timezone.now().date()
+        # Teams the viewer belongs to, looked up once for the organizer flag
+        user = self.request.user
+        team_ids = set(
+            TeamMember.objects.filter(user=user).values_list('team_id', flat=True)
+        ) if user.is_authenticated else set()
         for c in campaigns:
-            c.status = c.status  # from @property in model
-            c.is_organizer = self.request.user.is_staff or (
-                hasattr(self.request.user, 'team_member') and 
-                Team.objects.filter(campaigns=c, members=self.request.user).exists()
-            )
+            c.is_organizer = user.is_staff or c.organizer_id in team_ids
 
         context.update({
             'campaigns': campaigns,
-            'total_campaigns': campaigns.count(),
+            'total_campaigns': len(campaigns),
         })
 
         return context